@@ -0,0 +1,224 @@
+# analysis.py
+# API programática del analizador: no imprime nada y devuelve un resultado
+# estructurado (tokens opcionales, AST, errores, tabla por líneas, estadísticas).
+# Con write_jsonl los resultados se vuelcan como JSON Lines para otras herramientas.
+
+import json
+import sys
+import time
+
+import ast_binary
+from ast_visitor import walk
+from constant_folding import fold_constants
+from parser_pool import thread_parser
+from profiling import NULL_PROFILER
+from semantic_analyzer import SemanticAnalyzer
+from semantic_line_analyzer import SemanticLineAnalyzer
+from source_file import SourceFile
+
+JSONL_BUFFER_LINES = 256
+# Campos de AnalysisResult que se guardan en la ResultCache (además de statistics)
+_CACHED_FIELDS = ('ast', 'lexical_errors', 'syntax_errors', 'semantic_errors', 'line_table')
+
+
+class AnalysisResult:
+    """Resultado de analyze_source; to_dict() da una versión serializable a JSON"""
+
+    __slots__ = ('source', 'tokens', 'ast', 'lexical_errors', 'syntax_errors',
+                 'semantic_errors', 'line_table', 'statistics')
+
+    def __init__(self, source=None):
+        self.source = source            # ruta del archivo o None para un str
+        self.tokens = None              # [(tipo, valor, línea)] si se pidieron
+        self.ast = None
+        self.lexical_errors = []
+        self.syntax_errors = []
+        self.semantic_errors = []
+        self.line_table = []            # clasificaciones de SemanticLineAnalyzer
+        self.statistics = {}
+
+    @property
+    def ok(self):
+        return (self.ast is not None and not self.lexical_errors
+                and not self.syntax_errors and not self.semantic_errors)
+
+    def to_dict(self, include_ast=False):
+        data = {
+            'source': self.source,
+            'ok': self.ok,
+            'lexical_errors': self.lexical_errors,
+            'syntax_errors': self.syntax_errors,
+            'semantic_errors': self.semantic_errors,
+            'line_table': self.line_table,
+            'statistics': self.statistics,
+        }
+        if self.tokens is not None:
+            data['tokens'] = self.tokens
+        if include_ast:
+            data['ast'] = ast_to_dict(self.ast)
+        return data
+
+
+# ---------- CONVERSIONES ----------
+def ast_to_dict(root):
+    """AST -> dicts y listas anidados (las listas internas se conservan), sin recursión"""
+    out = [None]
+    stack = [(root, out, 0)]
+    while stack:
+        node, parent, index = stack.pop()
+        if node is None:
+            continue
+        if isinstance(node, list):
+            items = [None] * len(node)
+            parent[index] = items
+            stack.extend((item, items, i) for i, item in enumerate(node))
+            continue
+        children = [None] * len(node.children)
+        entry = parent[index] = {'type': node.type, 'value': node.value, 'line': node.line, 'children': children}
+        stack.extend((child, children, i) for i, child in enumerate(node.children))
+    return out[0]
+
+
+def count_nodes(root):
+    count = 0
+
+    def enter(node, _):
+        nonlocal count
+        count += 1
+
+    walk(root, enter)
+    return count
+
+
+# ---------- ANÁLISIS ----------
+def analyze_source(code, include_tokens=False, parser=None, analyzer=None, cache=None, fold=False,
+                   profiler=None):
+    """Analiza un str o un SourceFile sin imprimir nada.
+
+    El lexer se recorre una sola vez: los tokens alimentan al parser y, si
+    include_tokens es True, se guardan como tuplas (tipo, valor, línea).
+    parser/analyzer permiten reutilizar instancias (deben ser silenciosas);
+    sin parser se usa el del hilo actual (parser_pool.thread_parser).
+    Con una ResultCache, un acierto evita todo el análisis; los tokens no se
+    guardan en ella, así que include_tokens la desactiva.
+    fold=True aplica constant_folding al AST antes del análisis semántico y
+    añade sus cifras (nodos antes/después) en statistics['folding'].
+    Con un profiling.Profiler cada fase queda medida (tiempo, memoria,
+    contadores, visitas del analizador semántico); entonces los tokens se
+    lexean antes de parsear, en lugar de en flujo, para medir cada fase aparte.
+    """
+    from_file = isinstance(code, SourceFile)
+    profiler = profiler or NULL_PROFILER
+    parser = parser or thread_parser()
+    analyzer = analyzer or SemanticAnalyzer()
+    result = AnalysisResult(code.path if from_file else None)
+    start = time.perf_counter()
+
+    key = None
+    if cache is not None and not include_tokens:
+        key = cache.key(parser, code.buffer if from_file else code.encode('utf-8'),
+                        variant='fold' if fold else '')
+        record = cache.get(key)
+        if record is not None:
+            for field in _CACHED_FIELDS:
+                setattr(result, field, record[field])
+            if result.ast is not None:  # el AST se guarda en formato binario
+                result.ast = ast_binary.loads(result.ast)
+            result.statistics = dict(record['statistics'], cache='hit',
+                                     elapsed=time.perf_counter() - start)
+            return result
+
+    token_count = 0
+    recorded = [] if include_tokens else None
+
+    def tokens():
+        nonlocal token_count
+        for tok in parser.lexer.iter_tokens(code.stream() if from_file else code):
+            token_count += 1
+            if recorded is not None:
+                recorded.append((tok.type, tok.value, tok.lineno))
+            yield tok
+
+    source_tokens = tokens()
+    if profiler.enabled:
+        with profiler.phase('lexico') as phase:
+            source_tokens = list(source_tokens)
+            phase.count('tokens', token_count)
+    with profiler.phase('sintactico') as phase:
+        ast = parser.parse_tokens(source_tokens)
+        phase.count('errores', len(parser.errors))
+    result.tokens = recorded
+    result.lexical_errors = list(parser.lexer.errors)
+    result.syntax_errors = list(parser.errors)
+    stats = {'tokens': token_count, 'nodes': 0}
+
+    if ast:
+        if fold:
+            with profiler.phase('plegado') as phase:
+                ast, folding = fold_constants(ast)
+                phase.count('nodos', folding['nodes_before'])
+            stats['nodes'] = folding['nodes_after']
+            stats['folding'] = folding
+        else:
+            stats['nodes'] = count_nodes(ast)
+        result.ast = ast
+        with profiler.phase('semantico') as phase:
+            phase.track_visits(analyzer)
+            _, errors = analyzer.analyze(ast)
+            phase.count('nodos', stats['nodes'])
+            symbols = getattr(analyzer, 'symbol_table', None)
+            if symbols is not None:
+                phase.count('simbolos', symbols.defined)
+            phase.count('errores', len(errors))
+        result.semantic_errors = list(errors)
+        with profiler.phase('lineas') as phase:
+            line_analyzer = SemanticLineAnalyzer()
+            if from_file:
+                result.line_table = line_analyzer.analyze_source_lines(code, ast)
+            else:
+                result.line_table = line_analyzer.analyze_lines(code, ast)
+            stats['lines'] = line_analyzer.get_semantic_statistics()
+            phase.count('lineas', stats['lines']['total_lines'])
+    elif not parser.errors:
+        result.syntax_errors.append("Error en análisis sintáctico")
+
+    stats['elapsed'] = time.perf_counter() - start
+    result.statistics = stats
+    if key is not None:
+        record = {field: getattr(result, field) for field in _CACHED_FIELDS}
+        if result.ast is not None:
+            record['ast'] = ast_binary.dumps(result.ast)
+        record['statistics'] = {k: v for k, v in stats.items() if k != 'elapsed'}
+        cache.put(key, record)
+        stats['cache'] = 'miss'
+    return result
+
+
+def analyze_path(path, include_tokens=False, parser=None, analyzer=None, cache=None, fold=False,
+                 profiler=None):
+    """analyze_source sobre un archivo mapeado en memoria"""
+    with SourceFile(path) as source:
+        return analyze_source(source, include_tokens, parser, analyzer, cache, fold, profiler)
+
+
+# ---------- SALIDA JSON LINES ----------
+def write_jsonl(records, stream=None, buffer_lines=JSONL_BUFFER_LINES):
+    """Escribe un objeto JSON por línea; las líneas se agrupan y se emiten en
+    bloques de `buffer_lines` para no hacer una escritura por resultado.
+    Acepta AnalysisResult o dicts; devuelve el número de registros escritos."""
+    stream = stream or sys.stdout
+    pending = []
+    written = 0
+    for record in records:
+        if isinstance(record, AnalysisResult):
+            record = record.to_dict()
+        pending.append(json.dumps(record, ensure_ascii=False))
+        if len(pending) >= buffer_lines:
+            stream.write('\n'.join(pending) + '\n')
+            written += len(pending)
+            pending.clear()
+    if pending:
+        stream.write('\n'.join(pending) + '\n')
+        written += len(pending)
+    stream.flush()
+    return written
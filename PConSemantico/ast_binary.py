@@ -0,0 +1,323 @@
+# ast_binary.py
+# Formato binario compacto para el AST de CPPParser.
+#
+#   cabecera | desplazamientos de cadenas (uint32) | cadenas UTF-8 | registros de nodos
+#
+# Los nodos se numeran en anchura, así que los hijos de un nodo son registros
+# consecutivos: cada registro guarda el índice del primer hijo y cuántos hay.
+# Los tipos de nodo son índices pequeños en la tabla de cadenas (las primeras
+# n_types) y los identificadores y literales se guardan una sola vez. Las listas
+# internas (p. ej. los parámetros de FUN_DEF) y los hijos None se codifican como
+# pseudo-nodos '#list' y '#none'.
+
+import mmap
+import struct
+import sys
+from collections import deque
+
+from parser_cpp import ASTNode, NO_CHILDREN
+
+MAGIC = b'PCAS'
+VERSION = 1
+
+# magic, versión, reservado, n_types, n_strings (incluye los tipos), n_nodes, bytes de cadenas
+HEADER = struct.Struct('<4sHHIIII')
+# tipo, clase de valor, reservado, línea (-1 = None), valor, primer hijo, nº de hijos
+NODE = struct.Struct('<HBxiqII')
+FLOAT = struct.Struct('<d')
+INT64 = struct.Struct('<q')
+
+LIST_TYPE = '#list'
+NONE_TYPE = '#none'
+
+# Clase del valor de un nodo
+V_NONE, V_STR, V_INT, V_FLOAT, V_BOOL, V_BIGINT = range(6)
+_INT64_MIN, _INT64_MAX = -(1 << 63), (1 << 63) - 1
+
+
+class ASTFormatError(ValueError):
+    pass
+
+
+# ---------- ESCRITURA ----------
+def dumps(root):
+    """AST (ASTNode, lista o None) -> bytes"""
+    types = {}
+    strings = {}
+    records = []
+    pack = NODE.pack
+
+    def type_id(name):
+        tid = types.get(name)
+        if tid is None:
+            tid = types[name] = len(types)
+        return tid
+
+    def string_id(text):
+        sid = strings.get(text)
+        if sid is None:
+            sid = strings[text] = len(strings)
+        return sid
+
+    # Primera pasada en anchura: numera los nodos y fija sus hijos consecutivos
+    order = [root]
+    queue = deque([root])
+    next_index = 1
+    while queue:
+        node = queue.popleft()
+        if node is None:
+            children = NO_CHILDREN
+        elif isinstance(node, list):
+            children = node
+        else:
+            children = node.children
+        records.append((next_index, len(children)))
+        next_index += len(children)
+        order.extend(children)
+        queue.extend(children)
+
+    # Segunda pasada: registros (los índices de cadena se corrigen al final,
+    # cuando se conoce cuántos tipos hay)
+    raw = []
+    for node, (first, count) in zip(order, records):
+        if node is None:
+            raw.append((type_id(NONE_TYPE), V_NONE, -1, 0, first, count))
+            continue
+        if isinstance(node, list):
+            raw.append((type_id(LIST_TYPE), V_NONE, -1, 0, first, count))
+            continue
+        value = node.value
+        if value is None:
+            kind, payload = V_NONE, 0
+        elif isinstance(value, bool):
+            kind, payload = V_BOOL, int(value)
+        elif isinstance(value, int):
+            if _INT64_MIN <= value <= _INT64_MAX:
+                kind, payload = V_INT, value
+            else:
+                kind, payload = V_BIGINT, string_id(str(value))
+        elif isinstance(value, float):
+            kind, payload = V_FLOAT, INT64.unpack(FLOAT.pack(value))[0]
+        else:
+            kind, payload = V_STR, string_id(str(value))
+        line = node.line if node.line is not None else -1
+        raw.append((type_id(node.type), kind, line, payload, first, count))
+
+    n_types = len(types)
+    table = list(types) + list(strings)
+    encoded = [s.encode('utf-8') for s in table]
+    offsets = [0]
+    for data in encoded:
+        offsets.append(offsets[-1] + len(data))
+    blob = b''.join(encoded)
+
+    out = bytearray(HEADER.pack(MAGIC, VERSION, 0, n_types, len(table), len(raw), len(blob)))
+    out += struct.pack(f'<{len(offsets)}I', *offsets)
+    out += blob
+    out += b'\0' * (-len(out) % 8)
+    for tid, kind, line, payload, first, count in raw:
+        if kind in (V_STR, V_BIGINT):
+            payload += n_types
+        out += pack(tid, kind, line, payload, first, count)
+    return bytes(out)
+
+
+def dump(root, path):
+    with open(path, 'wb') as f:
+        f.write(dumps(root))
+
+
+# ---------- LECTURA ----------
+class BinaryAST:
+    """Vista de un AST codificado (bytes o archivo mapeado en memoria).
+
+    load() reconstruye el árbol completo de ASTNode; root devuelve un LazyNode
+    que decodifica cada nodo y cadena solo cuando se accede a él.
+    """
+
+    def __init__(self, data):
+        self._map = data if isinstance(data, mmap.mmap) else None
+        self.data = memoryview(data)
+        if len(self.data) < HEADER.size:
+            raise ASTFormatError("Archivo AST truncado")
+        magic, version, _, n_types, n_strings, n_nodes, blob_size = HEADER.unpack_from(self.data)
+        if magic != MAGIC or version != VERSION:
+            raise ASTFormatError("No es un AST binario compatible")
+        self.n_types = n_types
+        self.n_strings = n_strings
+        self.n_nodes = n_nodes
+        offsets_at = HEADER.size
+        self._blob_at = offsets_at + 4 * (n_strings + 1)
+        self._offsets = self.data[offsets_at:self._blob_at].cast('I')
+        nodes_at = self._blob_at + blob_size
+        nodes_at += -nodes_at % 8
+        self._nodes_at = nodes_at
+        if len(self.data) < nodes_at + n_nodes * NODE.size:
+            raise ASTFormatError("Archivo AST truncado")
+        self._strings = [None] * n_strings
+        self._list_tag = self._tag(LIST_TYPE)
+        self._none_tag = self._tag(NONE_TYPE)
+
+    @classmethod
+    def open(cls, path):
+        with open(path, 'rb') as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(mm)
+
+    def close(self):
+        self._offsets.release()
+        self.data.release()
+        if self._map is not None:
+            self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    # ---------- ACCESO ----------
+    def string(self, index):
+        s = self._strings[index]
+        if s is None:
+            start = self._blob_at + self._offsets[index]
+            end = self._blob_at + self._offsets[index + 1]
+            s = self._strings[index] = str(self.data[start:end], 'utf-8')
+        return s
+
+    def _tag(self, name):
+        for i in range(self.n_types):
+            if self.string(i) == name:
+                return i
+        return -1
+
+    def record(self, index):
+        return NODE.unpack_from(self.data, self._nodes_at + index * NODE.size)
+
+    def decode_value(self, kind, payload):
+        if kind == V_NONE:
+            return None
+        if kind == V_STR:
+            return self.string(payload)
+        if kind == V_INT:
+            return payload
+        if kind == V_FLOAT:
+            return FLOAT.unpack(INT64.pack(payload))[0]
+        if kind == V_BOOL:
+            return bool(payload)
+        return int(self.string(payload))
+
+    @property
+    def root(self):
+        return self.node(0)
+
+    def node(self, index):
+        tag = self.record(index)[0]
+        if tag == self._none_tag:
+            return None
+        if tag == self._list_tag:
+            first, count = self.record(index)[4:]
+            return [self.node(i) for i in range(first, first + count)]
+        return LazyNode(self, index)
+
+    # ---------- CARGA COMPLETA ----------
+    def load(self):
+        """Reconstruye el árbol de ASTNode completo (sin recursión).
+
+        Con la numeración en anchura los hijos siempre tienen índice mayor que
+        el padre, así que basta recorrer los registros de atrás hacia delante.
+        """
+        n = self.n_nodes
+        if n == 0:
+            return None
+        types = [sys.intern(self.string(i)) for i in range(self.n_types)]
+        strings = [self.string(i) for i in range(self.n_strings)]
+        list_tag, none_tag = self._list_tag, self._none_tag
+        section = self.data[self._nodes_at:self._nodes_at + n * NODE.size]
+        records = list(NODE.iter_unpack(section))
+        section.release()
+        built = [None] * n
+        new = ASTNode.__new__
+        for i in range(n - 1, -1, -1):
+            tag, kind, line, payload, first, count = records[i]
+            if tag == none_tag:
+                continue
+            children = built[first:first + count] if count else NO_CHILDREN
+            if tag == list_tag:
+                built[i] = children if count else []
+                continue
+            if kind == V_STR:
+                value = strings[payload]
+            elif kind == V_NONE:
+                value = None
+            elif kind == V_INT:
+                value = payload
+            else:
+                value = self.decode_value(kind, payload)
+            node = new(ASTNode)
+            node.type = types[tag]
+            node.value = value
+            node.children = children
+            node.line = None if line < 0 else line
+            built[i] = node
+        return built[0]
+
+
+class LazyNode:
+    """Nodo de un BinaryAST que se decodifica al acceder a sus atributos.
+    Tiene los mismos atributos que ASTNode, así que sirve para walk/evaluate."""
+
+    __slots__ = ('_ast', '_index', '_record')
+
+    def __init__(self, ast, index):
+        self._ast = ast
+        self._index = index
+        self._record = None
+
+    def _get(self):
+        if self._record is None:
+            self._record = self._ast.record(self._index)
+        return self._record
+
+    @property
+    def type(self):
+        return self._ast.string(self._get()[0])
+
+    @property
+    def value(self):
+        rec = self._get()
+        return self._ast.decode_value(rec[1], rec[3])
+
+    @property
+    def line(self):
+        line = self._get()[2]
+        return None if line < 0 else line
+
+    @property
+    def children(self):
+        first, count = self._get()[4:]
+        node = self._ast.node
+        return [node(i) for i in range(first, first + count)]
+
+    def __repr__(self):
+        return f"LazyNode({self.type}, {self.value}, {self._get()[5]} children)"
+
+
+def loads(data):
+    """bytes -> AST completo"""
+    return BinaryAST(data).load()
+
+
+def load(path, lazy=False):
+    """Abre un AST guardado con dump() mapeándolo en memoria.
+
+    lazy=False devuelve el árbol de ASTNode completo y libera el mapa;
+    lazy=True devuelve el BinaryAST abierto (usar .root y cerrarlo al terminar).
+    """
+    ast = BinaryAST.open(path)
+    if lazy:
+        return ast
+    try:
+        return ast.load()
+    finally:
+        ast.close()
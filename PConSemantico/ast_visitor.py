@@ -0,0 +1,137 @@
+from types import GeneratorType
+
+
+class DispatchTable(dict):
+    """Tabla tipo de nodo -> método enlazado, construida una vez por instancia.
+
+    Los nombres de los manejadores (prefijo + tipo en minúsculas) se resuelven
+    una sola vez por clase; un tipo sin entrada se busca la primera vez que
+    aparece y queda guardado, así que cada visita es una simple consulta al dict.
+    """
+
+    _names_by_class: dict = {}
+
+    def __init__(self, owner, prefix, default=None):
+        super().__init__(
+            (node_type, getattr(owner, name))
+            for node_type, name in self.handler_names(type(owner), prefix).items()
+        )
+        self._owner = owner
+        self._prefix = prefix
+        self._default = default
+
+    @classmethod
+    def handler_names(cls, owner_cls, prefix):
+        key = (owner_cls, prefix)
+        names = cls._names_by_class.get(key)
+        if names is None:
+            names = {
+                attr[len(prefix):].upper(): attr
+                for attr in dir(owner_cls)
+                if attr.startswith(prefix) and callable(getattr(owner_cls, attr))
+            }
+            cls._names_by_class[key] = names
+        return names
+
+    def __missing__(self, node_type):
+        handler = getattr(self._owner, f"{self._prefix}{node_type.lower()}", self._default)
+        self[node_type] = handler
+        return handler
+
+
+class CountingTable:
+    """Envuelve una tabla de manejadores y cuenta las consultas por tipo de nodo
+    en `counts` (un Counter); se usa solo al perfilar (profiling.py)"""
+
+    __slots__ = ('table', 'counts')
+
+    def __init__(self, table, counts):
+        self.table = table
+        self.counts = counts
+
+    def __getitem__(self, node_type):
+        self.counts[node_type] += 1
+        return self.table[node_type]
+
+
+# =============================================================
+# Motor de recorrido iterativo (pila explícita, sin límite de profundidad)
+# =============================================================
+SKIP = object()  # devuelto por `enter` para no descender a los hijos
+
+
+def walk(root, enter=None, leave=None, state=None):
+    """Recorrido en profundidad con pila explícita.
+
+    enter(node, state) se llama en preorden y devuelve el estado que reciben
+    los hijos (o SKIP para no visitarlos); leave(node, state) se llama en
+    postorden. Las listas se aplanan conservando el estado y None se ignora.
+    """
+    stack = [(root, state, False)]
+    push = stack.append
+    pop = stack.pop
+    while stack:
+        node, st, leaving = pop()
+        if leaving:
+            leave(node, st)
+            continue
+        if node is None:
+            continue
+        if isinstance(node, list):
+            for item in reversed(node):
+                push((item, st, False))
+            continue
+        child_state = enter(node, st) if enter else st
+        if child_state is SKIP:
+            continue
+        if leave:
+            push((node, st, True))
+        for child in reversed(node.children):
+            push((child, child_state, False))
+
+
+def evaluate(root, handlers, visit_list=None):
+    """Evalúa un árbol con manejadores que piden hijos mediante `yield`.
+
+    handlers[node.type](node) devuelve el valor del nodo o un generador; cada
+    `yield hijo` suspende al manejador hasta que el hijo tenga valor (se le
+    envía con send) y el `return` del generador es el valor del nodo. None
+    vale None y las listas se delegan en visit_list. Las excepciones suben por
+    la pila igual que en la versión recursiva.
+    """
+    stack = []
+    node = root
+    error = None
+    while True:
+        try:
+            if node is None:
+                value = None
+            elif isinstance(node, list):
+                value = visit_list(node)
+            else:
+                value = handlers[node.type](node)
+        except Exception as e:
+            error = e
+        # Sube resultados hasta que algún manejador pida otro hijo
+        while True:
+            if error is None and type(value) is GeneratorType:
+                stack.append(value)
+                value = None
+            elif not stack:
+                if error is not None:
+                    raise error
+                return value
+            gen = stack[-1]
+            try:
+                if error is None:
+                    node = gen.send(value)
+                else:
+                    node = gen.throw(error)
+                    error = None
+                break
+            except StopIteration as stop:
+                stack.pop()
+                value = stop.value
+            except Exception as e:
+                stack.pop()
+                error = e
@@ -0,0 +1,140 @@
+# batch.py
+# Análisis de muchos archivos C++ en paralelo (un proceso por núcleo).
+#
+#   python batch.py [-j N] [--jsonl] [--cache] [--fold] archivo.cpp 'src/**/*.cpp' ...
+
+import argparse
+import glob
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import analysis
+from analysis import AnalysisResult
+from parser_cpp import CPPParser
+from result_cache import ResultCache
+from semantic_analyzer import SemanticAnalyzer
+
+# Instancias por proceso: se construyen una vez en _init_worker y se reutilizan
+_parser = None
+_analyzer = None
+_cache = None
+_fold = False
+
+
+def expand_inputs(patterns, unmatched=None):
+    """Archivos y patrones glob (admite **) -> rutas únicas en orden de aparición.
+
+    Las rutas explícitas se pasan tal cual, existan o no: si no se pueden leer
+    quedan como error de ese archivo. Los patrones que no encuentran ningún
+    archivo se añaden a la lista `unmatched`, si se da.
+    """
+    paths = []
+    seen = set()
+    for pattern in patterns:
+        if glob.has_magic(pattern):
+            matches = [p for p in sorted(glob.glob(pattern, recursive=True)) if os.path.isfile(p)]
+            if not matches and unmatched is not None:
+                unmatched.append(pattern)
+        else:
+            matches = [pattern]
+        for path in matches:
+            if path not in seen:
+                seen.add(path)
+                paths.append(path)
+    return paths
+
+
+def _init_worker(cache_options=None, fold=False):
+    """cache_options: None (sin caché) o kwargs de ResultCache; fold: plegado de constantes"""
+    global _parser, _analyzer, _cache, _fold
+    _parser = CPPParser(quiet=True)
+    _analyzer = SemanticAnalyzer()
+    _cache = ResultCache(**cache_options) if cache_options is not None else None
+    _fold = fold
+
+
+def analyze_path(path):
+    """Léxico + sintáctico + semántico de un archivo; devuelve un dict serializable
+    (AnalysisResult.to_dict, sin tokens ni AST)"""
+    if _parser is None:
+        _init_worker()
+    try:
+        result = analysis.analyze_path(path, parser=_parser, analyzer=_analyzer, cache=_cache, fold=_fold)
+    except (OSError, UnicodeDecodeError) as e:
+        result = AnalysisResult(path)
+        result.syntax_errors.append(f"No se pudo leer el archivo: {e}")
+    except Exception as e:  # un fallo interno con un archivo no detiene el lote
+        _parser.reset()
+        result = AnalysisResult(path)
+        result.syntax_errors.append(f"Error interno al analizar el archivo: {type(e).__name__}: {e}")
+    return result.to_dict()
+
+
+def _unmatched_result(pattern):
+    result = AnalysisResult(pattern)
+    result.syntax_errors.append("El patrón no coincide con ningún archivo")
+    return result.to_dict()
+
+
+def analyze_files(patterns, workers=None, chunksize=None, cache_options=None, fold=False):
+    """Analiza todos los archivos en un ProcessPoolExecutor; resultados en orden de
+    entrada, seguidos de un resultado con error por cada patrón sin coincidencias"""
+    unmatched = []
+    paths = expand_inputs(patterns, unmatched)
+    errors = [_unmatched_result(pattern) for pattern in unmatched]
+    if not paths:
+        return errors
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        _init_worker(cache_options, fold)
+        return [analyze_path(p) for p in paths] + errors
+    # Lotes grandes reducen el coste de comunicación entre procesos
+    chunksize = chunksize or max(1, len(paths) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(cache_options, fold)) as pool:
+        return list(pool.map(analyze_path, paths, chunksize=chunksize)) + errors
+
+
+def cache_summary(results):
+    """Aciertos y fallos de caché de una ejecución (cada proceso tiene su ResultCache)"""
+    outcomes = [r['statistics'].get('cache') for r in results]
+    return {'hits': outcomes.count('hit'), 'misses': outcomes.count('miss')}
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Analizador C++ por lotes")
+    ap.add_argument('inputs', nargs='+', help="archivos o patrones glob")
+    ap.add_argument('-j', '--jobs', type=int, default=None, help="procesos (por defecto: núcleos)")
+    ap.add_argument('--jsonl', action='store_true', help="un resultado JSON por línea en stdout")
+    ap.add_argument('--cache', action='store_true', help="reutilizar resultados guardados en disco")
+    ap.add_argument('--cache-dir', default=None, help="directorio de la caché")
+    ap.add_argument('--cache-size', type=int, default=256, help="tamaño máximo de la caché (MB)")
+    ap.add_argument('--fold', action='store_true', help="plegar constantes antes del análisis semántico")
+    args = ap.parse_args(argv)
+
+    cache_options = None
+    if args.cache:
+        cache_options = {'cache_dir': args.cache_dir, 'max_bytes': args.cache_size * 1024 * 1024}
+    results = analyze_files(args.inputs, workers=args.jobs, cache_options=cache_options,
+                            fold=args.fold)
+    if not results:
+        print("No hay archivos que analizar", file=sys.stderr)
+        return 2
+    failed = [r for r in results if not r['ok']]
+    if args.jsonl:
+        analysis.write_jsonl(results)
+        return 1 if failed else 0
+    for r in failed:
+        print(f"✗ {r['source']}")
+        for err in r['lexical_errors'] + r['syntax_errors'] + r['semantic_errors']:
+            print(f"    - {err}")
+    print(f"{len(results)} archivos, {len(results) - len(failed)} correctos, {len(failed)} con errores")
+    if args.cache:
+        summary = cache_summary(results)
+        print(f"caché: {summary['hits']} aciertos, {summary['misses']} fallos")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
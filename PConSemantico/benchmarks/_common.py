@@ -0,0 +1,41 @@
+# benchmarks/_common.py
+# Utilidades compartidas por los scripts de benchmarks.
+
+import os
+import sys
+import time
+
+# Los módulos del analizador se importan de forma plana (from lexer_cpp import ...)
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+def best_of(fn, repeat=5):
+    """Mejor tiempo (s) de `repeat` ejecuciones de fn()"""
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def print_table(headers, rows):
+    widths = [max(len(str(h)), *(len(str(r[i])) for r in rows)) for i, h in enumerate(headers)]
+    print(" | ".join(f"{h:<{w}}" for h, w in zip(headers, widths)))
+    print("-+-".join("-" * w for w in widths))
+    for row in rows:
+        print(" | ".join(f"{str(c):<{w}}" for c, w in zip(row, widths)))
+
+
+def straight_line_program(statements, functions=1):
+    """Programa con `functions` funciones y `statements` sentencias por bloque"""
+    parts = []
+    for f in range(functions):
+        body = ["    int x = 0;", "    int y = 1;"]
+        for i in range(statements):
+            body.append(f"    x = x + y * {i % 97};")
+        body.append("    return x;")
+        parts.append(f"int f{f}() {{\n" + "\n".join(body) + "\n}\n")
+    return "\n".join(parts)
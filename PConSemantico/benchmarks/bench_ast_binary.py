@@ -0,0 +1,84 @@
+# benchmarks/bench_ast_binary.py
+# Recargar un AST grande: volver a parsear, pickle y el formato de ast_binary
+# (carga completa desde mmap y apertura perezosa).
+#
+#   python benchmarks/bench_ast_binary.py [nodos_aprox]
+
+import os
+import pickle
+import sys
+import tempfile
+import time
+
+from _common import best_of, print_table, straight_line_program
+import ast_binary
+from analysis import count_nodes
+from ast_visitor import walk
+from parser_cpp import CPPParser
+
+NODES_PER_STATEMENT = 7  # x = x + y * k;
+
+
+def main():
+    target = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    statements = max(1, target // NODES_PER_STATEMENT)
+    functions = max(1, statements // 1000)
+    source = straight_line_program(statements // functions, functions)
+
+    parser = CPPParser(quiet=True)
+    t0 = time.perf_counter()
+    ast = parser.parse(source)
+    parse_t = time.perf_counter() - t0
+    print(f"{count_nodes(ast)} nodos, {len(source) / 1e6:.1f} MB de fuente")
+
+    tmp = tempfile.mkdtemp(prefix='astbin_')
+    bin_path = os.path.join(tmp, 'ast.bin')
+    pkl_path = os.path.join(tmp, 'ast.pickle')
+    try:
+        t0 = time.perf_counter()
+        ast_binary.dump(ast, bin_path)
+        dump_t = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        with open(pkl_path, 'wb') as f:
+            pickle.dump(ast, f, protocol=pickle.HIGHEST_PROTOCOL)
+        pdump_t = time.perf_counter() - t0
+
+        def pickle_load():
+            with open(pkl_path, 'rb') as f:
+                pickle.load(f)
+
+        def lazy_open():
+            ast_binary.load(bin_path, lazy=True).close()
+
+        def lazy_walk():
+            with ast_binary.load(bin_path, lazy=True) as lazy:
+                walk(lazy.root)
+
+        pload_t = best_of(pickle_load, 3)
+        full_t = best_of(lambda: ast_binary.load(bin_path), 3)
+        open_t = best_of(lazy_open, 3)
+        lazy_t = best_of(lazy_walk, 1)
+        bin_size = os.path.getsize(bin_path)
+        pkl_size = os.path.getsize(pkl_path)
+    finally:
+        for path in (bin_path, pkl_path):
+            if os.path.exists(path):
+                os.remove(path)
+        os.rmdir(tmp)
+
+    print_table(
+        ['Operación', 'Tiempo (ms)', 'Frente a parsear', 'Tamaño (MB)'],
+        [
+            ['parsear de nuevo', f"{parse_t * 1e3:.1f}", '1.00x', '-'],
+            ['pickle.dump', f"{pdump_t * 1e3:.1f}", '-', f"{pkl_size / 1e6:.1f}"],
+            ['pickle.load', f"{pload_t * 1e3:.1f}", f"{parse_t / pload_t:.1f}x", '-'],
+            ['ast_binary.dump', f"{dump_t * 1e3:.1f}", '-', f"{bin_size / 1e6:.1f}"],
+            ['carga completa (mmap)', f"{full_t * 1e3:.1f}", f"{parse_t / full_t:.1f}x", '-'],
+            ['apertura perezosa', f"{open_t * 1e3:.3f}", f"{parse_t / open_t:.0f}x", '-'],
+            ['recorrido perezoso', f"{lazy_t * 1e3:.1f}", f"{parse_t / lazy_t:.1f}x", '-'],
+        ],
+    )
+
+
+if __name__ == '__main__':
+    main()
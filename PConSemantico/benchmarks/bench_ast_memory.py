@@ -0,0 +1,62 @@
+# benchmarks/bench_ast_memory.py
+# Memoria del AST: nodo compacto (__slots__) frente al nodo clásico con __dict__.
+#
+#   python benchmarks/bench_ast_memory.py [sentencias]
+
+import sys
+import tracemalloc
+
+from _common import print_table, straight_line_program
+from parser_cpp import ASTNode, CPPParser
+
+
+class DictASTNode:
+    """Disposición anterior: __dict__ por instancia y lista de hijos propia"""
+    def __init__(self, type_node, value=None, children=None, line=None):
+        self.type = type_node
+        self.value = value
+        self.children = children or []
+        self.line = line
+
+
+def clone(node, cls):
+    if node is None:
+        return None
+    if isinstance(node, list):
+        return [clone(n, cls) for n in node]
+    return cls(node.type, node.value, [clone(c, cls) for c in node.children], node.line)
+
+
+def count_nodes(node):
+    if node is None:
+        return 0
+    if isinstance(node, list):
+        return sum(count_nodes(n) for n in node)
+    return 1 + sum(count_nodes(c) for c in node.children)
+
+
+def measure(ast, cls):
+    tracemalloc.start()
+    copy = clone(ast, cls)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del copy
+    return size
+
+
+def main():
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    code = straight_line_program(statements)
+    ast = CPPParser().parse(code)
+    nodes = count_nodes(ast)
+
+    rows = []
+    for name, cls in (('__dict__', DictASTNode), ('__slots__', ASTNode)):
+        size = measure(ast, cls)
+        rows.append([name, nodes, f"{size / 2**20:.2f}", f"{size / nodes:.1f}"])
+    print(f"Fuente: {len(code) / 2**20:.2f} MiB")
+    print_table(['Disposición', 'Nodos', 'MiB', 'Bytes/nodo'], rows)
+
+
+if __name__ == '__main__':
+    main()
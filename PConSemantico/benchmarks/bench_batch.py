@@ -0,0 +1,44 @@
+# benchmarks/bench_batch.py
+# Escalado del driver por lotes con el número de procesos.
+#
+#   python benchmarks/bench_batch.py [archivos] [sentencias_por_archivo]
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from _common import print_table, straight_line_program
+from batch import analyze_files
+
+
+def main():
+    files = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    statements = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+    tmp = tempfile.mkdtemp(prefix='batch_bench_')
+    try:
+        code = straight_line_program(statements, functions=2)
+        for i in range(files):
+            with open(os.path.join(tmp, f"tu_{i:05d}.cpp"), 'w') as f:
+                f.write(code)
+        pattern = os.path.join(tmp, '*.cpp')
+
+        rows = []
+        base = None
+        workers = 1
+        while workers <= (os.cpu_count() or 1):
+            t0 = time.perf_counter()
+            results = analyze_files([pattern], workers=workers)
+            elapsed = time.perf_counter() - t0
+            assert len(results) == files
+            base = base or elapsed
+            rows.append([workers, f"{elapsed:.2f}", f"{files / elapsed:.1f}", f"{base / elapsed:.2f}x"])
+            workers *= 2
+        print_table(['Procesos', 'Tiempo (s)', 'Archivos/s', 'Aceleración'], rows)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+# benchmarks/bench_call_check.py
+# Comprobación de llamadas en código con muchas llamadas: índice de firmas de la
+# pre-pasada (consulta O(1)) frente a buscar el FUN_DEF del llamado en cada llamada.
+#
+#   python benchmarks/bench_call_check.py [funciones] [llamadas_por_función]
+
+import sys
+
+from _common import best_of, print_table
+from parser_cpp import CPPParser
+from semantic_analyzer import SemanticAnalyzer
+
+
+def call_heavy_program(functions, calls):
+    """Cada función llama a otras (también a las definidas después)"""
+    parts = []
+    for f in range(functions):
+        body = ["    int x = a;", "    float y = b;"]
+        for c in range(calls):
+            callee = (f * 7 + c * 13) % functions
+            body.append(f"    x = f{callee}(x, y) + 1;")
+        body.append("    return x;")
+        parts.append(f"int f{f}(int a, float b) {{\n" + "\n".join(body) + "\n}\n")
+    return "\n".join(parts)
+
+
+class ScanningSignatures:
+    """Sin índice: cada consulta recorre las declaraciones hasta el FUN_DEF"""
+    def __init__(self, declarations):
+        self.declarations = declarations
+
+    def get(self, name):
+        for node in self.declarations:
+            if node.type == 'FUN_DEF' and node.value == name:
+                return node.children[0].value, tuple(p.children[0].value for p in node.children[1])
+        return None
+
+
+class ScanningAnalyzer(SemanticAnalyzer):
+    def visit_program(self, node):
+        self.signatures = ScanningSignatures(node.children)
+        return super().visit_program(node)
+
+
+def main():
+    sizes = [int(sys.argv[1])] if len(sys.argv) > 1 else [50, 200, 800]
+    calls = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    parser = CPPParser(quiet=True)
+    rows = []
+    for functions in sizes:
+        ast = parser.parse_stream(call_heavy_program(functions, calls))
+        indexed, scanning = SemanticAnalyzer(), ScanningAnalyzer()
+        assert indexed.analyze(ast)[1] == scanning.analyze(ast)[1]
+        t_scan = best_of(lambda: scanning.analyze(ast), 3)
+        t_index = best_of(lambda: indexed.analyze(ast), 3)
+        n_calls = functions * calls
+        rows.append([functions, n_calls, f"{t_scan / n_calls * 1e6:.2f}", f"{t_index / n_calls * 1e6:.2f}",
+                     f"{t_scan / t_index:.2f}x"])
+    # Tiempo del análisis completo dividido entre el número de llamadas
+    print_table(['Funciones', 'Llamadas', 'Búsqueda (µs/llamada)', 'Índice (µs/llamada)', 'Aceleración'], rows)
+
+
+if __name__ == '__main__':
+    main()
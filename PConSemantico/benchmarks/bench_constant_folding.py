@@ -0,0 +1,68 @@
+# benchmarks/bench_constant_folding.py
+# Plegado de constantes: nodos del AST antes y después, coste de la pasada y
+# tiempo del análisis semántico + clasificación por líneas sobre cada AST.
+#
+#   python benchmarks/bench_constant_folding.py [sentencias_por_función] [funciones]
+
+import sys
+
+from _common import best_of, print_table
+from constant_folding import ConstantFolder
+from parser_cpp import CPPParser
+from semantic_analyzer import SemanticAnalyzer
+from semantic_line_analyzer import SemanticLineAnalyzer
+
+
+def constant_heavy_program(statements, functions):
+    """Sentencias con subexpresiones constantes, identidades y condiciones fijas"""
+    parts = []
+    for f in range(functions):
+        body = ["    int x = 0;", "    float y = 1.5;"]
+        for i in range(statements):
+            k = i % 97
+            if i % 4 == 0:
+                body.append(f"    x = x * 1 + (60 * 60 * 24) / ({k} + 1) - 0;")
+            elif i % 4 == 1:
+                body.append(f"    y = y * 1.0 + 2.5 * (3 - {k}) / 4.0;")
+            elif i % 4 == 2:
+                body.append(f"    if ({k} * 2 > 100 && true) {{ x = x + {k}; }}")
+            else:
+                body.append(f"    x = x + -(-{k}) % 7;")
+        body.append("    return x;")
+        parts.append(f"int f{f}() {{\n" + "\n".join(body) + "\n}\n")
+    return "\n".join(parts)
+
+
+def later_passes(source, ast):
+    SemanticAnalyzer().analyze(ast)
+    SemanticLineAnalyzer().analyze_lines(source, ast)
+
+
+def main():
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    sizes = [int(sys.argv[2])] if len(sys.argv) > 2 else [5, 20, 80]
+    parser = CPPParser(quiet=True)
+    rows = []
+    for functions in sizes:
+        source = constant_heavy_program(statements, functions)
+        plain = parser.parse_stream(source)
+        folded = ConstantFolder().fold(parser.parse_stream(source))
+        # Cada repetición pliega un AST recién parseado (la pasada lo modifica)
+        copies = [parser.parse_stream(source) for _ in range(3)]
+        folder = ConstantFolder()
+        t_fold = best_of(lambda: folder.fold(copies.pop()), 3)
+        stats = folder.stats
+        assert SemanticAnalyzer().analyze(plain) == SemanticAnalyzer().analyze(folded)
+        t_plain = best_of(lambda: later_passes(source, plain), 3)
+        t_folded = best_of(lambda: later_passes(source, folded), 3)
+        rows.append([functions * statements, stats['nodes_before'], stats['nodes_after'],
+                     f"{1 - stats['nodes_after'] / stats['nodes_before']:.0%}",
+                     stats['constant_conditions'], f"{t_fold * 1e3:.1f}",
+                     f"{t_plain * 1e3:.1f}", f"{t_folded * 1e3:.1f}"])
+    # Pasadas posteriores = análisis semántico + tabla por líneas sobre el AST
+    print_table(['Sentencias', 'Nodos antes', 'Nodos después', 'Reducción', 'Cond. constantes',
+                 'Plegado (ms)', 'Posteriores sin plegar (ms)', 'Posteriores plegado (ms)'], rows)
+
+
+if __name__ == '__main__':
+    main()
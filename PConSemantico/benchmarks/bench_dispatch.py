@@ -0,0 +1,42 @@
+# benchmarks/bench_dispatch.py
+# Coste por nodo del despacho: getattr + f-string frente a DispatchTable.
+#
+#   python benchmarks/bench_dispatch.py [nodos]
+
+import sys
+
+from _common import best_of, print_table
+from ast_visitor import DispatchTable
+from parser_cpp import ASTNode
+from semantic_analyzer import SemanticAnalyzer
+
+TYPES = ['ID', 'NUMBER', 'BINOP', 'ASSIGN', 'FLOAT_NUM', 'UNARY', 'CALL', 'EMPTY']
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    nodes = [ASTNode(TYPES[i % len(TYPES)]) for i in range(n)]
+    analyzer = SemanticAnalyzer()
+    table = DispatchTable(analyzer, 'visit_', analyzer.generic_visit)
+
+    def by_getattr():
+        for node in nodes:
+            getattr(analyzer, f"visit_{node.type.lower()}", analyzer.generic_visit)
+
+    def by_table():
+        for node in nodes:
+            table[node.type]
+
+    old = best_of(by_getattr)
+    new = best_of(by_table)
+    print_table(
+        ['Despacho', 'ns/nodo', 'Aceleración'],
+        [
+            ['getattr + f-string', f"{old / n * 1e9:.1f}", '1.00x'],
+            ['DispatchTable', f"{new / n * 1e9:.1f}", f"{old / new:.2f}x"],
+        ],
+    )
+
+
+if __name__ == '__main__':
+    main()
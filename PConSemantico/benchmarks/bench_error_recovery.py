@@ -0,0 +1,72 @@
+# benchmarks/bench_error_recovery.py
+# Recuperación de errores sintácticos: cada caso tiene un error en la condición
+# de un if/while/for y otro más adelante en la misma función. Se comprueba que
+# se notifican los dos, que la función sigue siendo un único FUN_DEF (la '{' del
+# cuerpo no se descarta) y que su cuerpo pasa por el análisis semántico; si no,
+# termina con código 1. Después mide el análisis de un archivo con muchas
+# funciones erróneas frente al mismo archivo corregido.
+#
+#   python benchmarks/bench_error_recovery.py [funciones] [repeticiones]
+
+import sys
+
+from _common import best_of, print_table
+from parser_cpp import CPPParser
+from semantic_analyzer import SemanticAnalyzer
+
+# (código, variable no declarada que debe encontrar el análisis semántico)
+CASES = [
+    ("int f() { int x; if (x > ) { x = 1; } while (1) { y = ; } return 0; }", None),
+    ("int f() { int x; if (x == ) { x = 1; } else { w = 2; } x = ; return 0; }", 'w'),
+    ("int f() { int x; while (x + ) { u = 1; } x = ; return 0; }", 'u'),
+    ("int f() { int x; for (x = 0; x < ; x = x + 1) { v = 2; } x = * 2; return 0; }", 'v'),
+]
+CORRECT = "int f() { int x; if (x > 0) { x = 1; } while (x < 3) { x = x + 1; } return 0; }"
+
+
+def check(parser, analyzer):
+    """Mensajes de los casos que no se recuperan como se espera"""
+    failures = []
+    for source, undeclared in CASES:
+        ast = parser.parse(source)
+        kinds = [node.type for node in ast.children]
+        _, errors = analyzer.analyze(ast)
+        if len(parser.errors) != 2:
+            failures.append(f"{source}\n    errores sintácticos: {parser.errors}")
+        elif kinds != ['FUN_DEF']:
+            failures.append(f"{source}\n    nodos de alto nivel: {kinds}")
+        elif undeclared and f"Variable '{undeclared}' no declarada" not in errors:
+            failures.append(f"{source}\n    errores semánticos: {errors}")
+    return failures
+
+
+def main():
+    functions = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    parser = CPPParser(quiet=True)
+    analyzer = SemanticAnalyzer()
+
+    failures = check(parser, analyzer)
+    for failure in failures:
+        print(f"✗ {failure}")
+    if failures:
+        return 1
+
+    def program(template):
+        return "\n".join(template.replace("int f()", f"int f{i}()") for i in range(functions))
+
+    broken = "\n".join(program(source) for source, _ in CASES)
+    fixed = "\n".join(program(CORRECT) for _ in CASES)
+    parser.parse(broken)
+    reported = len(parser.errors)
+    broken_t = best_of(lambda: parser.parse(broken), repeat)
+    fixed_t = best_of(lambda: parser.parse(fixed), repeat)
+    print_table(['Entrada', 'Tiempo (ms)', 'Errores'], [
+        ['sin errores', f"{fixed_t * 1e3:.1f}", 0],
+        ['con errores', f"{broken_t * 1e3:.1f}", reported],
+    ])
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,112 @@
+# benchmarks/bench_incremental.py
+# Latencia edición -> diagnósticos en un archivo de ~20k líneas: análisis
+# completo (lexer + parser + semántico) frente a IncrementalAnalyzer.edit.
+# Antes comprueba, con ediciones aleatorias (comentarios y comillas que se
+# abren y cierran entre segmentos incluidos), que el resultado coincide con el
+# de un IncrementalAnalyzer nuevo sobre el mismo texto; si no, termina con
+# código 1.
+#
+#   python benchmarks/bench_incremental.py [funciones] [sentencias_por_función]
+
+import random
+import sys
+import time
+
+from _common import best_of, print_table, straight_line_program
+from analysis import ast_to_dict
+from incremental import IncrementalAnalyzer
+from parser_cpp import CPPParser
+from program_generator import generate_program
+from semantic_analyzer import SemanticAnalyzer
+
+# Fragmentos que se insertan en las ediciones aleatorias
+SNIPPETS = ['/*', '*/', '"', "'", '//', ';', '{', '}', '(', ')', '\n', ' ', 'x',
+            'int q = 1;', 'return 0;', 'int h() { return z; }\n']
+
+
+def snapshot(inc):
+    return inc.diagnostics(), ast_to_dict(inc.ast)
+
+
+def differential(parser, analyzer, programs=60, edits=15):
+    """Ediciones aleatorias; devuelve la primera que da un resultado distinto del
+    análisis completo, o None"""
+    repro = ("int a;\nint f() { return b; }\nint g() { return c; }\n",
+             [(7, 7, '/*'), (30, 30, '*/')])
+    cases = [repro]
+    for seed in range(programs):
+        rnd = random.Random(seed)
+        text = generate_program(seed, functions=4, statements=3, depth=1)
+        steps = []
+        length = len(text)
+        for _ in range(edits):
+            start = rnd.randrange(length + 1)
+            end = min(length, start + rnd.choice([0, 0, 1, 2, 5]))
+            new = rnd.choice(SNIPPETS) if rnd.random() < 0.8 else ''
+            steps.append((start, end, new))
+            length += len(new) - (end - start)
+        cases.append((text, steps))
+
+    for text, steps in cases:
+        inc = IncrementalAnalyzer(text, parser=parser, analyzer=analyzer)
+        for start, end, new in steps:
+            try:
+                inc.edit(start, end, new)
+                expected = snapshot(IncrementalAnalyzer(inc.text, parser=parser, analyzer=analyzer))
+            except ValueError:  # p. ej. '07': t_NUMBER no admite octales
+                break
+            if snapshot(inc) != expected:
+                return inc.text, (start, end, new)
+    return None
+
+
+def main():
+    functions = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    statements = int(sys.argv[2]) if len(sys.argv) > 2 else 36
+    source = straight_line_program(statements, functions)
+    print(f"{source.count(chr(10))} líneas, {functions} funciones")
+
+    parser = CPPParser(quiet=True)
+    analyzer = SemanticAnalyzer()
+
+    mismatch = differential(parser, analyzer)
+    if mismatch is not None:
+        text, edit = mismatch
+        print(f"Resultado distinto del análisis completo tras la edición {edit!r}:\n{text}")
+        return 1
+
+    def full():
+        ast = parser.parse(source)
+        analyzer.analyze(ast)
+
+    full_t = best_of(full, 3)
+    t0 = time.perf_counter()
+    inc = IncrementalAnalyzer(source, parser=parser, analyzer=analyzer)
+    open_t = time.perf_counter() - t0
+
+    # Ediciones en la función central: las que no tocan firmas solo revisan ese segmento
+    mid = source.index(f"int f{functions // 2}()")
+    body = source.index("x = x + y", mid)
+    edits = [
+        ('cambiar un operando', body + len("x = x + "), 1, 'x'),
+        ('insertar una línea', body, 0, 'y = y + 1;\n    '),
+        ('renombrar la función', mid + len("int "), len(f"f{functions // 2}"), 'g0'),
+    ]
+    rows = [['análisis completo', f"{full_t * 1e3:.2f}", '1.00x', '-'],
+            ['apertura incremental', f"{open_t * 1e3:.2f}", f"{full_t / open_t:.2f}x", len(inc.segments)]]
+    for label, start, length, text in edits:
+        def apply_and_undo():
+            original = inc.text[start:start + length]
+            inc.edit(start, start + length, text)
+            inc.edit(start, start + len(text), original)
+        before = inc.stats['rechecked']
+        t = best_of(apply_and_undo, 5) / 2
+        rechecked = (inc.stats['rechecked'] - before) // 10
+        rows.append([label, f"{t * 1e3:.2f}", f"{full_t / t:.2f}x", rechecked])
+
+    print_table(['Operación', 'Tiempo (ms)', 'Aceleración', 'Segmentos revisados'], rows)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,79 @@
+# benchmarks/bench_lexer_backend.py
+# Tokens por segundo del lexer de PLY (CPPLexer) frente a fast_lexer: con
+# LexToken (misma interfaz) y con tuplas. También el análisis sintáctico
+# completo con cada backend y, si está el árbol v1/, sus dos lexers.
+#
+#   python benchmarks/bench_lexer_backend.py [bytes] [repeticiones]
+
+import os
+import sys
+
+from _common import ROOT, best_of, print_table
+from fast_lexer import FastCPPLexer
+from lexer_cpp import CPPLexer
+from parser_cpp import CPPParser
+from program_generator import generate_program
+
+V1_ROOT = os.path.join(os.path.dirname(ROOT), 'v1')
+
+
+def _rows(label, tokens, cases):
+    base = None
+    rows = []
+    for name, fn, repeat in cases:
+        t = best_of(fn, repeat)
+        base = base or t
+        rows.append([label, name, f"{t * 1e3:.1f}", f"{tokens / t:,.0f}", f"{base / t:.2f}x"])
+    return rows
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 300_000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    source = generate_program(7, target_bytes=size)
+
+    ply_lexer = CPPLexer(quiet=True)
+    fast = FastCPPLexer(quiet=True)
+    expected = [(t.type, t.value, t.lineno, t.lexpos) for t in ply_lexer.tokenize(source)]
+    assert fast.tokenize_tuples(source) == expected
+    tokens = len(expected)
+
+    parser = CPPParser(quiet=True)
+    rows = _rows('PConSemantico', tokens, [
+        ('PLY (LexToken)', lambda: ply_lexer.tokenize(source), repeat),
+        ('fast_lexer (LexToken)', lambda: fast.tokenize(source), repeat),
+        ('fast_lexer (tuplas)', lambda: fast.tokenize_tuples(source), repeat),
+    ])
+    rows += _rows('parser', tokens, [
+        ('PLY', lambda: parser.parse(source), max(1, repeat // 2)),
+        ('fast_lexer', lambda: parser.parse_tokens(fast.iter_tokens(source)), max(1, repeat // 2)),
+    ])
+
+    if os.path.isdir(V1_ROOT):
+        sys.path.insert(0, V1_ROOT)
+        from src.fast_lexer import FastCPPLexer as V1FastLexer
+        from src.lexer_cpp import CPPLexer as V1Lexer
+
+        with open(os.path.join(V1_ROOT, 'archivo_cpp.txt'), encoding='utf-8') as f:
+            v1_source = f.read() * max(1, size // 1000)
+        v1_ply, v1_fast = V1Lexer(), V1FastLexer()
+        v1_tokens = len(v1_ply.tokenize(v1_source))
+        rows += _rows('v1', v1_tokens, [
+            ('PLY (LexToken)', lambda: v1_ply.tokenize(v1_source), repeat),
+            ('fast_lexer (LexToken)', lambda: v1_fast.tokenize(v1_source), repeat),
+            ('fast_lexer (tuplas)', lambda: v1_fast.tokenize_tuples(v1_source), repeat),
+        ])
+
+    print(f"{tokens} tokens, {len(source)} bytes\n")
+    print_table(['Árbol', 'Backend', 'Tiempo (ms)', 'Tokens/s', 'Aceleración'], rows)
+    print()
+    build_ply = best_of(lambda: [CPPLexer(quiet=True) for _ in range(100)], repeat) / 100
+    build_fast = best_of(lambda: [FastCPPLexer(quiet=True) for _ in range(100)], repeat) / 100
+    print_table(['Construcción', 'Tiempo (µs)'], [
+        ['CPPLexer (clon del lexer de PLY)', f"{build_ply * 1e6:.1f}"],
+        ['FastCPPLexer (reglas ya compiladas)', f"{build_fast * 1e6:.1f}"],
+    ])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,35 @@
+# benchmarks/bench_line_index.py
+# Clasificación por líneas: búsqueda por palabra clave frente a índice por node.line.
+#
+#   python benchmarks/bench_line_index.py [líneas_max]
+# La búsqueda por palabra clave es O(líneas x nodos); solo se mide hasta 5000 líneas.
+
+import sys
+
+from _common import best_of, print_table, straight_line_program
+from parser_cpp import CPPParser
+from semantic_line_analyzer import SemanticLineAnalyzer
+
+KEYWORD_LIMIT = 5_000
+
+
+def main():
+    limit = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    rows = []
+    n = 500
+    while n <= limit:
+        code = straight_line_program(n)
+        ast = CPPParser().parse(code)
+        indexed = best_of(lambda: SemanticLineAnalyzer().analyze_lines(code, ast), repeat=3)
+        if n <= KEYWORD_LIMIT:
+            keyword = best_of(lambda: SemanticLineAnalyzer(use_line_index=False).analyze_lines(code, ast), repeat=1)
+            row = [n, f"{keyword * 1e3:.1f}", f"{indexed * 1e3:.1f}", f"{keyword / indexed:.0f}x"]
+        else:
+            row = [n, '-', f"{indexed * 1e3:.1f}", '-']
+        rows.append(row)
+        n *= 10
+    print_table(['Líneas', 'Palabra clave (ms)', 'Indexado (ms)', 'Aceleración'], rows)
+
+
+if __name__ == '__main__':
+    main()
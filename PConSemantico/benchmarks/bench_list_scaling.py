@@ -0,0 +1,27 @@
+# benchmarks/bench_list_scaling.py
+# Escalado del parser con el número de sentencias en un mismo bloque.
+# Con listas construidas in situ el tiempo por sentencia debe mantenerse constante.
+#
+#   python benchmarks/bench_list_scaling.py [max_sentencias]
+
+import sys
+
+from _common import best_of, print_table, straight_line_program
+from parser_cpp import CPPParser
+
+
+def main():
+    limit = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    parser = CPPParser()
+    rows = []
+    n = 10
+    while n <= limit:
+        code = straight_line_program(n)
+        t = best_of(lambda: parser.parse(code), repeat=3 if n < 10_000 else 1)
+        rows.append([n, f"{t * 1e3:.2f}", f"{t / n * 1e6:.2f}"])
+        n *= 10
+    print_table(['Sentencias', 'Parse (ms)', 'us/sentencia'], rows)
+
+
+if __name__ == '__main__':
+    main()
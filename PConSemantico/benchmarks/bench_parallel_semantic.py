@@ -0,0 +1,37 @@
+# benchmarks/bench_parallel_semantic.py
+# Análisis semántico en serie frente a ParallelSemanticAnalyzer (cuerpos de
+# función en un pool de procesos). Comprueba además que los errores coinciden.
+#
+#   python benchmarks/bench_parallel_semantic.py [funciones] [sentencias_por_función]
+
+import os
+import sys
+
+from _common import best_of, print_table, straight_line_program
+from parallel_semantic import ParallelSemanticAnalyzer
+from parser_cpp import CPPParser
+from semantic_analyzer import SemanticAnalyzer
+
+
+def main():
+    functions = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    statements = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    # Una variable sin declarar por función para que haya errores que unir
+    source = straight_line_program(statements, functions).replace("return x;", "return z;")
+    ast = CPPParser(quiet=True).parse(source)
+    print(f"{functions} funciones x {statements} sentencias, {os.cpu_count()} núcleos")
+
+    serial = SemanticAnalyzer()
+    expected = list(serial.analyze(ast)[1])
+    serial_t = best_of(lambda: serial.analyze(ast), 3)
+    rows = [['serie', f"{serial_t * 1e3:.1f}", '1.00x', 'sí']]
+    for workers in (2, 4, 8):
+        with ParallelSemanticAnalyzer(workers=workers) as par:
+            same = par.analyze(ast)[1] == expected  # también arranca el pool
+            t = best_of(lambda: par.analyze(ast), 3)
+        rows.append([f"{workers} procesos", f"{t * 1e3:.1f}", f"{serial_t / t:.2f}x", 'sí' if same else 'NO'])
+    print_table(['Modo', 'Tiempo (ms)', 'Aceleración', 'Mismos errores'], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+# benchmarks/bench_parser_reuse.py
+# Análisis de muchos archivos pequeños: un CPPParser nuevo por archivo frente a
+# la misma instancia reiniciada (parser_pool.thread_parser). También mide la
+# construcción de CPPLexer con lex.lex frente al clon del lexer ya compilado.
+#
+#   python benchmarks/bench_parser_reuse.py [archivos] [repeticiones]
+
+import sys
+
+import ply.lex as lex
+
+from _common import best_of, print_table
+from lexer_cpp import CPPLexer
+from parser_cpp import CPPParser
+from parser_pool import thread_parser
+from program_generator import generate_program
+
+
+def main():
+    files = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    sources = [generate_program(seed, functions=2, statements=4, depth=1) for seed in range(files)]
+
+    def fresh():
+        for source in sources:
+            CPPParser(quiet=True).parse(source)
+
+    def reused():
+        for source in sources:
+            thread_parser().parse(source)
+
+    # Los números de línea no dependen de los archivos analizados antes
+    parser = thread_parser()
+    parser.parse(sources[0])
+    first = parser.parse(sources[1]).children[0].line
+    assert first == CPPParser(quiet=True).parse(sources[1]).children[0].line
+
+    fresh_t = best_of(fresh, repeat)
+    reused_t = best_of(reused, repeat)
+    lex_t = best_of(lambda: [lex.lex(module=CPPLexer(quiet=True)) for _ in range(100)], repeat) / 100
+    clone_t = best_of(lambda: [CPPLexer(quiet=True) for _ in range(100)], repeat) / 100
+
+    print_table(
+        ['Modo', 'Tiempo (ms)', 'Por archivo (µs)', 'Aceleración'],
+        [
+            ['parser nuevo por archivo', f"{fresh_t * 1e3:.1f}", f"{fresh_t / files * 1e6:.0f}", '1.00x'],
+            ['parser reutilizado', f"{reused_t * 1e3:.1f}", f"{reused_t / files * 1e6:.0f}",
+             f"{fresh_t / reused_t:.2f}x"],
+        ],
+    )
+    print()
+    print_table(
+        ['Construcción de CPPLexer', 'Tiempo (µs)', 'Aceleración'],
+        [
+            ['lex.lex', f"{lex_t * 1e6:.0f}", '1.00x'],
+            ['clon del prototipo', f"{clone_t * 1e6:.0f}", f"{lex_t / clone_t:.2f}x"],
+        ],
+    )
+
+
+if __name__ == '__main__':
+    main()
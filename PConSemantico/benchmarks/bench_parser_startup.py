@@ -0,0 +1,47 @@
+# benchmarks/bench_parser_startup.py
+# Tiempo de construcción de CPPParser: sin caché, caché fría y caché caliente.
+#
+#   python benchmarks/bench_parser_startup.py [repeticiones]
+
+import shutil
+import sys
+import tempfile
+import time
+
+from _common import best_of, print_table
+from parser_cpp import CPPParser
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    def cold():
+        tmp = tempfile.mkdtemp(prefix='ply_cold_')
+        try:
+            t0 = time.perf_counter()
+            CPPParser(cache_dir=tmp)
+            return time.perf_counter() - t0
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    warm_dir = tempfile.mkdtemp(prefix='ply_warm_')
+    try:
+        CPPParser(cache_dir=warm_dir)  # llena la caché
+        no_cache = best_of(lambda: CPPParser(table_cache=False), repeat)
+        cold_t = min(cold() for _ in range(repeat))
+        warm_t = best_of(lambda: CPPParser(cache_dir=warm_dir), repeat)
+    finally:
+        shutil.rmtree(warm_dir, ignore_errors=True)
+
+    print_table(
+        ['Modo', 'Tiempo (ms)', 'Aceleración'],
+        [
+            ['sin caché', f"{no_cache * 1e3:.2f}", '1.00x'],
+            ['caché fría', f"{cold_t * 1e3:.2f}", f"{no_cache / cold_t:.2f}x"],
+            ['caché caliente', f"{warm_t * 1e3:.2f}", f"{no_cache / warm_t:.2f}x"],
+        ],
+    )
+
+
+if __name__ == '__main__':
+    main()
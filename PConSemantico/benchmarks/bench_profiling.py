@@ -0,0 +1,74 @@
+# benchmarks/bench_profiling.py
+# Coste de la instrumentación por fases en analysis.analyze_source: sin
+# perfilador (NULL_PROFILER), con Profiler sin memoria y con tracemalloc.
+# Antes comprueba que track_visits cuenta todos los nodos de una cadena más
+# profunda que el límite de recursión; si no, termina con código 1.
+#
+#   python benchmarks/bench_profiling.py [sentencias_por_función] [funciones]
+
+import sys
+
+from _common import best_of, print_table, straight_line_program
+from analysis import analyze_source
+from parser_cpp import CPPParser
+from profiling import Profiler, format_report
+from semantic_analyzer import SemanticAnalyzer
+
+
+def deep_visits(parser, terms):
+    """Visitas contadas al analizar `s = a + a + ... ;` con `terms` términos"""
+    expr = " + ".join(["a"] * terms)
+    ast = parser.parse(f"int main() {{ int a = 1; int s; s = {expr}; return s; }}")
+    analyzer = SemanticAnalyzer()
+    with Profiler(memory=False).phase('semantico') as phase:
+        phase.track_visits(analyzer)
+        analyzer.analyze(ast)
+    return phase.visits
+
+
+def main():
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    functions = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    source = straight_line_program(statements, functions)
+    parser = CPPParser(quiet=True)
+    analyzer = SemanticAnalyzer()
+
+    terms = 3 * sys.getrecursionlimit()
+    visits = deep_visits(parser, terms)
+    # La expresión más el `return s`
+    if visits['BINOP'] != terms - 1 or visits['ID'] != terms + 1:
+        print(f"✗ Cadena de {terms} términos: BINOP={visits['BINOP']} (esperado {terms - 1}), "
+              f"ID={visits['ID']} (esperado {terms + 1})")
+        return 1
+
+    def run(profiler_factory):
+        def once():
+            profiler = profiler_factory()
+            analyze_source(source, parser=parser, analyzer=analyzer, profiler=profiler)
+            if profiler is not None:
+                profiler.close()
+        return once
+
+    modes = [
+        ('desactivado', lambda: None),
+        ('tiempos y visitas', lambda: Profiler(memory=False)),
+        ('con tracemalloc', lambda: Profiler(memory=True)),
+    ]
+    rows = []
+    base = None
+    for name, factory in modes:
+        t = best_of(run(factory), 3)
+        base = base or t
+        rows.append([name, f"{t * 1e3:.1f}", f"{t / base:.2f}x"])
+    print_table(['Perfilado', 'Tiempo (ms)', 'Relativo'], rows)
+
+    profiler = Profiler()
+    analyze_source(source, parser=parser, analyzer=analyzer, profiler=profiler)
+    profiler.close()
+    print()
+    print("\n".join(format_report(profiler.report())))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
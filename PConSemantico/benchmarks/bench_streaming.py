@@ -0,0 +1,104 @@
+# benchmarks/bench_streaming.py
+# Lectura por bloques (CPPLexer.iter_tokens y FastCPPLexer.iter_tuples) frente
+# a tokenizar la entrada completa. Incluye una entrada con una comilla sin
+# cerrar al principio, cuyos tokens posteriores deben salir antes del final del
+# archivo, tras leer como mucho STREAM_MAX_PENDING bloques de más, y otra con
+# un comentario válido más largo que ese límite, que debe dar los mismos tokens
+# que la entrada completa y ningún error. Si falla alguna, termina con código 1.
+#
+#   python benchmarks/bench_streaming.py [bytes] [repeticiones]
+
+import io
+import sys
+
+from _common import best_of, print_table, straight_line_program
+from fast_lexer import FastCPPLexer
+from lexer_cpp import STREAM_MAX_PENDING, CPPLexer
+from program_generator import generate_program
+
+CHUNK_SIZE = 1 << 12
+
+
+class CountingReader(io.StringIO):
+    """StringIO que anota cuántos caracteres se han leído"""
+
+    def read(self, size=-1):
+        data = super().read(size)
+        self.consumed = getattr(self, 'consumed', 0) + len(data)
+        return data
+
+
+def stream(lexer, source):
+    if isinstance(lexer, FastCPPLexer):
+        return list(lexer.iter_tuples(io.StringIO(source), CHUNK_SIZE))
+    return [(t.type, t.value, t.lineno, t.lexpos)
+            for t in lexer.iter_tokens(io.StringIO(source), CHUNK_SIZE)]
+
+
+def read_before_first_token(lexer, source, after):
+    """Caracteres leídos cuando sale el primer token posterior a `after`"""
+    reader = CountingReader(source)
+    tokens = (lexer.iter_tuples(reader, CHUNK_SIZE) if isinstance(lexer, FastCPPLexer)
+              else ((t.type, t.value, t.lineno, t.lexpos) for t in lexer.iter_tokens(reader, CHUNK_SIZE)))
+    for tok in tokens:
+        if tok[3] > after:
+            return reader.consumed
+    return reader.consumed
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 300_000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    source = generate_program(11, target_bytes=size)
+    # Sin más comillas detrás: la primera no se cierra nunca
+    broken = 'char *s = "sin cerrar;\n' + straight_line_program(size // 20)
+
+    ply_lexer = CPPLexer(quiet=True)
+    fast = FastCPPLexer(quiet=True)
+    whole = [(t.type, t.value, t.lineno, t.lexpos) for t in ply_lexer.tokenize(source)]
+    assert stream(ply_lexer, source) == whole
+    assert stream(fast, source) == whole
+
+    rows = [
+        ['CPPLexer.tokenize (entrada completa)', f"{best_of(lambda: ply_lexer.tokenize(source), repeat) * 1e3:.1f}"],
+        ['CPPLexer.iter_tokens', f"{best_of(lambda: stream(ply_lexer, source), repeat) * 1e3:.1f}"],
+        ['FastCPPLexer.iter_tuples', f"{best_of(lambda: stream(fast, source), repeat) * 1e3:.1f}"],
+    ]
+    print(f"{len(whole)} tokens, {len(source)} bytes, bloques de {CHUNK_SIZE}\n")
+    print_table(['Lexer', 'Tiempo (ms)'], rows)
+
+    # Comilla sin cerrar: sin límite, todo el archivo se acumulaba en memoria
+    limit = (STREAM_MAX_PENDING + 2) * CHUNK_SIZE
+    quote = broken.index('"')
+    assert stream(ply_lexer, broken) == stream(fast, broken)
+    rows = []
+    ok = True
+    for name, lexer in [('CPPLexer', ply_lexer), ('FastCPPLexer', fast)]:
+        consumed = read_before_first_token(lexer, broken, quote)
+        ok = ok and consumed <= limit and lexer.errors
+        rows.append([name, consumed, len(lexer.errors)])
+    print()
+    print_table(['Comilla sin cerrar', 'Leído antes del siguiente token', 'Errores'], rows)
+    if not ok:
+        print(f"\nLos tokens tras la comilla no salen antes de leer {limit} caracteres")
+        return 1
+
+    # Comentario válido más largo que el límite: se descarta según llega, sin
+    # cortarlo, y los números de línea posteriores no cambian
+    long_comment = 'int a;\n/*' + 'x\n' * limit + '*/ int b;\n' + source
+    expected = [(t.type, t.value, t.lineno, t.lexpos) for t in ply_lexer.tokenize(long_comment)]
+    rows = []
+    for name, lexer in [('CPPLexer', ply_lexer), ('FastCPPLexer', fast)]:
+        tokens = stream(lexer, long_comment)
+        ok = ok and tokens == expected and not lexer.errors
+        rows.append([name, len(tokens), len(expected), len(lexer.errors)])
+    print()
+    print_table(['Comentario largo', 'Tokens', 'Entrada completa', 'Errores'], rows)
+    if not ok:
+        print("\nEl comentario largo no da los mismos tokens que la entrada completa")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,160 @@
+# benchmarks/bench_suite.py
+# Suite reproducible de rendimiento: cada caso genera un programa con
+# program_generator (semilla fija), lo analiza con analysis.analyze_source y
+# un Profiler, y anota por fase tokens/s, nodos/s y el crecimiento del pico de
+# memoria residente. Los resultados se comparan con baselines.json y se marca
+# como regresión una fase cuyo rendimiento cae (o cuya memoria crece) más que
+# el umbral. Las líneas base dependen de la máquina: se regeneran con
+# --save-baseline.
+#
+#   python benchmarks/bench_suite.py [-c caso ...] [-r N] [--threshold 0.15]
+#                                    [--save-baseline] [--json resultados.json]
+
+import argparse
+import json
+import os
+import platform
+import sys
+
+from _common import print_table
+from analysis import analyze_source
+from parser_cpp import CPPParser
+from profiling import Profiler
+from program_generator import ProgramGenerator
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines.json')
+DEFAULT_THRESHOLD = 0.15
+# Por debajo de este crecimiento de memoria las diferencias son ruido del asignador
+RSS_NOISE = 1 << 20
+PHASES = ('lexico', 'sintactico', 'semantico', 'lineas')
+
+CASES = {
+    'pequeno': {'seed': 1, 'functions': 10, 'statements': 8, 'depth': 2, 'expression_length': 3},
+    'grande': {'seed': 2, 'target_bytes': 400_000},
+    'profundo': {'seed': 3, 'functions': 10, 'statements': 4, 'depth': 8, 'expression_length': 2},
+    'expresiones_largas': {'seed': 4, 'functions': 20, 'statements': 6, 'depth': 2, 'expression_length': 24},
+    'muchas_funciones': {'seed': 5, 'functions': 400, 'statements': 4, 'depth': 1, 'expression_length': 3},
+}
+
+
+def run_case(name, repeat, parser):
+    """Métricas de un caso: mejor tiempo de cada fase en `repeat` ejecuciones"""
+    options = dict(CASES[name])
+    generator = ProgramGenerator(options.pop('seed'), **options)
+    source = generator.generate()
+    best = {}
+    tokens = nodes = 0
+    for _ in range(repeat):
+        profiler = Profiler(memory=False, rss=True)
+        result = analyze_source(source, parser=parser, profiler=profiler)
+        if not result.ok:
+            raise RuntimeError(f"El programa del caso '{name}' no es válido: "
+                               f"{(result.syntax_errors + result.semantic_errors)[:3]}")
+        tokens = result.statistics['tokens']
+        nodes = result.statistics['nodes']
+        for phase in profiler.report()['phases']:
+            growth = phase['rss_peak'] - phase['rss_start']
+            entry = best.setdefault(phase['name'], {'time': phase['wall'], 'rss_growth': growth})
+            entry['time'] = min(entry['time'], phase['wall'])
+            entry['rss_growth'] = max(entry['rss_growth'], growth)
+    phases = {}
+    for phase_name in PHASES:
+        entry = best[phase_name]
+        phases[phase_name] = {
+            'time': entry['time'],
+            'tokens_per_sec': tokens / entry['time'],
+            'nodes_per_sec': nodes / entry['time'],
+            'rss_growth': entry['rss_growth'],
+        }
+    return {'bytes': len(source), 'tokens': tokens, 'nodes': nodes, 'phases': phases}
+
+
+def compare(results, baseline, threshold):
+    """Lista de regresiones [(caso, fase, descripción)] frente a la línea base"""
+    regressions = []
+    for case, data in results.items():
+        base_case = baseline.get('cases', {}).get(case)
+        if base_case is None:
+            continue
+        if base_case.get('tokens') != data['tokens']:
+            # el generador o el lexer cambiaron: las cifras ya no son comparables
+            regressions.append((case, '-', f"tokens {data['tokens']} != {base_case.get('tokens')} (regenerar la línea base)"))
+            continue
+        for phase, metrics in data['phases'].items():
+            base = base_case['phases'].get(phase)
+            if base is None:
+                continue
+            ratio = metrics['tokens_per_sec'] / base['tokens_per_sec']
+            if ratio < 1 - threshold:
+                regressions.append((case, phase, f"rendimiento {ratio - 1:+.0%}"))
+            growth, base_growth = metrics['rss_growth'], base['rss_growth']
+            if growth - base_growth > RSS_NOISE and growth > base_growth * (1 + threshold):
+                regressions.append((case, phase, f"memoria {base_growth >> 10} KB -> {growth >> 10} KB"))
+    return regressions
+
+
+def load_baseline(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Suite de rendimiento del analizador")
+    ap.add_argument('-c', '--case', action='append', choices=sorted(CASES), help="casos a ejecutar (por defecto todos)")
+    ap.add_argument('-r', '--repeat', type=int, default=3, help="ejecuciones por caso (se toma la mejor)")
+    ap.add_argument('--threshold', type=float, default=None,
+                    help=f"caída relativa tolerada (por defecto la de la línea base o {DEFAULT_THRESHOLD})")
+    ap.add_argument('--baseline', default=BASELINE_PATH, help="archivo de líneas base")
+    ap.add_argument('--save-baseline', action='store_true', help="guardar estos resultados como línea base")
+    ap.add_argument('--json', metavar='ARCHIVO', help="guardar los resultados en JSON")
+    args = ap.parse_args(argv)
+
+    parser = CPPParser(quiet=True)
+    results = {name: run_case(name, args.repeat, parser) for name in (args.case or CASES)}
+    baseline = load_baseline(args.baseline)
+    base_cases = (baseline or {}).get('cases', {})
+
+    rows = []
+    for case, data in results.items():
+        for phase, metrics in data['phases'].items():
+            base = base_cases.get(case, {}).get('phases', {}).get(phase)
+            delta = f"{metrics['tokens_per_sec'] / base['tokens_per_sec'] - 1:+.1%}" if base else '-'
+            rows.append([case, phase, data['tokens'], data['nodes'], f"{metrics['time'] * 1e3:.1f}",
+                         f"{metrics['tokens_per_sec']:,.0f}", f"{metrics['nodes_per_sec']:,.0f}",
+                         f"{metrics['rss_growth'] / 1024:,.0f}", delta])
+    print_table(['Caso', 'Fase', 'Tokens', 'Nodos', 'Tiempo (ms)', 'Tokens/s', 'Nodos/s',
+                 'Pico RSS (KB)', 'vs base'], rows)
+
+    report = {'python': platform.python_version(), 'machine': platform.machine(), 'cases': results}
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    if args.save_baseline:
+        merged = dict(baseline or {}, python=report['python'], machine=report['machine'])
+        merged['threshold'] = args.threshold if args.threshold is not None else merged.get('threshold', DEFAULT_THRESHOLD)
+        merged['cases'] = dict(base_cases, **results)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(merged, f, indent=2)
+            f.write('\n')
+        print(f"\nLínea base guardada en {args.baseline}")
+        return 0
+    if baseline is None:
+        print("\nSin línea base: ejecútese con --save-baseline para crearla")
+        return 0
+
+    threshold = args.threshold if args.threshold is not None else baseline.get('threshold', DEFAULT_THRESHOLD)
+    regressions = compare(results, baseline, threshold)
+    if regressions:
+        print(f"\n✗ Regresiones (umbral {threshold:.0%}):")
+        for case, phase, what in regressions:
+            print(f"  - {case} / {phase}: {what}")
+        return 1
+    print(f"\n✓ Sin regresiones (umbral {threshold:.0%})")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
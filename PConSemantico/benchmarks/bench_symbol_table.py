@@ -0,0 +1,79 @@
+# benchmarks/bench_symbol_table.py
+# SymbolTable plana (pila de enlaces + registro de deshacer) frente a la tabla
+# anterior encadenada (un dict por ámbito y lookup recorriendo los padres).
+#
+#   python benchmarks/bench_symbol_table.py [profundidad] [locales_por_ámbito]
+
+import sys
+
+from _common import best_of, print_table
+from semantic_analyzer import SymbolTable
+
+
+class ChainedSymbolTable:
+    """Disposición anterior: un objeto por ámbito enlazado con su padre"""
+    def __init__(self):
+        self.symbols = {}
+        self.parent = None
+
+    def define(self, name, symbol_type, value=None):
+        if name in self.symbols:
+            raise Exception(f"Identificador '{name}' ya está definido en este ámbito")
+        self.symbols[name] = {"type": symbol_type, "value": value}
+
+    def lookup(self, name):
+        if name in self.symbols:
+            return self.symbols[name]
+        return self.parent.lookup(name) if self.parent else None
+
+    def enter_scope(self):
+        child = ChainedSymbolTable()
+        child.parent = self
+        return child
+
+
+def chained_workload(depth, locals_per_scope, globals_, rounds):
+    table = ChainedSymbolTable()
+    for g in globals_:
+        table.define(g, 'int')
+    for _ in range(rounds):
+        current = table
+        for d in range(depth):
+            current = current.enter_scope()
+            for i in range(locals_per_scope):
+                current.define(f"v{i}", 'int')
+            for g in globals_:  # los globales se buscan desde el ámbito más interno
+                current.lookup(g)
+
+
+def flat_workload(depth, locals_per_scope, globals_, rounds):
+    table = SymbolTable()
+    for g in globals_:
+        table.define(g, 'int')
+    for _ in range(rounds):
+        for d in range(depth):
+            table.push_scope()
+            for i in range(locals_per_scope):
+                table.define(f"v{i}", 'int')
+            for g in globals_:
+                table.lookup(g)
+        for d in range(depth):
+            table.pop_scope()
+
+
+def main():
+    depths = [int(sys.argv[1])] if len(sys.argv) > 1 else [4, 16, 64]
+    locals_per_scope = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    globals_ = [f"g{i}" for i in range(32)]
+    rows = []
+    for depth in depths:
+        rounds = max(1, 2000 // depth)
+        old = best_of(lambda: chained_workload(depth, locals_per_scope, globals_, rounds), 3)
+        new = best_of(lambda: flat_workload(depth, locals_per_scope, globals_, rounds), 3)
+        ops = rounds * depth * (locals_per_scope + len(globals_) + 1)
+        rows.append([depth, f"{old / ops * 1e9:.0f}", f"{new / ops * 1e9:.0f}", f"{old / new:.2f}x"])
+    print_table(['Profundidad', 'Encadenada (ns/op)', 'Plana (ns/op)', 'Aceleración'], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+# benchmarks/bench_traversal.py
+# Recorridos iterativos: árboles profundos (cadenas a + a + ... ) y poco profundos.
+# SemanticAnalyzer tiene un único recorrido (ast_visitor.evaluate); aquí se
+# comprueba que analiza sin errores una cadena más profunda que el límite de
+# recursión (si no, termina con código 1) y se mide su coste por nodo sobre un
+# programa generado poco profundo.
+#
+#   python benchmarks/bench_traversal.py [términos]
+
+import io
+import sys
+from contextlib import redirect_stdout
+
+from _common import best_of, print_table, straight_line_program
+from ast_visitor import walk
+from main import print_ast
+from parser_cpp import CPPParser
+from program_generator import generate_program
+from semantic_analyzer import SemanticAnalyzer
+from semantic_line_analyzer import SemanticLineAnalyzer
+
+def chain_program(terms):
+    expr = " + ".join(["a"] * terms)
+    return f"int main() {{\n    int a = 1;\n    int s = 0;\n    s = {expr};\n    return s;\n}}\n"
+
+
+def consumers(code, ast):
+    sink = io.StringIO()
+
+    def printer():
+        sink.seek(0)
+        sink.truncate()
+        with redirect_stdout(sink):
+            print_ast(ast)
+
+    return [
+        ('SemanticAnalyzer', lambda: SemanticAnalyzer().analyze(ast)),
+        ('SemanticLineAnalyzer', lambda: SemanticLineAnalyzer().analyze_lines(code, ast)),
+        ('print_ast', printer),
+    ]
+
+
+def count_nodes(ast):
+    counter = {'n': 0}
+
+    def enter(node, state):
+        state['n'] += 1
+        return state
+
+    walk(ast, enter, state=counter)
+    return counter['n']
+
+
+def main():
+    terms = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    parser = CPPParser()
+    rows = []
+    for label, code in (
+        (f"profundo ({terms} términos)", chain_program(terms)),
+        ("poco profundo (2000 sentencias)", straight_line_program(2000)),
+    ):
+        ast = parser.parse(code)
+        for name, fn in consumers(code, ast):
+            rows.append([label, name, f"{best_of(fn, repeat=3) * 1e3:.2f}"])
+    print(f"Límite de recursión de Python: {sys.getrecursionlimit()}")
+    print_table(['Árbol', 'Consumidor', 'Tiempo (ms)'], rows)
+
+    # La cadena supera el límite de recursión: el análisis no debe cortarse
+    deep = max(terms, 2 * sys.getrecursionlimit())
+    analyzer = SemanticAnalyzer()
+    ok, errors = analyzer.analyze(parser.parse(chain_program(deep)))
+    if not ok or analyzer.aborted:
+        print(f"\n✗ Cadena de {deep} términos: {errors[:3]}")
+        return 1
+
+    # Programa generado poco profundo (60 funciones, anidamiento 2)
+    ast = parser.parse(generate_program(1, functions=60, depth=2))
+    nodes = count_nodes(ast)
+    elapsed = best_of(lambda: SemanticAnalyzer().analyze(ast), repeat=5)
+    print()
+    print_table(['SemanticAnalyzer (poco profundo)', 'Nodos', 'Tiempo (ms)', 'ns/nodo'], [
+        ['ast_visitor.evaluate', nodes, f"{elapsed * 1e3:.2f}", f"{elapsed / nodes * 1e9:.0f}"],
+    ])
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
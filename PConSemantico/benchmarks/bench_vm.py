@@ -0,0 +1,135 @@
+# benchmarks/bench_vm.py
+# Programas con bucles intensivos ejecutados en la VM de bytecode: tiempo de
+# compilación (parseo + análisis + bytecode), ejecución sin y con
+# superinstrucciones y, si hay g++ instalado, compilar y ejecutar con él (lo
+# que hacía el paso de CI que la VM sustituye). La salida de los programas de
+# EXPECTED (obtenida con g++) se comprueba siempre: si no coincide, termina con
+# código 1.
+#
+#   python benchmarks/bench_vm.py [programa ...]
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from _common import best_of, print_table
+from bytecode import BytecodeCompiler
+from parser_cpp import CPPParser
+from semantic_analyzer import SemanticAnalyzer
+from vm import VirtualMachine
+
+PROGRAMS = {
+    'nested_loops': """int main() {
+    int i; int j; int s = 0;
+    for (i = 0; i < 400; i = i + 1) {
+        for (j = 0; j < 400; j = j + 1) { s = s + i * j % 7; }
+    }
+    cout << s << "\\n";
+    return 0;
+}""",
+    'primes': """int isprime(int n) {
+    int d;
+    if (n < 2) return 0;
+    for (d = 2; d * d <= n; d = d + 1) { if (n % d == 0) return 0; }
+    return 1;
+}
+int main() {
+    int n; int c = 0;
+    for (n = 0; n < 30000; n = n + 1) { if (isprime(n)) c = c + 1; }
+    cout << c << "\\n";
+    return 0;
+}""",
+    'fib': """int fib(int n) { if (n < 2) return n; return fib(n - 1) + fib(n - 2); }
+int main() { cout << fib(22) << "\\n"; return 0; }""",
+    'leibniz': """int main() {
+    float pi = 0.0; float sign = 1.0; int k;
+    for (k = 0; k < 200000; k = k + 1) { pi = pi + sign / (2 * k + 1); sign = -sign; }
+    cout << pi * 4 << "\\n";
+    return 0;
+}""",
+    'collatz': """int steps(int n) {
+    int s = 0;
+    while (n != 1) { if (n % 2 == 0) n = n / 2; else n = 3 * n + 1; s = s + 1; }
+    return s;
+}
+int main() {
+    int n; int best = 0; int arg = 0; int s;
+    for (n = 1; n < 20000; n = n + 1) { s = steps(n); if (s > best) { best = s; arg = n; } }
+    cout << arg << " " << best << "\\n";
+    return 0;
+}""",
+    # int de 32 bits: fact(13) y los acumuladores se desbordan
+    'overflow': """int fact(int n) { if (n < 2) return 1; return n * fact(n - 1); }
+int main() {
+    int i; int h = 0; int k = 0;
+    for (i = 0; i < 200000; i = i + 1) { h = h * 31 + i; k = k - 1000000000; }
+    cout << fact(13) << " " << h << " " << k << " " << -h << "\\n";
+    return 0;
+}""",
+}
+# Salida de g++ -O0
+EXPECTED = {
+    'overflow': "1932053504 -1109637472 -552894464 1109637472\n",
+}
+
+
+def run_vm(program):
+    vm = VirtualMachine(program)
+    vm.run()
+    return ''.join(vm.output)
+
+
+def compile_source(parser, source, optimize=True):
+    ast = parser.parse_stream(source)
+    SemanticAnalyzer().analyze(ast)
+    return BytecodeCompiler(optimize).compile(ast)
+
+
+def run_gxx(source, workdir):
+    """(segundos de g++ + ejecución, salida) o None si no hay g++"""
+    if shutil.which('g++') is None:
+        return None
+    src = os.path.join(workdir, 'prog.cpp')
+    exe = os.path.join(workdir, 'prog')
+    with open(src, 'w') as f:
+        f.write('#include <iostream>\nusing namespace std;\n' + source)
+    t0 = time.perf_counter()
+    subprocess.run(['g++', '-O0', '-w', '-o', exe, src], check=True)
+    out = subprocess.run([exe], capture_output=True, text=True, check=True).stdout
+    return time.perf_counter() - t0, out
+
+
+def main():
+    names = sys.argv[1:] or list(PROGRAMS)
+    parser = CPPParser(quiet=True)
+    rows = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for name in names:
+            source = PROGRAMS[name]
+            t_compile = best_of(lambda: compile_source(parser, source), 3)
+            plain = compile_source(parser, source, optimize=False)
+            fused = compile_source(parser, source)
+            out = run_vm(fused)
+            assert run_vm(plain) == out
+            if name in EXPECTED and out != EXPECTED[name]:
+                print(f"✗ {name}: la VM escribe {out!r}, g++ {EXPECTED[name]!r}")
+                return 1
+            t_plain = best_of(lambda: run_vm(plain), 3)
+            t_fused = best_of(lambda: run_vm(fused), 3)
+            gxx = run_gxx(source, workdir)
+            if gxx is not None:
+                assert gxx[1] == out, (gxx[1], out)
+            rows.append([name, len(plain), len(fused), f"{t_compile * 1e3:.1f}", f"{t_plain:.3f}",
+                         f"{t_fused:.3f}", f"{t_plain / t_fused:.2f}x",
+                         f"{gxx[0]:.3f}" if gxx else '-'])
+    # Instrucciones = tamaño estático del bytecode; tiempos en segundos salvo la compilación
+    print_table(['Programa', 'Instr.', 'Instr. fusionadas', 'Compilar (ms)', 'VM (s)',
+                 'VM superinstr. (s)', 'Aceleración', 'g++ + ejecutar (s)'], rows)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,225 @@
+# benchmarks/program_generator.py
+# Generador reproducible de programas C++ para la gramática de parser_cpp.py.
+# Con la misma semilla y los mismos parámetros produce siempre el mismo texto.
+# Los programas son sintáctica y semánticamente válidos: declaraciones al
+# principio de cada bloque, variables declaradas antes de usarse, llamadas a
+# funciones ya definidas con el número de argumentos correcto y returns del
+# tipo de la función (cout usa " " en lugar de endl, que el analizador no conoce).
+#
+#   python benchmarks/program_generator.py [--seed N] [--functions N] ... > programa.cpp
+
+import argparse
+import random
+
+DEFAULTS = {
+    'functions': 20,          # funciones (además de main)
+    'statements': 12,         # sentencias por bloque (en el nivel superior)
+    'depth': 3,               # anidamiento máximo de if/while/for
+    'expression_length': 4,   # operadores binarios por expresión (aprox.)
+    'globals': 4,
+    'target_bytes': None,     # si se da, se añaden funciones hasta alcanzar el tamaño
+}
+
+_ARITHMETIC = ('+', '-', '*')
+_COMPARISONS = ('<', '>', '<=', '>=', '==', '!=')
+
+
+class ProgramGenerator:
+    """generate() devuelve el texto del programa; `stats` cuenta lo generado"""
+
+    def __init__(self, seed=0, **options):
+        unknown = set(options) - set(DEFAULTS)
+        if unknown:
+            raise ValueError(f"Opciones desconocidas: {', '.join(sorted(unknown))}")
+        self.seed = seed
+        self.options = dict(DEFAULTS, **options)
+        self.stats = {}
+
+    # ---------- API ----------
+    def generate(self):
+        rng = self.rng = random.Random(self.seed)
+        opts = self.options
+        self.stats = {'functions': 0, 'statements': 0, 'bytes': 0}
+        self.functions = []  # (nombre, tipo de retorno, [tipos de los parámetros])
+        self._counter = 0
+        parts = []
+        scope = []  # [(nombre, tipo)] visibles
+        for i in range(opts['globals']):
+            var_type = rng.choice(('int', 'float'))
+            name = f"g{i}"
+            parts.append(f"{var_type} {name} = {self._literal(var_type)};\n")
+            scope.append((name, var_type))
+        size = sum(map(len, parts))
+        target = opts['target_bytes']
+        while (self.stats['functions'] < opts['functions'] if target is None else size < target):
+            text = self._function(scope)
+            parts.append(text)
+            size += len(text)
+        parts.append(self._main(scope))
+        source = "\n".join(parts)
+        self.stats['bytes'] = len(source)
+        return source
+
+    # ---------- DECLARACIONES ----------
+    def _function(self, globals_):
+        rng = self.rng
+        index = len(self.functions)
+        name = f"f{index}"
+        ret_type = rng.choice(('int', 'int', 'float', 'void'))
+        params = [(f"p{i}", rng.choice(('int', 'float'))) for i in range(rng.randint(0, 3))]
+        # La propia función ya es visible en su cuerpo (recursión)
+        self.functions.append((name, ret_type, [t for _, t in params]))
+        body = self._block(list(globals_) + params, ret_type, 1, self.options['statements'], final_return=True)
+        self.stats['functions'] += 1
+        signature = ", ".join(f"{t} {n}" for n, t in params)
+        return f"{ret_type} {name}({signature}) {body}\n"
+
+    def _main(self, globals_):
+        body = self._block(list(globals_), 'int', 1, self.options['statements'], final_return=True)
+        return f"int main() {body}\n"
+
+    def _block(self, scope, ret_type, level, statements, final_return=False):
+        rng = self.rng
+        indent = "    " * level
+        lines = ["{"]
+        scope = list(scope)
+        for _ in range(rng.randint(1, 3)):
+            var_type = rng.choice(('int', 'int', 'float'))
+            name = self._fresh('v')
+            init = f" = {self._expression(scope, var_type)}" if rng.random() < 0.7 else ""
+            lines.append(f"{indent}{var_type} {name}{init};")
+            scope.append((name, var_type))
+        for _ in range(statements):
+            lines.append(indent + self._statement(scope, ret_type, level))
+            self.stats['statements'] += 1
+        if final_return:
+            lines.append(indent + self._return(scope, ret_type))
+        lines.append("    " * (level - 1) + "}")
+        return "\n".join(lines)
+
+    # ---------- SENTENCIAS ----------
+    def _statement(self, scope, ret_type, level):
+        rng = self.rng
+        nested = level <= self.options['depth']
+        inner = max(2, self.options['statements'] // (level + 1))
+        r = rng.random()
+        if nested and r < 0.12:
+            text = f"if ({self._condition(scope)}) {self._block(scope, ret_type, level + 1, inner)}"
+            if rng.random() < 0.5:
+                text += f" else {self._block(scope, ret_type, level + 1, inner)}"
+            return text
+        if nested and r < 0.2:
+            return f"while ({self._condition(scope)}) {self._block(scope, ret_type, level + 1, inner)}"
+        if nested and r < 0.28:
+            counters = [name for name, t in scope if t == 'int']
+            if counters:
+                i = rng.choice(counters)
+                return (f"for ({i} = 0; {i} < {rng.randint(1, 100)}; {i} = {i} + 1) "
+                        f"{self._block(scope, ret_type, level + 1, inner)}")
+        if r < 0.38:
+            items = " << \" \" << ".join(self._expression(scope, rng.choice(('int', 'float')))
+                                         for _ in range(rng.randint(1, 3)))
+            return f"cout << {items};"
+        if r < 0.42:
+            return f"cin >> {rng.choice(scope)[0]};"
+        if r < 0.5:
+            call = self._call(scope, statement=True)
+            if call:
+                return f"{call};"
+        if r < 0.53:
+            return self._return(scope, ret_type)
+        name, var_type = rng.choice(scope)
+        return f"{name} = {self._expression(scope, var_type)};"
+
+    def _return(self, scope, ret_type):
+        if ret_type == 'void':
+            return "return;"
+        return f"return {self._expression(scope, ret_type)};"
+
+    # ---------- EXPRESIONES ----------
+    def _expression(self, scope, expr_type, length=None):
+        """Expresión de tipo expr_type ('int' o 'float') con unos `length` operadores"""
+        rng = self.rng
+        if length is None:
+            length = max(0, self.options['expression_length'] + rng.randint(-1, 1))
+        if length == 0:
+            return self._operand(scope, expr_type)
+        left = rng.randint(0, length - 1)
+        op = rng.choice(_ARITHMETIC)
+        if expr_type == 'int' and rng.random() < 0.15:
+            op = rng.choice(('/', '%'))
+            # divisor acotado: (expr % 7 + 1)
+            right = f"({self._expression(scope, 'int', length - 1 - left)} % 7 + 1)"
+            return f"({self._expression(scope, 'int', left)} {op} {right})"
+        right = self._expression(scope, expr_type, length - 1 - left)
+        text = f"{self._expression(scope, expr_type, left)} {op} {right}"
+        return f"({text})" if rng.random() < 0.5 else text
+
+    def _operand(self, scope, expr_type):
+        rng = self.rng
+        r = rng.random()
+        if r < 0.1:
+            call = self._call(scope, expr_type=expr_type)
+            if call:
+                return call
+        if r < 0.6:
+            # int admite solo variables int; float acepta ambas (conversión implícita)
+            names = [name for name, t in scope if t == expr_type or expr_type == 'float']
+            if names:
+                return rng.choice(names)
+        if r < 0.65:
+            return f"(-{self._operand(scope, expr_type)})"
+        return self._literal(expr_type)
+
+    def _literal(self, expr_type):
+        rng = self.rng
+        if expr_type == 'float':
+            return f"{rng.randint(0, 99)}.{rng.randint(0, 99)}"
+        return str(rng.randint(0, 999))
+
+    def _condition(self, scope):
+        rng = self.rng
+        kind = rng.choice(('int', 'float'))
+        length = max(0, self.options['expression_length'] // 2)
+        text = (f"{self._expression(scope, kind, length)} {rng.choice(_COMPARISONS)} "
+                f"{self._expression(scope, kind, length)}")
+        if rng.random() < 0.3:
+            text = f"({text}) {rng.choice(('&&', '||'))} ({self._expression(scope, 'int', 0)} != 0)"
+        return text
+
+    def _call(self, scope, expr_type=None, statement=False):
+        """Llamada a una función ya definida (o a la actual): en una expresión
+        solo las que devuelven un tipo compatible"""
+        rng = self.rng
+        candidates = [f for f in self.functions
+                      if statement or (f[1] != 'void' and (f[1] == expr_type or expr_type == 'float'))]
+        if not candidates:
+            return None
+        name, _, params = rng.choice(candidates)
+        args = ", ".join(self._expression(scope, t, 0) for t in params)
+        return f"{name}({args})"
+
+    def _fresh(self, prefix):
+        self._counter += 1
+        return f"{prefix}{self._counter}"
+
+
+def generate_program(seed=0, **options):
+    return ProgramGenerator(seed, **options).generate()
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Genera un programa C++ sintético")
+    ap.add_argument('--seed', type=int, default=0)
+    ap.add_argument('--functions', type=int, default=DEFAULTS['functions'])
+    ap.add_argument('--statements', type=int, default=DEFAULTS['statements'])
+    ap.add_argument('--depth', type=int, default=DEFAULTS['depth'])
+    ap.add_argument('--expression-length', type=int, default=DEFAULTS['expression_length'])
+    ap.add_argument('--bytes', type=int, default=None, help="tamaño aproximado del archivo")
+    args = ap.parse_args(argv)
+    print(generate_program(args.seed, functions=args.functions, statements=args.statements, depth=args.depth,
+                           expression_length=args.expression_length, target_bytes=args.bytes))
+
+
+if __name__ == '__main__':
+    main()
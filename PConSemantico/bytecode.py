@@ -0,0 +1,541 @@
+# bytecode.py
+# Back end: traduce el AST ya comprobado por SemanticAnalyzer a bytecode de una
+# máquina de pila (la ejecuta vm.py).
+#
+# El código es un array('i') de pares (opcode, argumento): los saltos son
+# índices absolutos dentro del array y las constantes, variables y funciones
+# se referencian por índice. Al principio van las inicializaciones de las
+# variables globales seguidas de CALL main / HALT; después, el cuerpo de cada
+# función. Las variables locales ocupan huecos numerados de su marco (los
+# bloques hermanos reutilizan los huecos) y los tipos se resuelven al compilar:
+# '/' entero o real y las conversiones int <-> float se eligen aquí, no en la VM.
+# Los resultados enteros se reducen a 32 bits con signo (wrap_int), como int en
+# g++; la VM solo lo comprueba cuando el resultado se sale del rango.
+
+from array import array
+
+from ast_visitor import DispatchTable, evaluate
+from semantic_analyzer import SymbolTable
+
+# ---------- OPCODES ----------
+OPCODES = (
+    'CONST', 'LOAD_LOCAL', 'STORE_LOCAL', 'LOAD_GLOBAL', 'STORE_GLOBAL', 'DUP', 'POP',
+    'ADD', 'SUB', 'MUL', 'DIV_INT', 'DIV_FLOAT', 'MOD', 'NEG', 'NOT',
+    'LT', 'GT', 'LE', 'GE', 'EQ', 'NE',
+    'TO_INT', 'TO_FLOAT', 'TO_BOOL',
+    'JUMP', 'JUMP_IF_FALSE', 'JUMP_IF_TRUE',
+    'CALL', 'RETURN', 'PRINT', 'READ', 'HALT',
+    # superinstrucciones (BytecodeCompiler(optimize=True))
+    'JUMP_IF_NOT_LT', 'JUMP_IF_NOT_GT', 'JUMP_IF_NOT_LE', 'JUMP_IF_NOT_GE',
+    'JUMP_IF_NOT_EQ', 'JUMP_IF_NOT_NE', 'INC_LOCAL', 'LOAD_LOCAL2',
+)
+(CONST, LOAD_LOCAL, STORE_LOCAL, LOAD_GLOBAL, STORE_GLOBAL, DUP, POP,
+ ADD, SUB, MUL, DIV_INT, DIV_FLOAT, MOD, NEG, NOT,
+ LT, GT, LE, GE, EQ, NE,
+ TO_INT, TO_FLOAT, TO_BOOL,
+ JUMP, JUMP_IF_FALSE, JUMP_IF_TRUE,
+ CALL, RETURN, PRINT, READ, HALT,
+ JUMP_IF_NOT_LT, JUMP_IF_NOT_GT, JUMP_IF_NOT_LE, JUMP_IF_NOT_GE,
+ JUMP_IF_NOT_EQ, JUMP_IF_NOT_NE, INC_LOCAL, LOAD_LOCAL2) = range(len(OPCODES))
+
+# Comparación seguida de JUMP_IF_FALSE -> un solo salto condicional
+_FUSED_JUMPS = {LT: JUMP_IF_NOT_LT, GT: JUMP_IF_NOT_GT, LE: JUMP_IF_NOT_LE, GE: JUMP_IF_NOT_GE,
+                EQ: JUMP_IF_NOT_EQ, NE: JUMP_IF_NOT_NE}
+JUMPS = frozenset({JUMP, JUMP_IF_FALSE, JUMP_IF_TRUE, *_FUSED_JUMPS.values()})
+# INC_LOCAL y LOAD_LOCAL2 llevan dos operandos de 16 bits en el argumento
+_PAIR_LIMIT = 1 << 16
+
+# Argumento de PRINT/READ: cómo se escribe o se lee el valor
+K_INT, K_FLOAT, K_CHAR, K_BOOL, K_STR = range(5)
+_KINDS = {'int': K_INT, 'float': K_FLOAT, 'double': K_FLOAT, 'char': K_CHAR,
+          'boolean': K_BOOL, 'string': K_STR}
+
+# Rango de int de C++ (32 bits con signo)
+INT_MIN, INT_MAX = -(1 << 31), (1 << 31) - 1
+
+_BINARY = {'+': ADD, '-': SUB, '*': MUL, '%': MOD,
+           '<': LT, '>': GT, '<=': LE, '>=': GE, '==': EQ, '!=': NE}
+_COMPARISONS = frozenset({'<', '>', '<=', '>=', '==', '!='})
+# Nodos que dejan un valor en la pila: como sentencia hay que descartarlo
+_EXPRESSIONS = frozenset({'ASSIGN', 'BINOP', 'UNARY', 'CALL', 'ID', 'NUMBER', 'FLOAT_NUM',
+                          'STRING_LITERAL', 'CHAR_LITERAL', 'BOOLEAN'})
+
+
+class CompileError(Exception):
+    pass
+
+
+class Program:
+    """Resultado de BytecodeCompiler.compile"""
+
+    __slots__ = ('code', 'consts', 'functions', 'function_names', 'n_globals', 'global_names')
+
+    def __init__(self, code, consts, functions, function_names, n_globals, global_names):
+        self.code = code                      # array('i') de pares (opcode, argumento)
+        self.consts = consts                  # constantes (números, cadenas)
+        self.functions = functions            # [(entrada, nº de parámetros, nº de locales)]
+        self.function_names = function_names
+        self.n_globals = n_globals
+        self.global_names = global_names
+
+    def __len__(self):
+        return len(self.code) // 2
+
+    def to_bytes(self):
+        return self.code.tobytes()
+
+
+def wrap_int(value):
+    """Entero reducido a 32 bits con signo (complemento a dos)"""
+    return ((value - INT_MIN) & 0xFFFFFFFF) + INT_MIN
+
+
+def _numeric(t1, t2):
+    return 'float' if 'float' in (t1, t2) or 'double' in (t1, t2) else 'int'
+
+
+class BytecodeCompiler:
+    """AST comprobado -> Program. Los manejadores compile_* son generadores como
+    los de SemanticAnalyzer (`yield hijo` compila el hijo y devuelve su tipo), así
+    que la profundidad del AST no depende de la recursión de Python."""
+
+    def __init__(self, optimize=True):
+        self.optimize = optimize  # superinstrucciones: menos despachos en la VM
+        self._dispatch = DispatchTable(self, 'compile_', self._unsupported)
+        self._reset()
+
+    def _reset(self):
+        self.code = array('i')
+        self._targets = set()     # destinos de salto: no se fusiona a través de ellos
+        self.consts = []
+        self._const_index = {}
+        self.functions = {}       # nombre -> (índice, tipo de retorno, tipos de parámetros)
+        self._entries = []
+        self._globals = {}        # nombre -> (hueco, tipo, posición de la declaración)
+        self._position = 0        # declaración de alto nivel que se compila
+        self._table = None        # locales de la función actual (símbolo value = hueco)
+        self._slot_marks = []
+        self._next_slot = 0
+        self._max_slot = 0
+        self._return_type = None
+
+    # ---------- API ----------
+    def compile(self, ast):
+        if ast is None or ast.type != 'PROGRAM':
+            raise CompileError("Se esperaba un PROGRAM")
+        self._reset()
+        decls = ast.children
+        for node in decls:
+            if node.type == 'FUN_DEF' and node.value not in self.functions:
+                params = tuple(p.children[0].value for p in node.children[1])
+                self.functions[node.value] = (len(self.functions), node.children[0].value, params)
+        if 'main' not in self.functions:
+            raise CompileError("El programa no define 'main'")
+        self._entries = [None] * len(self.functions)
+
+        # Inicialización de globales en orden y llamada a main
+        for pos, node in enumerate(decls):
+            self._position = pos
+            if node.type == 'VAR_DECL':
+                self._run(node)
+            elif node.type != 'FUN_DEF':
+                raise CompileError(f"Declaración no soportada: {node.type}")
+        self.emit(CALL, self.functions['main'][0])
+        self.emit(HALT)
+
+        for pos, node in enumerate(decls):
+            if node.type == 'FUN_DEF':
+                self._position = pos
+                self._run(node)
+
+        entries = self.functions
+        functions = [None] * len(entries)
+        names = [None] * len(entries)
+        for name, (index, _, _) in entries.items():
+            names[index] = name
+            functions[index] = self._entries[index]
+        global_names = [None] * len(self._globals)
+        for name, (slot, _, _) in self._globals.items():
+            global_names[slot] = name
+        return Program(self.code, self.consts, functions, names, len(self._globals), global_names)
+
+    # ---------- EMISIÓN ----------
+    def emit(self, op, arg=0):
+        if op in JUMPS and arg:
+            self._targets.add(arg)
+        self.code.append(op)
+        self.code.append(arg)
+        return len(self.code) - 2
+
+    def label(self):
+        return len(self.code)
+
+    def loop_label(self):
+        """Posición a la que se saltará hacia atrás (se registra ya como destino)"""
+        top = len(self.code)
+        self._targets.add(top)
+        return top
+
+    def patch(self, at, target=None):
+        """Fija el destino del salto emitido en `at` (por defecto, aquí)"""
+        target = self.label() if target is None else target
+        self.code[at + 1] = target
+        self._targets.add(target)
+
+    def _last_op(self):
+        """Opcode de la última instrucción si se puede fusionar con la siguiente"""
+        code = self.code
+        if not self.optimize or len(code) < 2 or len(code) in self._targets:
+            return None
+        return code[-2]
+
+    def jump_if_false(self):
+        """JUMP_IF_FALSE; tras una comparación se fusiona con ella"""
+        fused = _FUSED_JUMPS.get(self._last_op())
+        if fused is None:
+            return self.emit(JUMP_IF_FALSE)
+        self.code[-2] = fused
+        return len(self.code) - 2
+
+    def load_local(self, slot):
+        """LOAD_LOCAL; dos seguidas se fusionan en LOAD_LOCAL2"""
+        code = self.code
+        if self._last_op() == LOAD_LOCAL and code[-1] < _PAIR_LIMIT and slot < _PAIR_LIMIT:
+            code[-2] = LOAD_LOCAL2
+            code[-1] |= slot << 16
+            return len(code) - 2
+        return self.emit(LOAD_LOCAL, slot)
+
+    def const_index(self, value):
+        key = (type(value), value)
+        index = self._const_index.get(key)
+        if index is None:
+            index = self._const_index[key] = len(self.consts)
+            self.consts.append(value)
+        return index
+
+    def const(self, value):
+        return self.emit(CONST, self.const_index(value))
+
+    def convert(self, src, dst):
+        """Conversión implícita del valor de tipo src al tipo dst"""
+        if dst in ('int', 'char') and src in ('float', 'double', 'boolean'):
+            self.emit(TO_INT)
+        elif dst in ('float', 'double') and src in ('int', 'char', 'boolean'):
+            self.emit(TO_FLOAT)
+
+    def discard(self):
+        """Descarta el valor de una expresión usada como sentencia; una asignación
+        (DUP + STORE) pierde el DUP en lugar de añadir un POP"""
+        code = self.code
+        if len(code) >= 4 and code[-4] == DUP and code[-2] in (STORE_LOCAL, STORE_GLOBAL):
+            del code[-4:-2]
+            if self.optimize:
+                self._increment()
+        else:
+            self.emit(POP)
+
+    def _increment(self):
+        """LOAD_LOCAL x, CONST k, ADD/SUB, STORE_LOCAL x -> INC_LOCAL x, ±k"""
+        code = self.code
+        n = len(code)
+        if (n < 8 or code[-8] != LOAD_LOCAL or code[-6] != CONST or code[-4] not in (ADD, SUB)
+                or code[-2] != STORE_LOCAL or code[-7] != code[-1]):
+            return
+        if any(n - k in self._targets for k in (2, 4, 6)):
+            return
+        step = self.consts[code[-5]]
+        if type(step) not in (int, float):
+            return
+        if code[-4] == SUB:
+            step = wrap_int(-step) if type(step) is int else -step
+        slot = code[-1]
+        index = self.const_index(step)
+        if slot >= _PAIR_LIMIT or index >= _PAIR_LIMIT:
+            return
+        del code[-8:]
+        self.emit(INC_LOCAL, slot | index << 16)
+
+    def _run(self, node):
+        return evaluate(node, self._dispatch, self._compile_list)
+
+    def _compile_list(self, nodes):
+        for item in nodes:
+            yield item
+
+    def _unsupported(self, node):
+        raise CompileError(f"Construcción no soportada por el compilador: {node.type} (línea {node.line})")
+
+    def _statement(self, node):
+        if node is None:
+            return
+        yield node
+        if node.type in _EXPRESSIONS:
+            self.discard()
+
+    # ---------- VARIABLES ----------
+    def _lookup(self, name, line):
+        """('local' | 'global', hueco, tipo)"""
+        if self._table is not None:
+            sym = self._table.lookup(name)
+            if sym is not None:
+                return 'local', sym['value'], sym['type']
+        glob = self._globals.get(name)
+        if glob is not None and glob[2] <= self._position:  # declarada antes de este punto
+            return 'global', glob[0], glob[1]
+        raise CompileError(f"Variable '{name}' no declarada (línea {line})")
+
+    def _declare(self, name, var_type):
+        if self._table is None:
+            if name in self._globals:
+                raise CompileError(f"Identificador '{name}' ya está definido en este ámbito")
+            self._globals[name] = (len(self._globals), var_type, self._position)
+            return 'global', self._globals[name][0]
+        slot = self._next_slot
+        self._table.define(name, var_type, slot)
+        self._next_slot += 1
+        self._max_slot = max(self._max_slot, self._next_slot)
+        return 'local', slot
+
+    def _store(self, scope, slot):
+        self.emit(STORE_LOCAL if scope == 'local' else STORE_GLOBAL, slot)
+
+    def _enter_scope(self):
+        self._table.push_scope()
+        self._slot_marks.append(self._next_slot)
+
+    def _exit_scope(self):
+        self._table.pop_scope()
+        self._next_slot = self._slot_marks.pop()
+
+    # ---------- DECLARACIONES ----------
+    def compile_var_decl(self, node):
+        base_type = node.children[0].value
+        for init in node.children[1:]:
+            # Como en SemanticAnalyzer, el nombre ya es visible en su inicializador
+            scope, slot = self._declare(init.value, base_type)
+            if init.children:
+                expr_type = yield init.children[0]
+                self.convert(expr_type, base_type)
+                self._store(scope, slot)
+            else:  # valor definido (y del tipo correcto) aunque el hueco se reutilice
+                self.const(0.0 if base_type in ('float', 'double') else 0)
+                self._store(scope, slot)
+
+    def compile_fun_def(self, node):
+        index, ret_type, _ = self.functions[node.value]
+        if self._entries[index] is not None:
+            raise CompileError(f"Identificador '{node.value}' ya está definido en este ámbito")
+        self._entries[index] = self.label()
+        self._table = SymbolTable()
+        self._next_slot = self._max_slot = 0
+        self._return_type = ret_type
+        params = node.children[1]
+        for param in params:
+            self._declare(param.value, param.children[0].value)
+        yield node.children[2]
+        # Salida por el final de la función sin return
+        self.const(0.0 if ret_type in ('float', 'double') else 0)
+        self.emit(RETURN)
+        self._entries[index] = (self._entries[index], len(params), self._max_slot)
+        self._table = None
+
+    # ---------- SENTENCIAS ----------
+    def compile_block(self, node):
+        self._enter_scope()
+        for child in node.children:
+            yield from self._statement(child)
+        self._exit_scope()
+
+    def compile_empty(self, node):
+        return None
+
+    def compile_if(self, node):
+        yield node.children[0]
+        to_else = self.jump_if_false()
+        yield from self._statement(node.children[1])
+        if len(node.children) > 2:
+            to_end = self.emit(JUMP)
+            self.patch(to_else)
+            yield from self._statement(node.children[2])
+            self.patch(to_end)
+        else:
+            self.patch(to_else)
+
+    def compile_while(self, node):
+        top = self.loop_label()
+        yield node.children[0]
+        to_end = self.jump_if_false()
+        yield from self._statement(node.children[1])
+        self.emit(JUMP, top)
+        self.patch(to_end)
+
+    def compile_for(self, node):
+        init, cond, step, body = node.children
+        self._enter_scope()
+        yield from self._statement(init)
+        top = self.loop_label()
+        to_end = None
+        if cond is not None:
+            yield cond
+            to_end = self.jump_if_false()
+        yield from self._statement(body)
+        yield from self._statement(step)
+        self.emit(JUMP, top)
+        if to_end is not None:
+            self.patch(to_end)
+        self._exit_scope()
+
+    def compile_return(self, node):
+        if node.children:
+            expr_type = yield node.children[0]
+            self.convert(expr_type, self._return_type)
+        else:
+            self.const(0)
+        self.emit(RETURN)
+
+    def compile_cout(self, node):
+        for item in node.children:
+            if item.type == 'ID' and item.value == 'endl' and not self._is_declared('endl'):
+                self.const('\n')
+                self.emit(PRINT, K_STR)
+                continue
+            item_type = yield item
+            self.emit(PRINT, _KINDS.get(item_type, K_INT))
+
+    def compile_cin(self, node):
+        for target in node.children:
+            if target.type != 'ID':
+                raise CompileError(f"cin necesita una variable (línea {target.line})")
+            scope, slot, var_type = self._lookup(target.value, target.line)
+            self.emit(READ, _KINDS.get(var_type, K_INT))
+            self._store(scope, slot)
+
+    def _is_declared(self, name):
+        try:
+            self._lookup(name, None)
+        except CompileError:
+            return False
+        return True
+
+    # ---------- EXPRESIONES ----------
+    def compile_assign(self, node):
+        target = node.children[0]
+        scope, slot, var_type = self._lookup(target.value, target.line)
+        expr_type = yield node.children[1]
+        self.convert(expr_type, var_type)
+        self.emit(DUP)
+        self._store(scope, slot)
+        return var_type
+
+    def compile_binop(self, node):
+        op = node.value
+        if op in ('&&', '||'):
+            # Cortocircuito; el resultado es siempre 0/1 (TO_BOOL)
+            yield node.children[0]
+            short = self.jump_if_false() if op == '&&' else self.emit(JUMP_IF_TRUE)
+            yield node.children[1]
+            self.emit(TO_BOOL)
+            to_end = self.emit(JUMP)
+            self.patch(short)
+            self.const(op == '||')
+            self.patch(to_end)
+            return 'boolean'
+        left = yield node.children[0]
+        right = yield node.children[1]
+        if op in _COMPARISONS:
+            self.emit(_BINARY[op])
+            return 'boolean'
+        result = _numeric(left, right)
+        if op == '/':
+            self.emit(DIV_INT if result == 'int' else DIV_FLOAT)
+            return result
+        if op == '%':
+            self.emit(MOD)
+            return 'int'
+        if op not in _BINARY:
+            raise CompileError(f"Operador no soportado: {op}")
+        # int + float no necesita conversión: la VM ya da float
+        self.emit(_BINARY[op])
+        return result
+
+    def compile_unary(self, node):
+        operand = yield node.children[0]
+        if node.value == '-':
+            self.emit(NEG)
+            return operand
+        self.emit(NOT)
+        return 'boolean'
+
+    def compile_call(self, node):
+        entry = self.functions.get(node.value)
+        if entry is None:
+            raise CompileError(f"Función '{node.value}' no declarada (línea {node.line})")
+        index, ret_type, params = entry
+        if len(params) != len(node.children):
+            raise CompileError(f"La función '{node.value}' espera {len(params)} argumentos, "
+                               f"recibe {len(node.children)}")
+        for arg, param_type in zip(node.children, params):
+            arg_type = yield arg
+            self.convert(arg_type, param_type)
+        self.emit(CALL, index)
+        return ret_type
+
+    def compile_id(self, node):
+        scope, slot, var_type = self._lookup(node.value, node.line)
+        if scope == 'local':
+            self.load_local(slot)
+        else:
+            self.emit(LOAD_GLOBAL, slot)
+        return var_type
+
+    def compile_number(self, node):
+        self.const(node.value)
+        return 'int'
+
+    def compile_float_num(self, node):
+        self.const(float(node.value))
+        return 'float'
+
+    def compile_char_literal(self, node):
+        self.const(ord(node.value))
+        return 'char'
+
+    def compile_string_literal(self, node):
+        self.const(node.value)
+        return 'string'
+
+    def compile_boolean(self, node):
+        self.const(node.value == 'true')
+        return 'boolean'
+
+
+def compile_program(ast):
+    return BytecodeCompiler().compile(ast)
+
+
+def disassemble(program):
+    """Listado legible del bytecode (una instrucción por línea)"""
+    entries = {entry: name for name, (entry, _, _) in zip(program.function_names, program.functions)}
+    lines = []
+    code = program.code
+    for pc in range(0, len(code), 2):
+        op, arg = code[pc], code[pc + 1]
+        if pc in entries:
+            lines.append(f"{entries[pc]}:")
+        name = OPCODES[op]
+        if op == CONST:
+            text = f"{name} {program.consts[arg]!r}"
+        elif op in (LOAD_GLOBAL, STORE_GLOBAL):
+            text = f"{name} {program.global_names[arg]}"
+        elif op == CALL:
+            text = f"{name} {program.function_names[arg]}"
+        elif op in (INC_LOCAL, LOAD_LOCAL2):
+            second = program.consts[arg >> 16] if op == INC_LOCAL else arg >> 16
+            text = f"{name} {arg & 0xFFFF} {second!r}"
+        elif op in JUMPS or op in (LOAD_LOCAL, STORE_LOCAL, PRINT, READ):
+            text = f"{name} {arg}"
+        else:
+            text = name
+        lines.append(f"  {pc:5d}  {text}")
+    return lines
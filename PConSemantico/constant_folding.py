@@ -0,0 +1,343 @@
+# constant_folding.py
+# Pasada de optimización sobre el AST de CPPParser: pliega las subexpresiones
+# constantes (BINOP/UNARY sobre NUMBER, FLOAT_NUM y BOOLEAN), simplifica las
+# operaciones identidad (x + 0, x * 1, x / 1, - -x) y anota en IF/WHILE/FOR las
+# condiciones que resultan constantes (node.value = True/False).
+#
+# Las transformaciones conservan el tipo que SemanticAnalyzer deduce y no
+# ocultan errores: solo se pliegan literales con operandos válidos, y una
+# identidad solo se aplica si el otro operando es numérico con seguridad (un
+# literal, una variable declarada int/float o una operación aritmética). Con
+# prune=True además se eliminan las ramas muertas; eso sí cambia lo que se
+# analiza después (el código inalcanzable ya no se comprueba).
+
+from ast_visitor import walk
+from parser_cpp import ASTNode
+from semantic_analyzer import SymbolTable
+
+_ARITHMETIC = {'+', '-', '*', '/'}
+_COMPARISON = {
+    '==': lambda a, b: a == b,
+    '!=': lambda a, b: a != b,
+    '<': lambda a, b: a < b,
+    '>': lambda a, b: a > b,
+    '<=': lambda a, b: a <= b,
+    '>=': lambda a, b: a >= b,
+}
+_LITERAL_TYPES = {'NUMBER': 'int', 'FLOAT_NUM': 'float', 'BOOLEAN': 'boolean'}
+# Rango de int de C++: un resultado fuera de él no se pliega (el desbordamiento
+# depende de la plataforma)
+_INT_MIN, _INT_MAX = -(1 << 31), (1 << 31) - 1
+
+
+def _literal(node):
+    """(tipo, valor) de un literal NUMBER/FLOAT_NUM/BOOLEAN o None"""
+    if node is None:
+        return None
+    kind = _LITERAL_TYPES.get(node.type)
+    if kind is None:
+        return None
+    if kind == 'boolean':
+        return kind, node.value == 'true'
+    return kind, node.value
+
+
+def _make_literal(kind, value, line):
+    if kind == 'boolean':
+        return ASTNode('BOOLEAN', value='true' if value else 'false', line=line)
+    if kind == 'int':
+        return ASTNode('NUMBER', value=value, line=line)
+    return ASTNode('FLOAT_NUM', value=value, line=line)
+
+
+def _c_div(a, b):
+    """División entera de C (trunca hacia cero)"""
+    q = abs(a) // abs(b)
+    return q if (a < 0) == (b < 0) else -q
+
+
+def _c_mod(a, b):
+    """Resto de C (con el signo del dividendo)"""
+    r = abs(a) % abs(b)
+    return r if a >= 0 else -r
+
+
+def condition_value(node):
+    """Valor de verdad de una condición literal, o None si no es constante"""
+    lit = _literal(node)
+    if lit is None:
+        return None
+    return bool(lit[1])
+
+
+class ConstantFolder:
+    """Pliega constantes en un AST (lo modifica en el sitio y lo devuelve).
+
+        folder = ConstantFolder()
+        ast = folder.fold(ast)
+        folder.stats        # nodos antes/después, pliegues, condiciones constantes
+        folder.conditions   # [(tipo, línea, valor)] de IF/WHILE/FOR constantes
+    """
+
+    def __init__(self, simplify=True, prune=False):
+        self.simplify = simplify  # identidades x + 0, x * 1, ...
+        self.prune = prune        # eliminar ramas muertas
+        self.stats = {}
+        self.conditions = []
+        self._table = None
+        self._types = {}
+        self._foldable = {'BINOP', 'UNARY', 'IF', 'WHILE', 'FOR'} if prune else {'BINOP', 'UNARY'}
+
+    # ---------- API ----------
+    def fold(self, ast):
+        self.stats = {'nodes_before': 0, 'nodes_after': 0, 'folded': 0,
+                      'simplified': 0, 'constant_conditions': 0, 'pruned': 0}
+        self.conditions = []
+        self._table = SymbolTable()
+        self._types = {}
+        walk(ast, self._enter, self._leave)
+        self.stats['nodes_after'] = _count(ast)
+        self._table = None
+        self._types = {}
+        return ast
+
+    # ---------- RECORRIDO ----------
+    # Los ámbitos siguen el mismo orden que SemanticAnalyzer, para saber qué
+    # variables numéricas son visibles en cada identidad
+    def _enter(self, node, base_type):
+        self.stats['nodes_before'] += 1
+        kind = node.type
+        table = self._table
+        if kind == 'VAR_DECL':
+            return node.children[0].value
+        if kind == 'INIT_DECL':
+            if base_type != 'void':
+                self._define(node.value, base_type)
+        elif kind == 'PARAM':
+            self._define(node.value, node.children[0].value)
+        elif kind == 'FUN_DEF':
+            self._define(node.value, f"function_{node.children[0].value}")
+            table.push_scope()
+        elif kind in ('BLOCK', 'FOR'):
+            table.push_scope()
+        return None
+
+    def _leave(self, node, _):
+        # Cada nodo lo pliega su padre, después de haber plegado sus hijos
+        children = node.children
+        if not children:
+            if node.type == 'BLOCK':
+                self._table.pop_scope()
+            return
+        foldable = self._foldable
+        for i, child in enumerate(children):
+            if isinstance(child, ASTNode) and child.type in foldable:
+                new = self._fold(child)
+                if new is not child:
+                    children[i] = new
+        kind = node.type
+        if kind in ('FUN_DEF', 'BLOCK', 'FOR'):
+            self._table.pop_scope()
+        if kind in ('IF', 'WHILE', 'FOR'):
+            cond = children[1] if kind == 'FOR' else children[0]
+            value = condition_value(cond)
+            if value is not None:
+                node.value = value
+                self.stats['constant_conditions'] += 1
+                self.conditions.append((kind, node.line, value))
+
+    def _define(self, name, symbol_type):
+        try:
+            self._table.define(name, symbol_type)
+        except Exception:
+            pass  # redefinición: como en el análisis semántico, queda la primera
+
+    # ---------- PLEGADO ----------
+    def _fold(self, node):
+        kind = node.type
+        if kind == 'BINOP':
+            return self._fold_binop(node)
+        if kind == 'UNARY':
+            return self._fold_unary(node)
+        if isinstance(node.value, bool):  # IF/WHILE/FOR constante (solo con prune)
+            return self._prune(node)
+        return node
+
+    def _fold_binop(self, node):
+        left, right = node.children
+        op = node.value
+        a, b = _literal(left), _literal(right)
+        if a is not None and b is not None:
+            result = self._evaluate(op, a, b)
+            if result is not None:
+                self.stats['folded'] += 1
+                return _make_literal(*result, node.line)
+        elif self.simplify:
+            simplified = self._identity(node, op, left, right, a, b)
+            if simplified is not None:
+                self.stats['simplified'] += 1
+                return simplified
+        return node
+
+    def _evaluate(self, op, a, b):
+        """(tipo, valor) de `a op b` con literales, o None si no se pliega"""
+        (ta, va), (tb, vb) = a, b
+        numeric = ta != 'boolean' and tb != 'boolean'
+        if op in _ARITHMETIC or op == '%':
+            if not numeric:
+                return None  # SemanticAnalyzer lo notifica: se deja intacto
+            if op == '%':
+                if ta != 'int' or tb != 'int' or vb == 0:
+                    return None
+                return self._int_result(_c_mod(va, vb))
+            result_type = 'float' if 'float' in (ta, tb) else 'int'
+            if op == '/':
+                if vb == 0:
+                    return None
+                if result_type == 'int':
+                    return self._int_result(_c_div(va, vb))
+                value = va / vb
+            elif op == '+':
+                value = va + vb
+            elif op == '-':
+                value = va - vb
+            else:
+                value = va * vb
+            if result_type == 'int':
+                return self._int_result(value)
+            value = float(value)
+            if value != value or value in (float('inf'), float('-inf')):
+                return None
+            return 'float', value
+        compare = _COMPARISON.get(op)
+        if compare is not None:
+            if numeric or ta == tb == 'boolean':
+                return 'boolean', compare(va, vb)
+            return None  # tipos incompatibles: es un error semántico
+        if op in ('&&', '||') and ta == 'boolean':
+            # El analizador da a && y || el tipo del operando izquierdo
+            return 'boolean', (bool(va) and bool(vb)) if op == '&&' else (bool(va) or bool(vb))
+        return None
+
+    @staticmethod
+    def _int_result(value):
+        if _INT_MIN <= value <= _INT_MAX:
+            return 'int', value
+        return None
+
+    def _identity(self, node, op, left, right, a, b):
+        """x + 0, 0 + x, x - 0, x * 1, 1 * x, x / 1 -> x si el tipo no cambia"""
+        if b is not None:
+            other, lit = left, b
+        elif a is not None and op in ('+', '*'):
+            other, lit = right, a
+        else:
+            return None
+        lit_type, lit_value = lit
+        if lit_type == 'boolean':
+            return None
+        if op in ('+', '-'):
+            neutral = lit_value == 0
+        elif op in ('*', '/'):
+            neutral = lit_value == 1
+        else:
+            return None
+        if not neutral:
+            return None
+        other_type = self._numeric_type(other)
+        if other_type is None:
+            return None
+        if op in ('+', '-') and other_type != 'int':
+            return None  # en coma flotante x + 0 no es exacto para -0.0
+        if lit_type == 'float' and other_type != 'float':
+            return None  # el literal float convertiría el resultado
+        return other
+
+    def _fold_unary(self, node):
+        operand = node.children[0]
+        op = node.value
+        lit = _literal(operand)
+        if lit is not None:
+            kind, value = lit
+            if op == '-' and kind != 'boolean':
+                result = self._int_result(-value) if kind == 'int' else (kind, -value)
+                if result is None:
+                    return node
+                self.stats['folded'] += 1
+                return _make_literal(*result, node.line)
+            if op == '!' and kind != 'float':
+                # El analizador conserva el tipo del operando (int o boolean)
+                self.stats['folded'] += 1
+                return _make_literal(kind, int(not value) if kind == 'int' else not value, node.line)
+            return node
+        if (self.simplify and op == '-' and operand.type == 'UNARY' and operand.value == '-'
+                and self._numeric_type(operand.children[0]) is not None):
+            self.stats['simplified'] += 1
+            return operand.children[0]
+        return node
+
+    def _numeric_type(self, node):
+        """'int'/'float' si el nodo es numérico con seguridad, si no None"""
+        cached = self._types.get(id(node))
+        if cached is not None:
+            return cached[1]
+        kind = node.type
+        result = None
+        if kind == 'NUMBER':
+            result = 'int'
+        elif kind == 'FLOAT_NUM':
+            result = 'float'
+        elif kind == 'ID':
+            sym = self._table.lookup(node.value)
+            if sym is not None and sym['type'] in ('int', 'float'):
+                result = sym['type']
+        elif kind == 'BINOP' and node.value in _ARITHMETIC:
+            left = self._numeric_type(node.children[0])
+            right = self._numeric_type(node.children[1])
+            if left is not None and right is not None:
+                result = 'float' if 'float' in (left, right) else 'int'
+        elif kind == 'UNARY' and node.value == '-':
+            result = self._numeric_type(node.children[0])
+        # Los ID dependen del ámbito: solo se guarda el tipo de las expresiones.
+        # Se guarda también el nodo para que su id no se reutilice en la pasada
+        if kind != 'ID':
+            self._types[id(node)] = (node, result)
+        return result
+
+    # ---------- RAMAS MUERTAS ----------
+    def _prune(self, node):
+        kind = node.type
+        children = node.children
+        if kind == 'IF':
+            if node.value:
+                replacement = children[1]
+            elif len(children) > 2:
+                replacement = children[2]
+            else:
+                replacement = ASTNode('EMPTY', line=node.line)
+        elif node.value:
+            return node  # bucle con condición siempre cierta: se conserva
+        elif kind == 'WHILE':
+            replacement = ASTNode('EMPTY', line=node.line)
+        else:  # FOR con condición falsa: solo se ejecuta la inicialización
+            replacement = children[0] or ASTNode('EMPTY', line=node.line)
+        self.stats['pruned'] += 1
+        return replacement
+
+
+def _count(root):
+    count = 0
+
+    def enter(node, _):
+        nonlocal count
+        count += 1
+
+    walk(root, enter)
+    return count
+
+
+def fold_constants(ast, simplify=True, prune=False):
+    """Aplica ConstantFolder; devuelve (ast, estadísticas)"""
+    folder = ConstantFolder(simplify, prune)
+    ast = folder.fold(ast)
+    return ast, dict(folder.stats, conditions=folder.conditions)
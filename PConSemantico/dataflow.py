@@ -0,0 +1,327 @@
+# dataflow.py
+# Análisis de flujo de datos sobre el IR de ir.py: un motor de lista de trabajo
+# sobre el grafo de flujo de cada función, con conjuntos representados como
+# enteros de Python (un bit por elemento), y dos análisis clásicos:
+#
+#   - definiciones alcanzables (hacia delante, unión; un bit por definición):
+#     una lectura a la que solo llega el UNDEF de la declaración usa la
+#     variable sin inicializar; si llega junto a otras definiciones, puede
+#     usarla sin inicializar en algún camino.
+#   - variables vivas (hacia atrás, unión; un bit por registro): una asignación
+#     cuyo valor no está vivo después es un almacenamiento muerto.
+#
+# Solo se analizan las variables locales y los parámetros; las globales pueden
+# leerse desde cualquier función y empiezan a cero. Los avisos no son errores
+# semánticos: el programa sigue siendo válido.
+#
+#   python dataflow.py programa.cpp
+
+import sys
+import time
+from heapq import heappop, heappush
+
+from ir import (
+    DEFINES, READ, REG, UNDEF, USE_FIELDS, IRError, lower_program, operand_kind,
+)
+
+
+# ---------- MOTOR ----------
+def _postorder(blocks, forward):
+    """Orden de visita: postorden inverso (hacia delante) o postorden (hacia atrás).
+
+    Los sucesores se exploran del último al primero: la salida de un bucle es
+    el segundo destino de su BRANCH, así que el cuerpo queda ordenado antes que
+    el código que sigue al bucle y este no se recalcula por cada bucle anterior."""
+    seen = [False] * len(blocks)
+    order = []
+    stack = [(0, reversed(blocks[0].succs))]
+    seen[0] = True
+    while stack:
+        index, succs = stack[-1]
+        for succ in succs:
+            if not seen[succ]:
+                seen[succ] = True
+                stack.append((succ, reversed(blocks[succ].succs)))
+                break
+        else:
+            stack.pop()
+            order.append(index)
+    # Los bloques sin camino desde la entrada no existen en el IR, pero puede
+    # haber bloques de los que no se sale (bucles infinitos): todos se visitan
+    order.extend(i for i in range(len(blocks)) if not seen[i])
+    if forward:
+        order.reverse()
+    return order
+
+
+def solve(blocks, gen, kill, forward=True, must=False, boundary=0, universe=0):
+    """Resuelve un problema de flujo de datos de bitsets con lista de trabajo.
+
+    gen[b] y kill[b] son los conjuntos de cada bloque: salida = gen | (entrada & ~kill)
+    en la dirección del análisis. La confluencia es la unión o, con must=True,
+    la intersección (entonces los valores parten de `universe`). boundary es el
+    valor en la entrada de la función (o en las salidas, hacia atrás).
+    Devuelve (entradas, salidas, iteraciones) en el sentido del programa:
+    entradas[b] al principio del bloque y salidas[b] al final.
+    """
+    n = len(blocks)
+    if forward:
+        sources = [block.preds for block in blocks]
+        sinks = [block.succs for block in blocks]
+        at_boundary = [i == 0 for i in range(n)]
+    else:
+        sources = [block.succs for block in blocks]
+        sinks = [block.preds for block in blocks]
+        at_boundary = [not block.succs for block in blocks]
+    top = universe if must else 0
+    before = [top] * n   # valor al entrar en el bloque en la dirección del análisis
+    after = [top] * n
+    # La lista de trabajo saca siempre el bloque pendiente más temprano en el
+    # orden de visita: un cambio que vuelve por una arista de retroceso se
+    # propaga junto con los demás en lugar de recorrer la función otra vez
+    order = _postorder(blocks, forward)
+    rank = [0] * n
+    for position, b in enumerate(order):
+        rank[b] = position
+    worklist = list(range(n))
+    pending = [True] * n
+    iterations = 0
+    while worklist:
+        b = order[heappop(worklist)]
+        pending[b] = False
+        iterations += 1
+        value = boundary if at_boundary[b] else top
+        if must:
+            for s in sources[b]:
+                value &= after[s]
+        else:
+            for s in sources[b]:
+                value |= after[s]
+        before[b] = value
+        out = gen[b] | (value & ~kill[b])
+        if out != after[b]:
+            after[b] = out
+            for s in sinks[b]:
+                if not pending[s]:
+                    pending[s] = True
+                    heappush(worklist, rank[s])
+    if forward:
+        return before, after, iterations
+    return after, before, iterations
+
+
+# ---------- ANÁLISIS ----------
+def _variable_name(fn, index):
+    # las variables ocultadas se llaman x.1, x.2... en el IR
+    return fn.reg_names[index].split('.')[0]
+
+
+def _is_variable(fn, operand):
+    return operand_kind(operand) == REG and fn.reg_names[operand >> 2] is not None
+
+
+def reaching_definitions(fn):
+    """Definiciones de variables que alcanzan cada bloque, como dict:
+    definitions[d] = (bloque, posición, registro) para el bit d; by_register[r],
+    bitset de las definiciones del registro r; undefined, el de las UNDEF;
+    block_defs[b] = [(posición, registro, bit)]; in[b], bitset a la entrada"""
+    definitions = []
+    by_register = [0] * fn.n_registers
+    undefined = 0
+    block_defs = []
+    for block in fn.blocks:
+        code = block.code
+        mine = []
+        for k in range(0, len(code), 4):
+            a = code[k + 1]
+            if code[k] in DEFINES and _is_variable(fn, a):
+                bit = 1 << len(definitions)
+                reg = a >> 2
+                definitions.append((block.index, k // 4, reg))
+                by_register[reg] |= bit
+                if code[k] == UNDEF:
+                    undefined |= bit
+                mine.append((k // 4, reg, bit))
+        block_defs.append(mine)
+    gen = []
+    kill = []
+    for mine in block_defs:
+        g = k = 0
+        for _, reg, bit in mine:
+            g = (g & ~by_register[reg]) | bit
+            k |= by_register[reg]
+        gen.append(g)
+        kill.append(k)
+    ins, _, iterations = solve(fn.blocks, gen, kill, forward=True)
+    return {'definitions': definitions, 'by_register': by_register, 'undefined': undefined,
+            'block_defs': block_defs, 'in': ins, 'iterations': iterations}
+
+
+def live_variables(fn):
+    """Registros de variables vivos a la entrada y a la salida de cada bloque"""
+    use = []
+    defs = []
+    for block in fn.blocks:
+        code = block.code
+        u = d = 0
+        for k in range(0, len(code), 4):
+            op = code[k]
+            for field in USE_FIELDS[op]:
+                operand = code[k + field]
+                if operand >= 0 and _is_variable(fn, operand):
+                    bit = 1 << (operand >> 2)
+                    if not d & bit:
+                        u |= bit
+            a = code[k + 1]
+            if op in DEFINES and _is_variable(fn, a):
+                d |= 1 << (a >> 2)
+        use.append(u)
+        defs.append(d)
+    ins, outs, iterations = solve(fn.blocks, use, defs, forward=False)
+    return ins, outs, iterations
+
+
+class DataflowChecker:
+    """Avisos de flujo de datos por función.
+
+        checker = DataflowChecker()
+        warnings = checker.check_module(module)
+        checker.stats   # [{'function', 'instructions', 'blocks', 'variables',
+                        #   'definitions', 'iterations', 'elapsed', 'warnings'}]
+    """
+
+    def __init__(self, dead_stores=True, unused=True):
+        self.dead_stores = dead_stores
+        self.unused = unused
+        self.stats = []
+
+    def check_module(self, module):
+        self.stats = []
+        warnings = []
+        for fn in module.functions:  # la inicialización de globales no tiene locales
+            warnings.extend(self.check_function(fn))
+        return warnings
+
+    def check_function(self, fn):
+        start = time.perf_counter()
+        found = []  # (línea, mensaje)
+        reaching = reaching_definitions(fn)
+        read = self._uninitialized_reads(fn, reaching, found)
+        it_live = 0
+        if self.unused:
+            for reg in fn.variables()[fn.n_params:]:
+                if not read[reg]:
+                    found.append((fn.reg_lines[reg],
+                                  f"Variable '{_variable_name(fn, reg)}' declarada y no usada "
+                                  f"en línea {fn.reg_lines[reg]}"))
+        if self.dead_stores:
+            _, live_out, it_live = live_variables(fn)
+            self._dead_stores(fn, live_out, read, found)
+        found.sort(key=lambda item: item[0])
+        warnings = [message for _, message in dict.fromkeys(found)]
+        self.stats.append({
+            'function': fn.name,
+            'instructions': fn.instruction_count(),
+            'blocks': len(fn.blocks),
+            'variables': len(fn.variables()),
+            'definitions': len(reaching['definitions']),
+            'iterations': reaching['iterations'] + it_live,
+            'elapsed': time.perf_counter() - start,
+            'warnings': len(warnings),
+        })
+        return warnings
+
+    def _uninitialized_reads(self, fn, reaching, found):
+        """Recorre cada bloque con las definiciones que llegan; devuelve qué
+        registros se leen en algún punto"""
+        by_register = reaching['by_register']
+        undefined = reaching['undefined']
+        read = [False] * fn.n_registers
+        for block, current, mine in zip(fn.blocks, reaching['in'], reaching['block_defs']):
+            code = block.code
+            lines = block.lines
+            next_defs = iter(mine)
+            for k in range(0, len(code), 4):
+                op = code[k]
+                for field in USE_FIELDS[op]:
+                    operand = code[k + field]
+                    if operand < 0 or not _is_variable(fn, operand):
+                        continue
+                    reg = operand >> 2
+                    read[reg] = True
+                    arriving = current & by_register[reg]
+                    if arriving & undefined:
+                        line = lines[k // 4]
+                        name = _variable_name(fn, reg)
+                        if arriving & ~undefined:
+                            message = f"Variable '{name}' puede usarse sin inicializar en línea {line}"
+                        else:
+                            message = f"Variable '{name}' usada sin inicializar en línea {line}"
+                        found.append((line, message))
+                if op in DEFINES and _is_variable(fn, code[k + 1]):
+                    _, reg, bit = next(next_defs)
+                    current = (current & ~by_register[reg]) | bit
+        return read
+
+    def _dead_stores(self, fn, live_out, read, found):
+        for block, live in zip(fn.blocks, live_out):
+            code = block.code
+            lines = block.lines
+            for k in range(len(code) - 4, -1, -4):
+                op = code[k]
+                a = code[k + 1]
+                if op in DEFINES and _is_variable(fn, a):
+                    reg = a >> 2
+                    bit = 1 << reg
+                    # UNDEF no almacena nada y cin consume la entrada aunque no
+                    # se use el valor; las variables nunca leídas ya tienen su aviso
+                    if not live & bit and op not in (UNDEF, READ) and read[reg]:
+                        line = lines[k // 4]
+                        found.append((line, f"Valor asignado a '{_variable_name(fn, reg)}' en línea {line} nunca se usa"))
+                    live &= ~bit
+                for field in USE_FIELDS[op]:
+                    operand = code[k + field]
+                    if operand >= 0 and _is_variable(fn, operand):
+                        live |= 1 << (operand >> 2)
+
+
+def check_dataflow(ast, dead_stores=True, unused=True):
+    """Baja el AST (ya comprobado) al IR y lo analiza; devuelve (avisos, estadísticas por función)"""
+    checker = DataflowChecker(dead_stores, unused)
+    warnings = checker.check_module(lower_program(ast))
+    return warnings, checker.stats
+
+
+def main(argv=None):
+    from parser_cpp import CPPParser
+    from semantic_analyzer import SemanticAnalyzer
+
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 1:
+        print("uso: python dataflow.py programa.cpp", file=sys.stderr)
+        return 2
+    with open(argv[0], encoding='utf-8') as f:
+        code = f.read()
+    parser = CPPParser(quiet=True)
+    ast = parser.parse_stream(code)
+    errors = parser.lexer.errors + parser.errors
+    if not errors:
+        errors = SemanticAnalyzer(endl=True).analyze(ast)[1]
+    if errors:
+        print("✗ El programa tiene errores:\n" + "\n".join(f"  - {e}" for e in errors), file=sys.stderr)
+        return 1
+    try:
+        warnings, stats = check_dataflow(ast)
+    except IRError as e:
+        print(f"✗ {e}", file=sys.stderr)
+        return 1
+    for warning in warnings:
+        print(f"⚠ {warning}")
+    for fn in stats:
+        print(f"  {fn['function']}: {fn['instructions']} instrucciones, {fn['blocks']} bloques, "
+              f"{fn['iterations']} iteraciones, {fn['elapsed'] * 1e3:.2f} ms")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
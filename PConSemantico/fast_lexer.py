@@ -0,0 +1,212 @@
+# fast_lexer.py
+# Backend alternativo del lexer: las mismas reglas t_* de CPPLexer, compiladas
+# una sola vez por proceso en una expresión maestra y recorridas con finditer,
+# sin pasar por lex.Lexer.token ni construir un LexToken por token.
+#
+#   lexer = FastCPPLexer(quiet=True)
+#   lexer.tokenize_tuples(codigo)   # [(tipo, valor, línea, posición)]
+#   lexer.tokenize(codigo)          # [LexToken], como CPPLexer.tokenize
+#   parser.parse_tokens(lexer.iter_tokens(codigo))
+#
+# La expresión se construye como la de PLY: primero las reglas que son
+# funciones, en orden de definición, y después las cadenas de más larga a más
+# corta. Lo que hacen las funciones (convertir el valor, contar líneas,
+# descartar comentarios) está en _ACTIONS: una regla nueva en CPPLexer debe
+# añadirse ahí o la compilación falla.
+
+import re
+from types import MappingProxyType
+
+from ply.lex import LexToken
+
+from lexer_cpp import (STREAM_CHUNK_SIZE, CPPLexer, _PIECE_CODE, _PIECE_COMMENT, _PIECE_OPEN,
+                       _stream_pieces)
+
+# Acciones especiales; las demás son conversiones texto -> valor
+_SKIP = 'skip'
+_NEWLINES = 'newlines'     # \n+: avanza la línea
+_COMMENT = 'comment'       # /* */: se descarta y avanza la línea
+
+
+def _unescape(text):
+    return bytes(text[1:-1], "utf-8").decode("unicode_escape")
+
+
+_ACTIONS = {
+    'FLOAT_NUM': lambda text: float(text.rstrip('fF')),
+    'NUMBER': lambda text: int(text, 0),
+    'STRING_LITERAL': _unescape,
+    'CHAR_LITERAL': _unescape,
+    'COMMENT_MULTI': _COMMENT,
+    'COMMENT_SINGLE': _SKIP,
+    'newline': _NEWLINES,
+}
+
+
+class _Compiled:
+    """Expresión maestra de una clase de reglas y la acción de cada grupo"""
+
+    __slots__ = ('scanner', 'kinds', 'actions', 'id_group', 'keywords', 'keyword_type')
+
+    def __init__(self, rules):
+        functions = []
+        strings = []
+        for name in dir(rules):  # dir() ordena por nombre, como en PLY
+            if not name.startswith('t_') or name in ('t_ignore', 't_error', 't_eof'):
+                continue
+            rule = getattr(rules, name)
+            if callable(rule):
+                functions.append((rule.__code__.co_firstlineno, name[2:], rule.__doc__))
+            else:
+                strings.append((name[2:], rule))
+        functions.sort()
+        strings.sort(key=lambda item: len(item[1]), reverse=True)
+
+        parts = []
+        for _, name, pattern in functions:
+            if name != 'ID' and name not in _ACTIONS:
+                raise ValueError(f"La regla t_{name} no tiene acción en fast_lexer._ACTIONS")
+            parts.append(f"(?P<{name}>{pattern})")
+        parts.extend(f"(?P<{name}>{pattern})" for name, pattern in strings)
+        # Los caracteres de t_ignore van como prefijo de cada coincidencia en vez
+        # de como un token más: una vuelta del bucle menos por cada hueco. Un
+        # carácter que no encaja en ninguna regla (y no se ignora) es un error.
+        ignore = ''.join(re.escape(c) for c in getattr(rules, 't_ignore', ''))
+        if ignore:
+            parts.append(f"(?P<_error>[^{ignore}])")
+            prefix = f"[{ignore}]*"
+        else:
+            parts.append(r"(?P<_error>[\s\S])")
+            prefix = ''
+        # re.VERBOSE, como lex.lex por defecto
+        master = re.compile(prefix + "(?:" + "|".join(parts) + ")", re.VERBOSE)
+
+        groups = master.groups + 1
+        self.kinds = [None] * groups     # tipo de los tokens cuyo valor es el texto
+        self.actions = [None] * groups   # conversión o acción especial de los demás
+        for name, index in master.groupindex.items():
+            if name == 'ID':
+                self.id_group = index
+            elif name in _ACTIONS:
+                self.actions[index] = _ACTIONS[name]
+            elif name != '_error':
+                self.kinds[index] = name
+        self.scanner = master.finditer
+        # Las palabras reservadas se consultan en un dict propio (el get de un
+        # MappingProxyType es bastante más lento); hacia fuera solo se expone
+        # la vista de solo lectura
+        reserved = dict(rules.reserved)
+        self.keywords = MappingProxyType(reserved)
+        self.keyword_type = reserved.get
+
+
+_compiled = {}
+
+
+def compiled_rules(rules=CPPLexer):
+    """Reglas compiladas de una clase de lexer (una vez por proceso)"""
+    result = _compiled.get(rules)
+    if result is None:
+        result = _compiled[rules] = _Compiled(rules)
+    return result
+
+
+class FastCPPLexer:
+    """Lexer con la interfaz de CPPLexer (tokenize, iter_tokens, errors, reset)
+    y además tokenize_tuples/iter_tuples, que devuelven tuplas
+    (tipo, valor, línea, posición) en lugar de LexToken."""
+
+    rules = CPPLexer
+    tokens = CPPLexer.tokens
+    reserved = CPPLexer.reserved
+
+    def __init__(self, quiet=False):
+        self.quiet = quiet
+        self.errors = []
+        self.lineno = 1
+        self._rules = compiled_rules(self.rules)
+
+    def reset(self):
+        self.errors = []
+        self.lineno = 1
+
+    # ---------- TUPLAS ----------
+    def tokenize_tuples(self, source):
+        self.reset()
+        return self._scan(source, 0)
+
+    def iter_tuples(self, source, chunk_size=STREAM_CHUNK_SIZE):
+        """Como CPPLexer.iter_tokens: `source` puede ser un str, un archivo o un
+        mmap, que se lee por bloques cortados en saltos de línea seguros
+        (lexer_cpp._stream_pieces)"""
+        self.reset()
+        if isinstance(source, str):
+            yield from self._scan(source, 0)
+            return
+        comment_line = None
+        for kind, value, base in _stream_pieces(source, chunk_size):
+            if kind is _PIECE_CODE:
+                yield from self._scan(value, base)
+            elif kind is _PIECE_OPEN:
+                comment_line = self.lineno
+            elif kind is _PIECE_COMMENT:
+                self.lineno += value
+            else:  # mismo mensaje que CPPLexer.iter_tokens
+                msg = f"Comentario sin cerrar en línea {comment_line}"
+                if not self.quiet:
+                    print(msg)
+                self.errors.append(msg)
+
+    # ---------- LEXTOKEN ----------
+    def tokenize(self, source):
+        return [_lextoken(*tok) for tok in self.tokenize_tuples(source)]
+
+    def iter_tokens(self, source, chunk_size=STREAM_CHUNK_SIZE):
+        for tok in self.iter_tuples(source, chunk_size):
+            yield _lextoken(*tok)
+
+    # ---------- BUCLE PRINCIPAL ----------
+    def _scan(self, text, base):
+        rules = self._rules
+        kinds = rules.kinds
+        actions = rules.actions
+        id_group = rules.id_group
+        keyword = rules.keyword_type
+        line = self.lineno
+        out = []
+        append = out.append
+        for m in rules.scanner(text):
+            i = m.lastindex
+            if i == id_group:
+                value = m.group(i)
+                append((keyword(value, 'ID'), value, line, base + m.start(i)))
+                continue
+            kind = kinds[i]
+            if kind is not None:
+                append((kind, m.group(i), line, base + m.start(i)))
+                continue
+            action = actions[i]
+            if action is _NEWLINES:
+                line += m.end() - m.start(i)
+            elif action is _COMMENT:
+                line += m.group(i).count('\n')
+            elif action is _SKIP:
+                pass
+            elif action is not None:
+                append((m.lastgroup, action(m.group(i)), line, base + m.start(i)))
+            else:  # _error: mismo mensaje que CPPLexer.t_error
+                msg = f"Carácter ilegal {m.group(i)!r} en línea {line}"
+                if not self.quiet:
+                    print(msg)
+                self.errors.append(msg)
+        self.lineno = line
+        return out
+
+
+def _lextoken(kind, value, line, pos):
+    tok = LexToken()
+    tok.type = kind
+    tok.value = value
+    tok.lineno = line
+    tok.lexpos = pos
+    return tok
@@ -0,0 +1,279 @@
+# incremental.py
+# Re-análisis incremental para el editor: tras una edición solo se vuelven a
+# lexear y parsear las declaraciones de alto nivel (FUN_DEF / VAR_DECL) que toca,
+# y el análisis semántico se repite solo para ellas.
+#
+# El texto se divide en segmentos contiguos, uno por declaración de alto nivel:
+# un segmento termina en un ';' fuera de llaves o en la '}' que cierra el nivel
+# superior (ninguno de los dos puede formar parte de un token más largo). Cada
+# segmento es un programa válido por sí solo, así que se parsea aislado con el
+# CPPParser normal. Los símbolos globales que define cada segmento se guardan y
+# se reutilizan para los segmentos que no cambian.
+#
+# Un segmento con un /* o una comilla sin cerrar depende del texto posterior:
+# una edición más adelante puede cerrarlo. Por eso se marca (Segment.unclosed)
+# y una edición vuelve a lexear desde el primer segmento marcado anterior a ella.
+
+from bisect import bisect_right
+
+from lexer_cpp import _CHAR, _SPECIAL, _STRING
+from parser_cpp import ASTNode, CPPParser
+from semantic_analyzer import SemanticAnalyzer, SymbolTable, build_signature_index
+from ast_visitor import walk
+
+
+class Segment:
+    """Una declaración de alto nivel: texto [start, end), nodos y diagnósticos"""
+
+    __slots__ = ('start', 'end', 'line', 'nodes', 'lexical_errors', 'syntax_errors',
+                 'semantic_errors', 'globals', 'line_delta', 'dirty', 'unclosed')
+
+    def __init__(self, start, end, line):
+        self.start = start
+        self.end = end
+        self.line = line                # línea de `start` (base 1)
+        self.nodes = []                 # hijos del PROGRAM del segmento
+        self.lexical_errors = []
+        self.syntax_errors = []
+        self.semantic_errors = []
+        self.globals = []               # [(nombre, símbolo)] definidos en el ámbito global
+        self.line_delta = 0             # desplazamiento de líneas pendiente en los nodos
+        self.dirty = True               # requiere análisis semántico
+        self.unclosed = False           # termina dentro de un /* o literal sin cerrar
+
+    def declared(self):
+        """Firmas globales que declara (nombre, tipo), según el AST"""
+        sig = []
+        for node in self.nodes:
+            if node.type == 'FUN_DEF':
+                sig.append((node.value, f"function_{node.children[0].value}"))
+            elif node.type == 'VAR_DECL':
+                base = node.children[0].value
+                sig.extend((init.value, base) for init in node.children[1:])
+        return sig
+
+    def functions(self):
+        """Firmas de sus FUN_DEF, como en build_signature_index"""
+        return [(name, sig) for name, sig in build_signature_index(self.nodes).items()]
+
+
+class IncrementalAnalyzer:
+    """Mantiene el análisis de un documento y lo actualiza edición a edición.
+
+        inc = IncrementalAnalyzer(texto)
+        inc.edit(inicio, fin, nuevo)   # sustituye texto[inicio:fin]
+        inc.diagnostics()              # errores léxicos, sintácticos y semánticos
+        inc.ast                        # PROGRAM con los nodos de todos los segmentos
+    """
+
+    def __init__(self, text='', parser=None, analyzer=None):
+        self.parser = parser or CPPParser(quiet=True)
+        self.analyzer = analyzer or SemanticAnalyzer()
+        self.text = ''
+        self.segments = []
+        self.signatures = {}  # índice de firmas de todo el documento
+        self.stats = {'edits': 0, 'reparsed': 0, 'rechecked': 0}
+        self.set_text(text)
+
+    # ---------- API ----------
+    def set_text(self, text):
+        """Análisis completo del documento"""
+        self.text = text
+        self.segments = [self._parse_segment(*seg) for seg in self._scan(0, 1)]
+        self.signatures = self._signature_index()
+        self._check(0, all_segments=True)
+        return self.diagnostics()
+
+    def edit(self, start, end, new_text):
+        """Sustituye text[start:end] por new_text y actualiza los diagnósticos"""
+        old_text = self.text
+        if not 0 <= start <= end <= len(old_text):
+            raise ValueError(f"Rango de edición inválido: {start}..{end}")
+        self.text = old_text[:start] + new_text + old_text[end:]
+        delta = len(new_text) - (end - start)
+        line_delta = new_text.count('\n') - old_text.count('\n', start, end)
+        self.stats['edits'] += 1
+
+        segments = self.segments
+        starts = [seg.start for seg in segments]
+        first = max(bisect_right(starts, start) - 1, 0)
+        last = max(bisect_right(starts, end) - 1, first)   # último segmento tocado
+        # La edición puede cerrar un comentario o literal abierto antes
+        for i in range(first):
+            if segments[i].unclosed:
+                first = i
+                break
+        new_end = end + delta
+
+        # Se vuelve a lexear desde el primer segmento tocado hasta que un corte
+        # coincide con un corte antiguo posterior a la edición
+        old_boundaries = {seg.start: i for i, seg in enumerate(segments[last + 1:], last + 1)}
+        fresh = []
+        resume = len(segments)
+        for bounds in self._scan(segments[first].start, segments[first].line):
+            fresh.append(self._parse_segment(*bounds))
+            seg_end = bounds[1]
+            if seg_end >= new_end and seg_end - delta in old_boundaries:
+                resume = old_boundaries[seg_end - delta]
+                break
+
+        old_sig = [s for seg in segments[first:resume] for s in seg.declared()]
+        new_sig = [s for seg in fresh for s in seg.declared()]
+        old_funcs = [f for seg in segments[first:resume] for f in seg.functions()]
+        new_funcs = [f for seg in fresh for f in seg.functions()]
+        tail = segments[resume:]
+        for seg in tail:
+            seg.start += delta
+            seg.end += delta
+            if line_delta:
+                seg.line += line_delta
+                seg.line_delta += line_delta
+        self.segments = segments[:first] + fresh + tail
+        self.stats['reparsed'] += len(fresh)
+
+        # Los mensajes léxicos/sintácticos llevan número de línea: se regeneran
+        if line_delta:
+            for i in range(first + len(fresh), len(self.segments)):
+                seg = self.segments[i]
+                if seg.lexical_errors or seg.syntax_errors:
+                    semantic, globals_, dirty = seg.semantic_errors, seg.globals, seg.dirty
+                    seg = self.segments[i] = self._parse_segment(seg.start, seg.end, seg.line, None)
+                    seg.semantic_errors, seg.globals, seg.dirty = semantic, globals_, dirty
+
+        # Si cambian los símbolos globales declarados, los segmentos siguientes
+        # pueden dar otros errores y se revisan todos; si cambia alguna firma de
+        # función, también los anteriores (las llamadas pueden ir hacia delante)
+        if old_funcs != new_funcs:
+            self.signatures = self._signature_index()
+            self._check(0, all_segments=True)
+        else:
+            self._check(first, all_segments=old_sig != new_sig)
+        return self.diagnostics()
+
+    def diagnostics(self):
+        return {
+            'lexical_errors': [e for seg in self.segments for e in seg.lexical_errors],
+            'syntax_errors': [e for seg in self.segments for e in seg.syntax_errors],
+            'semantic_errors': [e for seg in self.segments for e in seg.semantic_errors],
+        }
+
+    @property
+    def ast(self):
+        """PROGRAM del documento; aplica los desplazamientos de línea pendientes"""
+        children = []
+        for seg in self.segments:
+            if seg.line_delta:
+                _shift_lines(seg.nodes, seg.line_delta)
+                seg.line_delta = 0
+            children.extend(seg.nodes)
+        return ASTNode('PROGRAM', children=children)
+
+    def _signature_index(self):
+        return build_signature_index(node for seg in self.segments for node in seg.nodes)
+
+    # ---------- SEGMENTACIÓN ----------
+    def _scan(self, pos, line):
+        """Genera (start, end, line, tokens) de los segmentos a partir de `pos`"""
+        text = self.text
+        cpp_lexer = self.parser.lexer
+        lexer = cpp_lexer.lexer
+        lexer.input(text)
+        lexer.lexpos = pos
+        lexer.lineno = line
+        cpp_lexer.errors = []
+        start = pos
+        depth = 0
+        tokens = []
+        for tok in iter(lexer.token, None):
+            tokens.append(tok)
+            kind = tok.type
+            if kind == 'LBRACE':
+                depth += 1
+                continue
+            if kind == 'RBRACE':
+                depth = max(depth - 1, 0)
+            elif kind != 'SEMICOLON' or depth:
+                continue
+            if depth == 0:
+                end = tok.lexpos + 1
+                yield start, end, line, tokens
+                # La línea se cuenta en el texto y no con tok.lineno, que no avanza
+                # dentro de un literal con saltos: así no depende de dónde empezó el lexeo
+                start, line, tokens = end, line + text.count('\n', start, end), []
+                # el consumidor puede haber usado el lexer: se restaura la posición
+                lexer.input(text)
+                lexer.lexpos = end
+                lexer.lineno = line
+        if start < len(text) or not tokens and start == pos:
+            yield start, len(text), line, tokens
+
+    def _parse_segment(self, start, end, line, tokens):
+        seg = Segment(start, end, line)
+        cpp_lexer = self.parser.lexer
+        if tokens is None:  # volver a lexear solo este segmento
+            lexer = cpp_lexer.lexer
+            lexer.input(self.text[:end])
+            lexer.lexpos = start
+            lexer.lineno = line
+            saved, cpp_lexer.errors = cpp_lexer.errors, []
+            tokens = list(iter(lexer.token, None))
+            seg.lexical_errors, cpp_lexer.errors = cpp_lexer.errors, saved
+        else:
+            seg.lexical_errors = cpp_lexer.errors
+            cpp_lexer.errors = []
+        seg.unclosed = _unclosed(self.text, start, end)
+        program = self.parser.parse_tokens(tokens)
+        seg.syntax_errors = list(self.parser.errors)
+        seg.nodes = list(program.children) if program else []
+        return seg
+
+    # ---------- ANÁLISIS SEMÁNTICO ----------
+    def _check(self, first, all_segments=False):
+        """Revisa los segmentos sucios (o todos desde `first`) reutilizando los
+        símbolos globales ya conocidos del resto"""
+        table = SymbolTable()
+        lookup = table.lookup
+        for i, seg in enumerate(self.segments):
+            if seg.dirty or (all_segments and i >= first):
+                fresh = [name for name, _ in seg.declared() if lookup(name) is None]
+                seg.semantic_errors = []
+                for node in seg.nodes:
+                    seg.semantic_errors.extend(self.analyzer.analyze_declaration(node, table, self.signatures))
+                seg.globals = [(name, lookup(name)) for name in dict.fromkeys(fresh) if lookup(name) is not None]
+                seg.dirty = False
+                self.stats['rechecked'] += 1
+            else:
+                for name, symbol in seg.globals:
+                    table.bind(name, symbol)
+
+
+def _unclosed(text, pos, end):
+    """¿Queda en text[pos:end] un /* o una comilla sin su cierre? Mismo recorrido
+    que lexer_cpp._safe_cut: los comentarios y literales completos se saltan"""
+    while True:
+        m = _SPECIAL.search(text, pos, end)
+        if not m:
+            return False
+        kind = m.group()
+        if kind == '/*':
+            close = text.find('*/', m.end(), end)
+            if close < 0:
+                return True
+            pos = close + 2
+        elif kind == '//':
+            pos = text.find('\n', m.end(), end)
+            if pos < 0:
+                return False
+        else:
+            lit = (_STRING if kind == '"' else _CHAR).match(text, m.start(), end)
+            if not lit:
+                return True
+            pos = lit.end()
+
+
+def _shift_lines(nodes, delta):
+    def enter(node, _):
+        if node.line is not None:
+            node.line += delta
+
+    walk(nodes, enter)
@@ -0,0 +1,801 @@
+# ir.py
+# Representación intermedia de tres direcciones: traduce el AST ya comprobado
+# por SemanticAnalyzer a bloques básicos con su grafo de flujo de control, para
+# que los análisis de flujo de datos y la generación de código recorran listas
+# lineales de instrucciones en lugar de volver a recorrer el árbol.
+#
+# Cada bloque guarda sus instrucciones en un array('i') de cuádruplas
+# (op, a, b, c); las que producen un valor lo dejan en a (a = b op c). Los
+# operandos son enteros con la clase en los dos bits bajos: registro de la
+# función (variable local, parámetro o temporal), constante del módulo o
+# variable global. Los registros no son SSA: una variable se asigna tantas
+# veces como en el código fuente, y una declaración local sin inicializador
+# genera UNDEF (la variable queda indefinida hasta su primera asignación, y
+# los análisis de flujo de datos lo ven). Las conversiones int <-> float son
+# instrucciones explícitas.
+#
+#   python ir.py programa.cpp
+
+import sys
+from array import array
+
+from ast_visitor import DispatchTable, evaluate
+from bytecode import K_BOOL, K_CHAR, K_FLOAT, K_INT, K_STR
+from semantic_analyzer import SymbolTable
+
+# ---------- INSTRUCCIONES ----------
+OPS = (
+    'COPY', 'ADD', 'SUB', 'MUL', 'DIV', 'FDIV', 'MOD',
+    'LT', 'GT', 'LE', 'GE', 'EQ', 'NE',
+    'NEG', 'NOT', 'TO_INT', 'TO_FLOAT', 'TO_BOOL',
+    'PARAM', 'CALL', 'PRINT', 'READ', 'UNDEF',
+    'JUMP', 'BRANCH', 'RETURN',
+)
+(COPY, ADD, SUB, MUL, DIV, FDIV, MOD,
+ LT, GT, LE, GE, EQ, NE,
+ NEG, NOT, TO_INT, TO_FLOAT, TO_BOOL,
+ PARAM, CALL, PRINT, READ, UNDEF,
+ JUMP, BRANCH, RETURN) = range(len(OPS))
+
+#   COPY      a = b                 PARAM   param a (argumento de la siguiente CALL)
+#   ADD..NE   a = b op c            CALL    a = función nº b con c argumentos
+#   NEG..     a = op b              PRINT   cout << a (formato b: K_INT, K_STR...)
+#   JUMP      goto bloque a         READ    cin >> a (formato b)
+#   BRANCH    si a: bloque b; si no, bloque c      UNDEF   a = indefinido
+#   RETURN    return a (NONE en funciones void)
+BINARY = frozenset({ADD, SUB, MUL, DIV, FDIV, MOD, LT, GT, LE, GE, EQ, NE})
+UNARY = frozenset({COPY, NEG, NOT, TO_INT, TO_FLOAT, TO_BOOL})
+TERMINATORS = frozenset({JUMP, BRANCH, RETURN})
+# Instrucciones cuyo campo a es el destino
+DEFINES = frozenset(BINARY | UNARY | {CALL, READ, UNDEF})
+# Desplazamiento (1 = a, 2 = b, 3 = c) de los campos que son operandos leídos
+USE_FIELDS = {op: (2, 3) for op in BINARY}
+USE_FIELDS.update({op: (2,) for op in UNARY})
+USE_FIELDS.update({PARAM: (1,), PRINT: (1,), BRANCH: (1,), RETURN: (1,),
+                   CALL: (), READ: (), UNDEF: (), JUMP: ()})
+
+# ---------- OPERANDOS ----------
+REG, CONST, GLOBAL = range(3)
+NONE = -1  # campo sin usar (o return sin valor)
+
+
+def reg(index):
+    return index << 2
+
+
+def const_operand(index):
+    return index << 2 | CONST
+
+
+def global_operand(index):
+    return index << 2 | GLOBAL
+
+
+def operand_kind(operand):
+    return operand & 3
+
+
+def operand_index(operand):
+    return operand >> 2
+
+
+# Tipos de los registros (un byte por registro)
+TYPES = ('int', 'float', 'char', 'boolean', 'string', 'void')
+_TYPE_CODES = {name: code for code, name in enumerate(TYPES)}
+_TYPE_CODES['double'] = _TYPE_CODES['float']
+
+_KINDS = {'int': K_INT, 'float': K_FLOAT, 'double': K_FLOAT, 'char': K_CHAR,
+          'boolean': K_BOOL, 'string': K_STR}
+_ARITHMETIC = {'+': ADD, '-': SUB, '*': MUL, '%': MOD}
+_COMPARISONS = {'<': LT, '>': GT, '<=': LE, '>=': GE, '==': EQ, '!=': NE}
+
+
+class IRError(Exception):
+    pass
+
+
+class BasicBlock:
+    """Secuencia de instrucciones que termina en JUMP, BRANCH o RETURN"""
+
+    __slots__ = ('index', 'code', 'lines', 'succs', 'preds')
+
+    def __init__(self, index):
+        self.index = index
+        self.code = array('i')    # cuádruplas (op, a, b, c)
+        self.lines = array('i')   # línea de origen de cada instrucción (0 si no tiene)
+        self.succs = []           # índices de los bloques sucesores
+        self.preds = []
+
+    def __len__(self):
+        return len(self.lines)
+
+    def append(self, op, a=NONE, b=NONE, c=NONE, line=0):
+        self.code.extend((op, a, b, c))
+        self.lines.append(line or 0)
+
+    def instructions(self):
+        """Genera (op, a, b, c, línea)"""
+        code = self.code
+        for i, line in enumerate(self.lines):
+            k = i * 4
+            yield code[k], code[k + 1], code[k + 2], code[k + 3], line
+
+
+class Function:
+    """Bloques de una función; blocks[0] es la entrada. Los registros
+    0..n_params-1 son los parámetros"""
+
+    __slots__ = ('name', 'return_type', 'n_params', 'blocks', 'reg_names', 'reg_types', 'reg_lines')
+
+    def __init__(self, name, return_type):
+        self.name = name
+        self.return_type = return_type
+        self.n_params = 0
+        self.blocks = []
+        self.reg_names = []           # nombre de cada variable; None en los temporales
+        self.reg_types = array('b')   # código de TYPES
+        self.reg_lines = array('i')   # línea de la declaración (0 en los temporales)
+
+    def new_register(self, name, reg_type, line=0):
+        self.reg_names.append(name)
+        self.reg_types.append(_TYPE_CODES.get(reg_type, _TYPE_CODES['int']))
+        self.reg_lines.append(line or 0)
+        return reg(len(self.reg_names) - 1)
+
+    @property
+    def n_registers(self):
+        return len(self.reg_names)
+
+    def variables(self):
+        """Índices de los registros que son variables del programa (no temporales)"""
+        return [i for i, name in enumerate(self.reg_names) if name is not None]
+
+    def register_type(self, index):
+        return TYPES[self.reg_types[index]]
+
+    def instruction_count(self):
+        return sum(len(block) for block in self.blocks)
+
+
+class Module:
+    """Resultado de IRBuilder.lower: init inicializa las globales en orden"""
+
+    __slots__ = ('functions', 'init', 'consts', 'global_names', 'global_types')
+
+    def __init__(self):
+        self.functions = []       # Function en el orden del índice de CALL
+        self.init = None
+        self.consts = []
+        self.global_names = []
+        self.global_types = []
+
+    def all_functions(self):
+        return [self.init, *self.functions]
+
+    def function(self, name):
+        for fn in self.functions:
+            if fn.name == name:
+                return fn
+        return None
+
+
+class IRBuilder:
+    """AST comprobado -> Module. Como en BytecodeCompiler, los manejadores
+    lower_* son generadores (`yield hijo` traduce el hijo y devuelve su
+    (operando, tipo)), así que la profundidad del AST no usa la recursión."""
+
+    def __init__(self):
+        self._dispatch = DispatchTable(self, 'lower_', self._unsupported)
+        self._reset()
+
+    def _reset(self):
+        self.module = Module()
+        self._const_index = {}
+        self._signatures = {}     # nombre -> (índice, tipo de retorno, tipos de parámetros)
+        self._globals = {}        # nombre -> (índice, tipo, posición de la declaración)
+        self._position = 0
+        self._function = None
+        self._table = None        # locales de la función actual (símbolo value = operando)
+        self._used_names = {}
+        self._block = None
+        self._started = []        # bloques en el orden en que empiezan
+
+    # ---------- API ----------
+    def lower(self, ast):
+        if ast is None or ast.type != 'PROGRAM':
+            raise IRError("Se esperaba un PROGRAM")
+        self._reset()
+        module = self.module
+        decls = ast.children
+        for node in decls:
+            if node.type == 'FUN_DEF' and node.value not in self._signatures:
+                params = tuple(p.children[0].value for p in node.children[1])
+                self._signatures[node.value] = (len(self._signatures), node.children[0].value, params)
+                module.functions.append(None)
+
+        module.init = self._begin_function('<globales>', 'void')
+        for pos, node in enumerate(decls):
+            self._position = pos
+            if node.type == 'VAR_DECL':
+                self._run(node)
+            elif node.type != 'FUN_DEF':
+                raise IRError(f"Declaración no soportada: {node.type}")
+        self._end_function()
+
+        for pos, node in enumerate(decls):
+            if node.type == 'FUN_DEF':
+                self._position = pos
+                self._run(node)
+        module.global_names = list(self._globals)
+        module.global_types = [glob[1] for glob in self._globals.values()]
+        return module
+
+    # ---------- BLOQUES ----------
+    def _begin_function(self, name, return_type):
+        fn = self._function = Function(name, return_type)
+        self._used_names = {}
+        self._started = []
+        self.start_block(self.new_block())
+        return fn
+
+    def new_block(self):
+        blocks = self._function.blocks
+        blocks.append(BasicBlock(len(blocks)))
+        return blocks[-1]
+
+    def start_block(self, block):
+        """Continúa en `block`; el bloque actual, si no terminó, salta a él"""
+        if self._block is not None:
+            self._block.append(JUMP, block.index)
+        self._block = block
+        self._started.append(block)
+
+    def emit(self, op, a=NONE, b=NONE, c=NONE, line=0):
+        if self._block is None:  # código tras un salto o return: bloque inalcanzable
+            self.start_block(self.new_block())
+        self._block.append(op, a, b, c, line)
+        if op in TERMINATORS:
+            self._block = None
+
+    def jump(self, block):
+        """Salto a `block` si el bloque actual no terminó ya"""
+        if self._block is not None:
+            self.emit(JUMP, block.index)
+
+    def _end_function(self):
+        fn = self._function
+        if self._block is not None:
+            ret_type = fn.return_type
+            value = NONE if ret_type == 'void' else self.const(0.0 if ret_type in ('float', 'double') else 0)
+            self._block.append(RETURN, value)
+        self._block = None
+        _build_cfg(fn, self._started)
+        self._function = None
+        return fn
+
+    # ---------- OPERANDOS ----------
+    def const(self, value):
+        key = (type(value), value)
+        index = self._const_index.get(key)
+        if index is None:
+            index = self._const_index[key] = len(self.module.consts)
+            self.module.consts.append(value)
+        return const_operand(index)
+
+    def temp(self, temp_type):
+        return self._function.new_register(None, temp_type)
+
+    def convert(self, operand, src, dst, line=0):
+        """Operando con la conversión implícita de src a dst"""
+        if dst in ('int', 'char') and src in ('float', 'double', 'boolean'):
+            op, cast, result = TO_INT, int, 'int'
+        elif dst in ('float', 'double') and src in ('int', 'char', 'boolean'):
+            op, cast, result = TO_FLOAT, float, 'float'
+        else:
+            return operand
+        if operand_kind(operand) == CONST:  # se convierte ya
+            return self.const(cast(self.module.consts[operand_index(operand)]))
+        target = self.temp(result)
+        self.emit(op, target, operand, line=line)
+        return target
+
+    def assign(self, target, value, line=0):
+        """target = value; si value es el temporal que acaba de calcularse, la
+        instrucción que lo define escribe directamente en target"""
+        code = self._block.code if self._block is not None else ()
+        fn = self._function
+        if (len(code) >= 4 and code[-3] == value and code[-4] in DEFINES
+                and operand_kind(value) == REG and fn.reg_names[operand_index(value)] is None):
+            code[-3] = target
+            return
+        self.emit(COPY, target, value, line=line)
+
+    def _run(self, node):
+        return evaluate(node, self._dispatch, self._lower_list)
+
+    def _lower_list(self, nodes):
+        for item in nodes:
+            yield item
+
+    def _unsupported(self, node):
+        raise IRError(f"Construcción no soportada por el IR: {node.type} (línea {node.line})")
+
+    def _statement(self, node):
+        if node is not None:
+            yield node
+
+    # ---------- VARIABLES ----------
+    def _lookup(self, name, line):
+        """(operando, tipo)"""
+        if self._table is not None:
+            sym = self._table.lookup(name)
+            if sym is not None:
+                return sym['value'], sym['type']
+        glob = self._globals.get(name)
+        if glob is not None and glob[2] <= self._position:  # declarada antes de este punto
+            return global_operand(glob[0]), glob[1]
+        raise IRError(f"Variable '{name}' no declarada (línea {line})")
+
+    def _declare(self, name, var_type, line):
+        if self._table is None:
+            if name in self._globals:
+                raise IRError(f"Identificador '{name}' ya está definido en este ámbito")
+            self._globals[name] = (len(self._globals), var_type, self._position)
+            return global_operand(len(self._globals) - 1)
+        # Las variables ocultadas reciben otro nombre: x, x.1, x.2...
+        count = self._used_names.get(name, 0)
+        self._used_names[name] = count + 1
+        operand = self._function.new_register(f"{name}.{count}" if count else name, var_type, line)
+        self._table.define(name, var_type, operand)
+        return operand
+
+    def _is_declared(self, name):
+        try:
+            self._lookup(name, None)
+        except IRError:
+            return False
+        return True
+
+    # ---------- DECLARACIONES ----------
+    def lower_var_decl(self, node):
+        base_type = node.children[0].value
+        for init in node.children[1:]:
+            # Como en SemanticAnalyzer, el nombre ya es visible en su inicializador
+            target = self._declare(init.value, base_type, init.line)
+            if init.children:
+                value, value_type = yield init.children[0]
+                self.assign(target, self.convert(value, value_type, base_type, init.line), init.line)
+            elif operand_kind(target) == GLOBAL:  # las globales empiezan a cero
+                self.emit(COPY, target, self.const(0.0 if base_type in ('float', 'double') else 0),
+                          line=init.line)
+            else:
+                self.emit(UNDEF, target, line=init.line)
+
+    def lower_fun_def(self, node):
+        index, ret_type, _ = self._signatures[node.value]
+        if self.module.functions[index] is not None:
+            raise IRError(f"Identificador '{node.value}' ya está definido en este ámbito")
+        fn = self._begin_function(node.value, ret_type)
+        self._table = SymbolTable()
+        params = node.children[1]
+        for param in params:
+            self._declare(param.value, param.children[0].value, param.line)
+        fn.n_params = len(params)
+        yield node.children[2]
+        self._table = None
+        self.module.functions[index] = self._end_function()
+
+    # ---------- SENTENCIAS ----------
+    def lower_block(self, node):
+        self._table.push_scope()
+        for child in node.children:
+            yield from self._statement(child)
+        self._table.pop_scope()
+
+    def lower_empty(self, node):
+        return None
+
+    def lower_if(self, node):
+        cond, _ = yield node.children[0]
+        then_block = self.new_block()
+        else_block = self.new_block() if len(node.children) > 2 else None
+        end = self.new_block()
+        self.emit(BRANCH, cond, then_block.index, (end if else_block is None else else_block).index, line=node.line)
+        self.start_block(then_block)
+        yield from self._statement(node.children[1])
+        if else_block is not None:
+            self.jump(end)
+            self.start_block(else_block)
+            yield from self._statement(node.children[2])
+        self.start_block(end)
+
+    def lower_while(self, node):
+        header = self.new_block()
+        self.start_block(header)
+        cond, _ = yield node.children[0]
+        body = self.new_block()
+        end = self.new_block()
+        self.emit(BRANCH, cond, body.index, end.index, line=node.line)
+        self.start_block(body)
+        yield from self._statement(node.children[1])
+        self.jump(header)
+        self.start_block(end)
+
+    def lower_for(self, node):
+        init, cond, step, body = node.children
+        self._table.push_scope()
+        yield from self._statement(init)
+        header = self.new_block()
+        self.start_block(header)
+        end = self.new_block()
+        if cond is not None:
+            value, _ = yield cond
+            body_block = self.new_block()
+            self.emit(BRANCH, value, body_block.index, end.index, line=node.line)
+            self.start_block(body_block)
+        yield from self._statement(body)
+        yield from self._statement(step)
+        self.jump(header)
+        self.start_block(end)
+        self._table.pop_scope()
+
+    def lower_return(self, node):
+        value = NONE
+        if node.children:
+            value, value_type = yield node.children[0]
+            value = self.convert(value, value_type, self._function.return_type, node.line)
+        elif self._function.return_type != 'void':
+            value = self.const(0)
+        self.emit(RETURN, value, line=node.line)
+
+    def lower_cout(self, node):
+        for item in node.children:
+            if item.type == 'ID' and item.value == 'endl' and not self._is_declared('endl'):
+                self.emit(PRINT, self.const('\n'), K_STR, line=item.line)
+                continue
+            value, value_type = yield item
+            self.emit(PRINT, value, _KINDS.get(value_type, K_INT), line=item.line)
+
+    def lower_cin(self, node):
+        for target in node.children:
+            if target.type != 'ID':
+                raise IRError(f"cin necesita una variable (línea {target.line})")
+            operand, var_type = self._lookup(target.value, target.line)
+            self.emit(READ, operand, _KINDS.get(var_type, K_INT), line=target.line)
+
+    # ---------- EXPRESIONES ----------
+    def lower_assign(self, node):
+        target_node = node.children[0]
+        target, var_type = self._lookup(target_node.value, target_node.line)
+        value, value_type = yield node.children[1]
+        self.assign(target, self.convert(value, value_type, var_type, node.line), node.line)
+        return target, var_type
+
+    def lower_binop(self, node):
+        op = node.value
+        line = node.line
+        if op in ('&&', '||'):
+            # Cortocircuito: el resultado (0/1) se asigna en las dos ramas
+            left, _ = yield node.children[0]
+            result = self.temp('boolean')
+            self.emit(TO_BOOL, result, left, line=line)
+            rhs = self.new_block()
+            end = self.new_block()
+            if op == '&&':
+                self.emit(BRANCH, result, rhs.index, end.index, line=line)
+            else:
+                self.emit(BRANCH, result, end.index, rhs.index, line=line)
+            self.start_block(rhs)
+            right, _ = yield node.children[1]
+            self.emit(TO_BOOL, result, right, line=line)
+            self.start_block(end)
+            return result, 'boolean'
+        left, left_type = yield node.children[0]
+        right, right_type = yield node.children[1]
+        numeric = 'float' if {left_type, right_type} & {'float', 'double'} else 'int'
+        # Operandos del mismo tipo: las mezclas int/float se convierten antes
+        if numeric == 'float' and op != '%':
+            left = self.convert(left, left_type, 'float', line)
+            right = self.convert(right, right_type, 'float', line)
+        if op in _COMPARISONS:
+            result_type, code = 'boolean', _COMPARISONS[op]
+        elif op == '/':
+            result_type, code = numeric, DIV if numeric == 'int' else FDIV
+        elif op == '%':
+            result_type, code = 'int', MOD
+        elif op in _ARITHMETIC:
+            result_type, code = numeric, _ARITHMETIC[op]
+        else:
+            raise IRError(f"Operador no soportado: {op}")
+        result = self.temp(result_type)
+        self.emit(code, result, left, right, line=line)
+        return result, result_type
+
+    def lower_unary(self, node):
+        operand, operand_type = yield node.children[0]
+        if node.value == '-':
+            result = self.temp(operand_type)
+            self.emit(NEG, result, operand, line=node.line)
+            return result, operand_type
+        result = self.temp('boolean')
+        self.emit(NOT, result, operand, line=node.line)
+        return result, 'boolean'
+
+    def lower_call(self, node):
+        entry = self._signatures.get(node.value)
+        if entry is None:
+            raise IRError(f"Función '{node.value}' no declarada (línea {node.line})")
+        index, ret_type, params = entry
+        if len(params) != len(node.children):
+            raise IRError(f"La función '{node.value}' espera {len(params)} argumentos, "
+                          f"recibe {len(node.children)}")
+        # Se evalúan todos los argumentos antes de los PARAM (puede haber llamadas anidadas)
+        args = []
+        for arg, param_type in zip(node.children, params):
+            value, value_type = yield arg
+            args.append(self.convert(value, value_type, param_type, node.line))
+        for value in args:
+            self.emit(PARAM, value, line=node.line)
+        result = self.temp(ret_type)
+        self.emit(CALL, result, index, len(args), line=node.line)
+        return result, ret_type
+
+    def lower_id(self, node):
+        return self._lookup(node.value, node.line)
+
+    def lower_number(self, node):
+        return self.const(node.value), 'int'
+
+    def lower_float_num(self, node):
+        return self.const(float(node.value)), 'float'
+
+    def lower_char_literal(self, node):
+        return self.const(ord(node.value)), 'char'
+
+    def lower_string_literal(self, node):
+        return self.const(node.value), 'string'
+
+    def lower_boolean(self, node):
+        return self.const(node.value == 'true'), 'boolean'
+
+
+# =============================================================
+# Grafo de flujo de control
+# =============================================================
+def _targets(block):
+    """Bloques destino de la última instrucción"""
+    code = block.code
+    op = code[-4]
+    if op == JUMP:
+        return [code[-3]]
+    if op == BRANCH:
+        return [code[-2]] if code[-2] == code[-1] else [code[-2], code[-1]]
+    return []
+
+
+def _build_cfg(fn, started):
+    """Deja en fn.blocks solo los bloques alcanzables desde la entrada, en el
+    orden en que empezaron, renumerados, con sucesores y predecesores"""
+    by_index = {block.index: block for block in started}
+    reachable = {started[0].index}
+    stack = [started[0]]
+    while stack:
+        for target in _targets(stack.pop()):
+            if target not in reachable:
+                reachable.add(target)
+                stack.append(by_index[target])
+    blocks = [block for block in started if block.index in reachable]
+    renumber = {block.index: i for i, block in enumerate(blocks)}
+    for i, block in enumerate(blocks):
+        block.index = i
+        code = block.code
+        if code[-4] == JUMP:
+            code[-3] = renumber[code[-3]]
+        elif code[-4] == BRANCH:
+            code[-2] = renumber[code[-2]]
+            code[-1] = renumber[code[-1]]
+    for block in blocks:
+        block.succs = _targets(block)
+        block.preds = []
+    for block in blocks:
+        for succ in block.succs:
+            blocks[succ].preds.append(block.index)
+    fn.blocks = blocks
+
+
+def lower_program(ast):
+    return IRBuilder().lower(ast)
+
+
+# =============================================================
+# Impresión
+# =============================================================
+def format_operand(module, fn, operand):
+    if operand == NONE:
+        return ''
+    kind, index = operand_kind(operand), operand_index(operand)
+    if kind == CONST:
+        return repr(module.consts[index])
+    if kind == GLOBAL:
+        return f"@{module.global_names[index]}"
+    name = fn.reg_names[index]
+    return name if name is not None else f"%{index}"
+
+
+def format_instruction(module, fn, op, a, b, c):
+    def o(x):
+        return format_operand(module, fn, x)
+
+    name = OPS[op]
+    if op == COPY:
+        return f"{o(a)} = {o(b)}"
+    if op in BINARY:
+        return f"{o(a)} = {name.lower()} {o(b)}, {o(c)}"
+    if op in UNARY:
+        return f"{o(a)} = {name.lower()} {o(b)}"
+    if op == CALL:
+        return f"{o(a)} = call {module.functions[b].name}/{c}"
+    if op == READ:
+        return f"read {o(a)}"
+    if op == UNDEF:
+        return f"{o(a)} = undef"
+    if op == JUMP:
+        return f"goto B{a}"
+    if op == BRANCH:
+        return f"if {o(a)} goto B{b} else B{c}"
+    if op == RETURN:
+        return f"return {o(a)}".rstrip()
+    return f"{name.lower()} {o(a)}"  # PARAM, PRINT
+
+
+def format_function(module, fn):
+    params = ', '.join(fn.reg_names[:fn.n_params])
+    lines = [f"{fn.return_type} {fn.name}({params}):"]
+    for block in fn.blocks:
+        preds = f"  ; preds {', '.join(f'B{p}' for p in block.preds)}" if block.preds else ''
+        lines.append(f"  B{block.index}:{preds}")
+        for op, a, b, c, _ in block.instructions():
+            lines.append(f"    {format_instruction(module, fn, op, a, b, c)}")
+    return lines
+
+
+def format_module(module):
+    """Listado legible del IR (una instrucción por línea)"""
+    lines = []
+    for name, var_type in zip(module.global_names, module.global_types):
+        lines.append(f"global {var_type} @{name}")
+    for fn in module.all_functions():
+        if lines:
+            lines.append('')
+        lines.extend(format_function(module, fn))
+    return lines
+
+
+# =============================================================
+# Verificación
+# =============================================================
+def verify(module):
+    """Comprueba la forma del IR; devuelve la lista de errores (vacía si es válido)"""
+    errors = []
+    for fn in module.all_functions():
+        errors.extend(verify_function(module, fn))
+    return errors
+
+
+def verify_function(module, fn):
+    errors = []
+    blocks = fn.blocks
+    n_regs = fn.n_registers
+    limits = {REG: n_regs, CONST: len(module.consts), GLOBAL: len(module.global_names)}
+    defined = set()   # temporales con alguna definición
+    used = []         # (temporal, bloque)
+
+    def where(block):
+        return f"{fn.name}: B{block.index}"
+
+    def check_operand(block, operand, writes=False):
+        if operand == NONE:
+            errors.append(f"{where(block)}: falta un operando")
+            return
+        kind = operand_kind(operand)
+        if kind not in limits or not 0 <= operand_index(operand) < limits[kind]:
+            errors.append(f"{where(block)}: operando inválido {operand}")
+        elif writes and kind == CONST:
+            errors.append(f"{where(block)}: asignación a una constante")
+        elif kind == REG and fn.reg_names[operand_index(operand)] is None:
+            if writes:
+                defined.add(operand)
+            else:
+                used.append((operand, block))
+
+    if not blocks:
+        return [f"{fn.name}: la función no tiene bloques"]
+    if blocks[0].preds:
+        errors.append(f"{fn.name}: el bloque de entrada tiene predecesores")
+    if len(fn.reg_types) != n_regs or len(fn.reg_lines) != n_regs:
+        errors.append(f"{fn.name}: tablas de registros de distinto tamaño")
+    for i, block in enumerate(blocks):
+        if block.index != i:
+            errors.append(f"{where(block)}: índice {block.index} en la posición {i}")
+        if len(block.code) != 4 * len(block.lines):
+            errors.append(f"{where(block)}: código y líneas de distinto tamaño")
+            continue
+        if not len(block):
+            errors.append(f"{where(block)}: bloque vacío")
+            continue
+        pending_params = 0
+        last = len(block) - 1
+        for pos, (op, a, b, c, _) in enumerate(block.instructions()):
+            if not 0 <= op < len(OPS):
+                errors.append(f"{where(block)}: opcode desconocido {op}")
+                continue
+            if (op in TERMINATORS) != (pos == last):
+                errors.append(f"{where(block)}: {OPS[op]} "
+                              f"{'en mitad del bloque' if op in TERMINATORS else 'al final del bloque'}")
+            fields = (op, a, b, c)
+            for k in USE_FIELDS[op]:
+                if op == RETURN and a == NONE:
+                    if fn.return_type != 'void':
+                        errors.append(f"{where(block)}: return sin valor en una función {fn.return_type}")
+                    continue
+                check_operand(block, fields[k])
+            if op in DEFINES:
+                check_operand(block, a, writes=True)
+            if op == PARAM:
+                pending_params += 1
+            elif op == CALL:
+                if not 0 <= b < len(module.functions):
+                    errors.append(f"{where(block)}: función inválida {b}")
+                if c != pending_params:
+                    errors.append(f"{where(block)}: CALL con {c} argumentos tras {pending_params} PARAM")
+                pending_params = 0
+            elif op in (JUMP, BRANCH):
+                for target in ((a,) if op == JUMP else (b, c)):
+                    if not 0 <= target < len(blocks):
+                        errors.append(f"{where(block)}: salto a un bloque inexistente B{target}")
+        if pending_params:
+            errors.append(f"{where(block)}: PARAM sin CALL")
+        if block.code[-4] in TERMINATORS and all(0 <= t < len(blocks) for t in _targets(block)):
+            if block.succs != _targets(block):
+                errors.append(f"{where(block)}: sucesores {block.succs} != {_targets(block)}")
+            for succ in block.succs:
+                if block.index not in blocks[succ].preds:
+                    errors.append(f"{where(block)}: falta en los predecesores de B{succ}")
+    for block in blocks:
+        for pred in block.preds:
+            if not 0 <= pred < len(blocks) or block.index not in blocks[pred].succs:
+                errors.append(f"{where(block)}: predecesor B{pred} sin arco")
+    for operand, block in used:
+        if operand not in defined:
+            errors.append(f"{where(block)}: temporal %{operand_index(operand)} usado sin definir")
+    return errors
+
+
+def main(argv=None):
+    from parser_cpp import CPPParser
+    from semantic_analyzer import SemanticAnalyzer
+
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 1:
+        print("uso: python ir.py programa.cpp", file=sys.stderr)
+        return 2
+    with open(argv[0], encoding='utf-8') as f:
+        code = f.read()
+    parser = CPPParser(quiet=True)
+    ast = parser.parse_stream(code)
+    errors = parser.lexer.errors + parser.errors
+    if not errors:
+        errors = SemanticAnalyzer(endl=True).analyze(ast)[1]
+    if errors:
+        print("✗ El programa tiene errores:\n" + "\n".join(f"  - {e}" for e in errors), file=sys.stderr)
+        return 1
+    module = lower_program(ast)
+    print("\n".join(format_module(module)))
+    problems = verify(module)
+    for problem in problems:
+        print(f"✗ {problem}", file=sys.stderr)
+    return 1 if problems else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,6 +1,123 @@
+import codecs
 import ply.lex as lex
 import re
 
+# ---------- CORTES SEGUROS PARA LECTURA POR BLOQUES ----------
+# Construcciones que pueden cruzar un salto de línea: comentarios /* */ y literales.
+_SPECIAL = re.compile(r"/\*|//|\"|'")
+_STRING = re.compile(r'"([^"\\]|\\.)*"')
+_CHAR = re.compile(r"'([^'\\]|\\.)'")
+
+STREAM_CHUNK_SIZE = 1 << 16
+# Bloques que se esperan como máximo a que se cierre un comentario o literal
+STREAM_MAX_PENDING = 16
+
+# Trozos que genera _stream_pieces
+_PIECE_CODE = 'code'            # (_PIECE_CODE, texto, posición): se lexea
+_PIECE_OPEN = 'open'            # comienza un comentario largo que se descarta
+_PIECE_COMMENT = 'comment'      # (_PIECE_COMMENT, saltos, posición): parte descartada
+_PIECE_UNCLOSED = 'unclosed'    # la entrada termina dentro de ese comentario
+
+
+def _safe_cut(text):
+    """Posición tras el último salto de línea que no está dentro de un comentario
+    o literal; ningún token cruza ese punto (0 si aún no hay ninguno). Además,
+    posición del /* o la comilla sin cerrar que impide seguir, o -1."""
+    safe = 0
+    pos = 0
+    while True:
+        m = _SPECIAL.search(text, pos)
+        end = m.start() if m else len(text)
+        nl = text.rfind('\n', pos, end)
+        if nl >= 0:
+            safe = nl + 1
+        if not m:
+            return safe, -1
+        kind = m.group()
+        if kind == '/*':
+            close = text.find('*/', m.end())
+            if close < 0:
+                return safe, m.start()  # comentario sin cerrar: esperar más datos
+            pos = close + 2
+        elif kind == '//':
+            pos = text.find('\n', m.end())
+            if pos < 0:
+                return safe, -1
+        else:
+            lit = (_STRING if kind == '"' else _CHAR).match(text, m.start())
+            if lit:
+                pos = lit.end()
+            elif kind == '"' or m.start() + 4 > len(text):
+                return safe, m.start()  # literal posiblemente incompleto
+            else:
+                pos = m.end()  # comilla suelta: la tratará t_error
+
+
+def _stream_pieces(source, chunk_size):
+    """Lee `source` (archivo de texto o binario, mmap) por bloques y genera los
+    trozos que pueden lexearse por separado, cortados en saltos de línea seguros.
+
+    Un comentario o literal sin cerrar impide cualquier corte. Pasados
+    STREAM_MAX_PENDING bloques, si es un /* el resto del comentario se descarta
+    según llega, contando solo sus saltos de línea (_PIECE_COMMENT), hasta el
+    */; si la entrada termina antes se genera _PIECE_UNCLOSED. Si es una
+    comilla se corta en el último salto de línea y el lexer la informa como
+    carácter ilegal: un literal de varias líneas tan largo no es válido en C++.
+    Por debajo de ese límite el resultado es el mismo que lexear el texto entero.
+    """
+    limit = STREAM_MAX_PENDING * chunk_size
+    decoder = None
+    pending = ''
+    base = 0
+    comment = -1  # posición del comentario largo en curso
+    while True:
+        chunk = source.read(chunk_size)
+        eof = not chunk
+        if isinstance(chunk, (bytes, bytearray)):
+            if decoder is None:
+                decoder = codecs.getincrementaldecoder('utf-8')()
+            chunk = decoder.decode(chunk, final=eof)
+        pending += chunk
+        while True:
+            if comment >= 0:
+                close = pending.find('*/')
+                if close < 0:
+                    if eof:
+                        yield _PIECE_UNCLOSED, None, comment
+                        return
+                    # Un '*' final puede ser el comienzo del cierre
+                    drop = len(pending) - pending.endswith('*')
+                    yield _PIECE_COMMENT, pending.count('\n', 0, drop), comment
+                    base += drop
+                    pending = pending[drop:]
+                    break
+                yield _PIECE_COMMENT, pending.count('\n', 0, close + 2), comment
+                base += close + 2
+                pending = pending[close + 2:]
+                comment = -1
+            if eof:
+                cut = len(pending)
+            else:
+                cut, opened = _safe_cut(pending)
+                if not cut and opened >= 0 and len(pending) > limit:
+                    if pending.startswith('/*', opened):
+                        if opened:
+                            yield _PIECE_CODE, pending[:opened], base
+                        comment = base + opened
+                        yield _PIECE_OPEN, None, comment
+                        base += opened + 2
+                        pending = pending[opened + 2:]
+                        continue
+                    cut = pending.rfind('\n', opened) + 1
+            if cut:
+                yield _PIECE_CODE, pending[:cut], base
+                base += cut
+                pending = pending[cut:]
+            break
+        if eof:
+            return
+
+
 class CPPLexer:
     # ---------- PALABRAS RESERVADAS ----------
     reserved = {
@@ -39,8 +156,33 @@ class CPPLexer:
     ] + list(reserved.values())
 
     # ---------- CONSTRUCTOR ----------
-    def __init__(self):
-        self.lexer = lex.lex(module=self)
+    def __init__(self, quiet=False):
+        self.quiet = quiet  # True: los errores solo se acumulan en self.errors
+        self.errors = []
+        self.lexer = self._build_lexer()
+
+    def _build_lexer(self):
+        # lex.lex compila las expresiones de las reglas t_* y es lo más caro de
+        # construir un CPPLexer: se hace una vez por clase y las demás
+        # instancias clonan ese lexer con los métodos enlazados a ellas
+        cls = type(self)
+        prototype = cls.__dict__.get('_prototype')
+        if prototype is None:
+            lexer = lex.lex(module=self)
+            cls._prototype = lexer.clone()
+            return lexer
+        lexer = prototype.clone(self)
+        lexer.begin('INITIAL')  # clone() no actualiza las tablas del estado activo
+        return lexer
+
+    def reset(self):
+        """Deja el lexer como recién construido (sin entrada, línea 1, sin
+        errores) para analizar otra entrada con la misma instancia"""
+        self.errors = []
+        lexer = self.lexer
+        lexer.begin('INITIAL')
+        lexer.input('')
+        lexer.lineno = 1
 
     # ---------- LITERALES NUMÉRICOS ----------
     def t_FLOAT_NUM(self, t):
@@ -116,10 +258,46 @@ class CPPLexer:
 
     # ---------- MANEJO DE ERRORES ----------
     def t_error(self, t):
-        print(f"Carácter ilegal {t.value[0]!r} en línea {t.lineno}")
+        msg = f"Carácter ilegal {t.value[0]!r} en línea {t.lineno}"
+        if not self.quiet:
+            print(msg)
+        self.errors.append(msg)
         t.lexer.skip(1)
 
     # ---------- UTILIDADES ----------
     def tokenize(self, source):
+        self.reset()
         self.lexer.input(source)
-        return list(iter(self.lexer.token, None))
\ No newline at end of file
+        return list(iter(self.lexer.token, None))
+
+    def iter_tokens(self, source, chunk_size=STREAM_CHUNK_SIZE):
+        """Genera los tokens de `source` sin construir la lista completa.
+
+        `source` puede ser un str, un archivo (texto o binario) o un mmap; los
+        archivos se leen por bloques y cada bloque se corta en un salto de línea
+        seguro, de modo que ningún token, comentario o literal queda partido
+        (ver _stream_pieces). lexpos es relativo al inicio de la entrada.
+        """
+        self.reset()
+        lexer = self.lexer
+        if isinstance(source, str):
+            lexer.input(source)
+            yield from iter(lexer.token, None)
+            return
+
+        comment_line = None
+        for kind, value, base in _stream_pieces(source, chunk_size):
+            if kind is _PIECE_CODE:
+                lexer.input(value)
+                for tok in iter(lexer.token, None):
+                    tok.lexpos += base
+                    yield tok
+            elif kind is _PIECE_OPEN:
+                comment_line = lexer.lineno
+            elif kind is _PIECE_COMMENT:
+                lexer.lineno += value
+            else:
+                msg = f"Comentario sin cerrar en línea {comment_line}"
+                if not self.quiet:
+                    print(msg)
+                self.errors.append(msg)
\ No newline at end of file
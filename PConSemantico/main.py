@@ -1,43 +1,50 @@
 # main.py
+#
+#   python main.py [--profile informe.json] [--trace traza.json]
 
-from lexer_cpp import CPPLexer
-from parser_cpp import CPPParser
+import argparse
+
+from ast_visitor import walk
+from parser_pool import thread_parser
+from profiling import NULL_PROFILER, Profiler, format_report
 from semantic_analyzer import SemanticAnalyzer
 from semantic_line_analyzer import SemanticLineAnalyzer
+from source_file import SourceFile
 
 def print_ast(node, indent=0):
     """Imprime el AST de forma legible (soporta listas internas)."""
-    if node is None:
-        return
-
-    # ── Si recibimos una lista, recorremos sus elementos ──
-    if isinstance(node, list):
-        for item in node:
-            print_ast(item, indent)
-        return
-
-    # ── Nodo normal ──
-    print("  " * indent + f"{node.type}: {node.value}")
-    for child in node.children:
-        print_ast(child, indent + 1)
-
-def analyze_code(code):
-    """Analiza código C++ completo"""
+    # Las listas se aplanan con la misma sangría; cada nodo sangra a sus hijos
+    def enter(n, level):
+        print("  " * level + f"{n.type}: {n.value}")
+        return level + 1
+
+    walk(node, enter, state=indent)
+
+def analyze_code(code, profiler=None):
+    """Analiza código C++ completo (un str o un SourceFile mapeado en memoria).
+    Con un profiling.Profiler se mide cada fase (sin contar la impresión)."""
+    from_file = isinstance(code, SourceFile)
+    profiler = profiler or NULL_PROFILER
     print("=" * 60)
     print("ANALIZADOR COMPLETO DE C++")
     print("=" * 60)
     
     print("\n1. CÓDIGO A ANALIZAR:")
     print("-" * 30)
-    lines = code.strip().split('\n')
+    lines = code if from_file else code.strip().split('\n')
     for i, line in enumerate(lines, 1):
         print(f"{i:2d}: {line}")
     
     # Análisis Léxico
     print("\n2. ANÁLISIS LÉXICO:")
     print("-" * 30)
-    lexer = CPPLexer()
-    tokens = lexer.tokenize(code)
+    # Un solo parser (y su lexer) por hilo para el listado de tokens y el análisis
+    parser = thread_parser()
+    with profiler.phase('lexico') as phase:
+        tokens = list(parser.lexer.iter_tokens(code.stream() if from_file else code))
+        phase.count('tokens', len(tokens))
+    for error in parser.lexer.errors:
+        print(error)
     print(f"{'Token':12} | {'Valor'}")
     for token in tokens:
         print(f"{token.type:12} | {token.value}")
@@ -46,22 +53,34 @@ def analyze_code(code):
     # Análisis Sintáctico
     print("\n3. ANÁLISIS SINTÁCTICO:")
     print("-" * 30)
-    parser = CPPParser()
-    ast = parser.parse(code)
+    with profiler.phase('sintactico') as phase:
+        ast = parser.parse_stream(code.stream()) if from_file else parser.parse(code)
+        phase.count('errores', len(parser.errors))
     
-    if ast:
-        print("✓ Análisis sintáctico exitoso")
-        print("\nÁrbol de Sintaxis Abstracta (AST):")
-        print_ast(ast)
-    else:
+    if not ast:
         print("✗ Error en análisis sintáctico")
         return
+    if parser.errors:
+        # Con recuperación de errores el AST es parcial (nodos ERROR) y el
+        # análisis continúa con lo que sí se pudo reconocer
+        print("✗ Errores sintácticos encontrados:")
+        for error in parser.errors:
+            print(f"  - {error}")
+        print("\nÁrbol de Sintaxis Abstracta (AST parcial):")
+    else:
+        print("✓ Análisis sintáctico exitoso")
+        print("\nÁrbol de Sintaxis Abstracta (AST):")
+    print_ast(ast)
     
     # Análisis Semántico
     print("\n4. ANÁLISIS SEMÁNTICO:")
     print("-" * 30)
-    semantic_analyzer = SemanticAnalyzer()
-    is_valid, errors = semantic_analyzer.analyze(ast)
+    with profiler.phase('semantico') as phase:
+        semantic_analyzer = SemanticAnalyzer()
+        phase.track_visits(semantic_analyzer)
+        is_valid, errors = semantic_analyzer.analyze(ast)
+        phase.count('simbolos', semantic_analyzer.symbol_table.defined)
+        phase.count('errores', len(errors))
     
     if is_valid:
         print("✓ Análisis semántico exitoso")
@@ -72,8 +91,13 @@ def analyze_code(code):
             print(f"  - {error}")
     
     # Análisis Semántico por Líneas
-    line_analyzer = SemanticLineAnalyzer()
-    line_classifications = line_analyzer.analyze_lines(code, ast)
+    with profiler.phase('lineas') as phase:
+        line_analyzer = SemanticLineAnalyzer()
+        if from_file:
+            line_classifications = line_analyzer.analyze_source_lines(code, ast)
+        else:
+            line_classifications = line_analyzer.analyze_lines(code, ast)
+        phase.count('lineas', len(line_classifications))
     line_analyzer.print_semantic_table()
     
     # Estadísticas
@@ -82,11 +106,24 @@ def analyze_code(code):
     print(f"- Total de líneas analizadas: {stats['total_lines']}")
     print(f"- Líneas clasificadas: {stats['classified_lines']}")
     print(f"- Líneas sin clasificar: {stats['unclassified_lines']}")
-    print(f"- Porcentaje de clasificación: {(stats['classified_lines']/stats['total_lines']*100):.1f}%")
+    if stats['total_lines']:
+        print(f"- Porcentaje de clasificación: {(stats['classified_lines']/stats['total_lines']*100):.1f}%")
     
     print("\n" + "=" * 60)
 
-def main():
+def analyze_file(path, profiler=None):
+    """Analiza un archivo C++ sin cargarlo entero: se mapea en memoria y el
+    lexer, el parser y el listado por líneas leen del mapa"""
+    with SourceFile(path) as source:
+        analyze_code(source, profiler)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Analizador completo de C++ (ejemplos)")
+    ap.add_argument('--profile', metavar='JSON', help="guardar el perfil de cada fase en JSON")
+    ap.add_argument('--trace', metavar='JSON', help="guardar una traza para chrome://tracing")
+    args = ap.parse_args(argv)
+    profiler = Profiler() if args.profile or args.trace else NULL_PROFILER
+
     # ——————————————————————————————————————————
     # 1) Programa válido dentro del subconjunto
     # ——————————————————————————————————————————
@@ -138,10 +175,20 @@ def main():
     '''
 
     print("EJEMPLO 1: Código complejo válido")
-    analyze_code(complex_code)
+    with profiler.phase('ejemplo 1'):
+        analyze_code(complex_code, profiler)
 
     print("\\n\\nEJEMPLO 2: Código con errores")
-    analyze_code(error_code)
+    with profiler.phase('ejemplo 2'):
+        analyze_code(error_code, profiler)
+    if profiler.enabled:
+        profiler.close()
+        print("\nPERFIL POR FASES:")
+        print("\n".join(format_report(profiler.report())))
+        if args.profile:
+            profiler.write_json(args.profile)
+        if args.trace:
+            profiler.write_chrome_trace(args.trace)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,177 @@
+# parallel_semantic.py
+# Análisis semántico con los cuerpos de función repartidos en un pool de procesos.
+#
+# Primera pasada (en este proceso y en orden): las declaraciones que no son
+# funciones se analizan completas y de cada FUN_DEF solo se registra su nombre
+# en el ámbito global. Así se sabe qué globales ve cada función: exactamente los
+# definidos antes que ella, igual que en el recorrido en serie. Después cada
+# función se analiza entera (definición, parámetros y cuerpo) en un proceso del
+# pool con esos globales, y sus errores se colocan en la posición de su
+# declaración: el resultado coincide con SemanticAnalyzer.analyze.
+#
+# Donde existe fork, el pool se crea para cada análisis después de tener el AST,
+# y los procesos lo heredan: a cada tarea solo se le envían posiciones. En otro
+# caso las funciones viajan codificadas con ast_binary y el pool se reutiliza.
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import ast_binary
+from semantic_analyzer import SemanticAnalyzer, SymbolTable, build_signature_index
+
+# Con menos funciones el coste de enviar los ASTs supera lo que se gana
+MIN_PARALLEL_FUNCTIONS = 16
+
+_worker_analyzer = None
+_shared_decls = None  # declaraciones del PROGRAM heredadas por fork
+
+
+def _init_worker():
+    global _worker_analyzer
+    _worker_analyzer = SemanticAnalyzer()
+
+
+def _check_functions(globals_, functions, plan, signatures):
+    """Tarea del pool: analiza un tramo de funciones consecutivas.
+
+    globals_ son los símbolos globales [(nombre, símbolo)] en orden de
+    definición; functions, las funciones codificadas con ast_binary o sus
+    posiciones en _shared_decls; plan[i] = (cuántos globales ve la función i,
+    si su nombre se definió); signatures, el índice de firmas del programa.
+    Devuelve [(errores, abortado)] por función.
+    """
+    analyzer = _worker_analyzer or SemanticAnalyzer()
+    if isinstance(functions, bytes):
+        nodes = ast_binary.loads(functions)
+    else:
+        nodes = [_shared_decls[pos] for pos in functions]
+    table = SymbolTable()
+    bound = 0
+    results = []
+    for node, (prefix, defines_self) in zip(nodes, plan):
+        for name, symbol in globals_[bound:prefix]:
+            table.bind(name, symbol)
+        errors = analyzer.analyze_declaration(node, table, signatures)
+        results.append((list(errors), analyzer.aborted))
+        # la propia función ya quedó definida en la tabla al analizarla
+        bound = prefix + 1 if defines_self else prefix
+    return results
+
+
+class ParallelSemanticAnalyzer:
+    """Misma interfaz que SemanticAnalyzer.analyze; el pool se crea la primera
+    vez que hace falta y se reutiliza hasta close()."""
+
+    def __init__(self, workers=None, min_functions=MIN_PARALLEL_FUNCTIONS):
+        self.workers = workers or os.cpu_count() or 1
+        self.min_functions = min_functions
+        self.errors = []
+        self._serial = SemanticAnalyzer()
+        self._pool = None
+        self._fork = 'fork' in multiprocessing.get_all_start_methods()
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    # ------------------------------------------------------------
+    def analyze(self, ast):
+        decls = ast.children if ast is not None and ast.type == 'PROGRAM' else None
+        functions = sum(1 for d in decls if d is not None and d.type == 'FUN_DEF') if decls else 0
+        if self.workers == 1 or functions < self.min_functions:
+            is_valid, errors = self._serial.analyze(ast)
+            self.errors = errors
+            return is_valid, errors
+
+        slots = [None] * len(decls)  # (errores, abortado) por declaración
+        tasks = self._first_pass(decls, slots)
+        if tasks:
+            for positions, results in self._run(decls, tasks):
+                for pos, result in zip(positions, results):
+                    slots[pos] = result
+
+        # Unión determinista: orden de declaración, cortando donde la versión
+        # en serie se habría detenido por una excepción
+        errors = []
+        for result in slots:
+            if result is None:
+                break
+            decl_errors, aborted = result
+            errors.extend(decl_errors)
+            if aborted:
+                break
+        self.errors = errors
+        return len(errors) == 0, errors
+
+    def _run(self, decls, tasks):
+        """Ejecuta las tareas en el pool; genera (posiciones, resultados) en orden"""
+        global _shared_decls
+        if self._fork:
+            _shared_decls = decls
+            try:
+                with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                         mp_context=multiprocessing.get_context('fork')) as pool:
+                    futures = [pool.submit(_check_functions, *args) for args, _ in tasks]
+                    for future, (_, positions) in zip(futures, tasks):
+                        yield positions, future.result()
+            finally:
+                _shared_decls = None
+            return
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+        futures = [self._pool.submit(_check_functions, *args) for args, _ in tasks]
+        for future, (_, positions) in zip(futures, tasks):
+            yield positions, future.result()
+
+    def _first_pass(self, decls, slots):
+        """Globales y nombres de función en orden; devuelve las tareas del pool
+        como ((globales, funciones, plan), posiciones)"""
+        analyzer = self._serial
+        signatures = build_signature_index(decls)
+        table = SymbolTable()
+        lookup = table.lookup
+        globals_ = []
+        pending = []  # (posición, nodo, prefijo, define_su_nombre)
+        for pos, node in enumerate(decls):
+            if node is not None and node.type == 'FUN_DEF':
+                prefix = len(globals_)
+                try:
+                    table.define(node.value, f"function_{node.children[0].value}")
+                    globals_.append((node.value, lookup(node.value)))
+                    defined = True
+                except Exception:
+                    defined = False  # el error lo dará el análisis de la propia función
+                pending.append((pos, node, prefix, defined))
+                continue
+            names = []
+            if node is not None and node.type == 'VAR_DECL':
+                names = [init.value for init in node.children[1:] if lookup(init.value) is None]
+            errors = analyzer.analyze_declaration(node, table, signatures)
+            slots[pos] = (list(errors), analyzer.aborted)
+            globals_.extend((name, lookup(name)) for name in dict.fromkeys(names) if lookup(name) is not None)
+            if analyzer.aborted:  # la versión en serie se detiene aquí
+                break
+
+        if not pending:
+            return []
+        size = -(-len(pending) // (self.workers * 4))
+        tasks = []
+        for i in range(0, len(pending), size):
+            chunk = pending[i:i + size]
+            positions = [pos for pos, _, _, _ in chunk]
+            if self._fork:
+                functions = positions
+            else:
+                functions = ast_binary.dumps([node for _, node, _, _ in chunk])
+            plan = [(prefix, defined) for _, _, prefix, defined in chunk]
+            visible = max(prefix + defined for prefix, defined in plan)
+            tasks.append(((globals_[:visible], functions, plan, signatures), positions))
+        return tasks
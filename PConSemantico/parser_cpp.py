@@ -1,12 +1,22 @@
+import sys
+
+import ply.lex as lex
 import ply.yacc as yacc
 from lexer_cpp import CPPLexer
+from table_cache import build_parser
+
+# Tupla compartida por todas las hojas (NUMBER, ID, ...): evita una lista por nodo
+NO_CHILDREN = ()
+
 
 class ASTNode:
-    """Nodo base para el Árbol de Sintaxis Abstracta"""
+    """Nodo base para el Árbol de Sintaxis Abstracta (compacto: __slots__ y tipo internado)"""
+    __slots__ = ('type', 'value', 'children', 'line')
+
     def __init__(self, type_node, value=None, children=None, line=None):
-        self.type = type_node
+        self.type = sys.intern(type_node)
         self.value = value
-        self.children = children or []
+        self.children = children or NO_CHILDREN
         self.line = line
 
     def __repr__(self):
@@ -15,10 +25,14 @@ class ASTNode:
 
 class CPPParser:
 
-    def __init__(self):
-        self.lexer = CPPLexer()
+    def __init__(self, table_cache=True, cache_dir=None, quiet=False):
+        self.quiet = quiet  # True: no imprime los errores (ver lexer.errors y self.errors)
+        self.lexer = CPPLexer(quiet=quiet)
         self.tokens = self.lexer.tokens
-        self.parser = yacc.yacc(module=self, debug=False, write_tables=False)
+        if table_cache:  # tablas LALR persistentes (ver table_cache.py)
+            self.parser = build_parser(self, cache_dir)
+        else:
+            self.parser = yacc.yacc(module=self, debug=False, write_tables=False)
         self.ast = None
         self.errors = []
 
@@ -44,7 +58,8 @@ class CPPParser:
         '''declaration_list : declaration_list declaration
                             | empty'''
         if len(p) == 3:
-            p[0] = p[1] + [p[2]]
+            p[1].append(p[2])
+            p[0] = p[1]
         else:
             p[0] = []
 
@@ -53,15 +68,26 @@ class CPPParser:
                        | fun_declaration'''
         p[0] = p[1]
 
+    def p_declaration_error(self, p):
+        '''declaration : error SEMICOLON
+                       | error RBRACE'''
+        # Recuperación: se descarta hasta el siguiente ';' o '}' y se sigue
+        p[0] = ASTNode('ERROR', line=p.lineno(1))
+
     # --- Declaración de variables -----------------------------------
     def p_var_declaration(self, p):
         'var_declaration : type init_declarator_list SEMICOLON'
-        p[0] = ASTNode('VAR_DECL', children=[ASTNode('TYPE', value=p[1])] + p[2], line=p.lineno(1))
+        # `type` es un no terminal (p.lineno(1) valdría 0): se usa la línea del primer declarador
+        p[0] = ASTNode('VAR_DECL', children=[ASTNode('TYPE', value=p[1])] + p[2], line=p[2][0].line)
 
     def p_init_declarator_list(self, p):
         '''init_declarator_list : init_declarator
                                 | init_declarator_list COMMA init_declarator'''
-        p[0] = [p[1]] if len(p) == 2 else p[1] + [p[3]]
+        if len(p) == 2:
+            p[0] = [p[1]]
+        else:
+            p[1].append(p[3])
+            p[0] = p[1]
 
     def p_init_declarator(self, p):
         'init_declarator : ID opt_initializer'
@@ -89,7 +115,11 @@ class CPPParser:
     def p_param_list(self, p):
         '''param_list : param
                       | param_list COMMA param'''
-        p[0] = [p[1]] if len(p) == 2 else p[1] + [p[3]]
+        if len(p) == 2:
+            p[0] = [p[1]]
+        else:
+            p[1].append(p[3])
+            p[0] = p[1]
 
     def p_param(self, p):
         'param : type ID'
@@ -97,18 +127,30 @@ class CPPParser:
 
     # --- Bloques y declaraciones locales -----------------------------
     def p_compound_stmt(self, p):
-        'compound_stmt : LBRACE local_declarations statement_list RBRACE'
-        p[0] = ASTNode('BLOCK', children=p[2] + p[3], line=p.lineno(1))
+        '''compound_stmt : LBRACE local_declarations statement_list RBRACE
+                         | LBRACE local_declarations statement_list error RBRACE'''
+        p[2].extend(p[3])
+        if len(p) == 6:  # sentencia sin ';' antes de la '}': el bloque se conserva
+            p[2].append(ASTNode('ERROR', line=p.lineno(4)))
+        p[0] = ASTNode('BLOCK', children=p[2], line=p.lineno(1))
 
     def p_local_declarations(self, p):
         '''local_declarations : local_declarations var_declaration
                               | empty'''
-        p[0] = p[1] + [p[2]] if len(p) == 3 else []
+        if len(p) == 3:
+            p[1].append(p[2])
+            p[0] = p[1]
+        else:
+            p[0] = []
 
     def p_statement_list(self, p):
         '''statement_list : statement_list statement
                           | empty'''
-        p[0] = p[1] + [p[2]] if len(p) == 3 else []
+        if len(p) == 3:
+            p[1].append(p[2])
+            p[0] = p[1]
+        else:
+            p[0] = []
 
     # --- Sentencias --------------------------------------------------
     def p_statement(self, p):
@@ -120,6 +162,10 @@ class CPPParser:
                      | io_stmt'''
         p[0] = p[1]
 
+    def p_statement_error(self, p):
+        'statement : error SEMICOLON'
+        p[0] = ASTNode('ERROR', line=p.lineno(1))
+
     def p_expression_stmt(self, p):
         'expression_stmt : expression_opt SEMICOLON'
         p[0] = p[1] if p[1] else ASTNode('EMPTY', line=p.lineno(2))
@@ -135,6 +181,14 @@ class CPPParser:
                           | IF LPAREN expression RPAREN statement ELSE statement'''
         p[0] = ASTNode('IF', children=[p[3], p[5]] + ([p[7]] if len(p) == 8 else []), line=p.lineno(1))
 
+    def p_selection_stmt_error(self, p):
+        '''selection_stmt : IF LPAREN error RPAREN statement
+                          | IF LPAREN error RPAREN statement ELSE statement'''
+        # Error en la condición: se descarta solo hasta su ')', de modo que la '{'
+        # del cuerpo no se pierde y la función sigue abierta
+        cond = ASTNode('ERROR', line=p.lineno(3))
+        p[0] = ASTNode('IF', children=[cond, p[5]] + ([p[7]] if len(p) == 8 else []), line=p.lineno(1))
+
     # --- While / for -------------------------------------------------
     def p_iteration_stmt(self, p):
         '''iteration_stmt : WHILE LPAREN expression RPAREN statement
@@ -144,6 +198,17 @@ class CPPParser:
         else:
             p[0] = ASTNode('FOR', children=[p[3], p[5], p[7], p[9]], line=p.lineno(1))
 
+    def p_iteration_stmt_error(self, p):
+        '''iteration_stmt : WHILE LPAREN error RPAREN statement
+                          | FOR LPAREN error RPAREN statement'''
+        # Como en p_selection_stmt_error; un for con la cabecera mal formada
+        # conserva solo el cuerpo
+        cond = ASTNode('ERROR', line=p.lineno(3))
+        if p[1] == 'while':
+            p[0] = ASTNode('WHILE', children=[cond, p[5]], line=p.lineno(1))
+        else:
+            p[0] = ASTNode('FOR', children=[None, cond, None, p[5]], line=p.lineno(1))
+
     # --- Return ------------------------------------------------------
     def p_return_stmt(self, p):
         'return_stmt : RETURN expression_opt SEMICOLON'
@@ -159,12 +224,20 @@ class CPPParser:
     def p_io_in_list(self, p):
         '''io_in_list : io_in_list SHIFT_IN var_ref
                       | SHIFT_IN var_ref'''
-        p[0] = p[1] + [p[3]] if len(p) == 4 else [p[2]]
+        if len(p) == 4:
+            p[1].append(p[3])
+            p[0] = p[1]
+        else:
+            p[0] = [p[2]]
 
     def p_io_out_list(self, p):
         '''io_out_list : io_out_list SHIFT_OUT io_item
                         | SHIFT_OUT io_item'''
-        p[0] = p[1] + [p[3]] if len(p) == 4 else [p[2]]
+        if len(p) == 4:
+            p[1].append(p[3])
+            p[0] = p[1]
+        else:
+            p[0] = [p[2]]
 
     def p_var_ref(self, p):
         'var_ref : ID'
@@ -249,12 +322,12 @@ class CPPParser:
                 p[0] = ASTNode('ID', value=p[1], line=p.lineno(1))
             elif tok.type in {'NUMBER', 'FLOAT_NUM', 'STRING_LITERAL', 'CHAR_LITERAL'}:
                 p[0] = ASTNode(tok.type, value=p[1], line=p.lineno(1))
-            else:
+            elif tok.type in {'TRUE', 'FALSE'}:
                 p[0] = ASTNode('BOOLEAN', value=p[1], line=p.lineno(1))
-        elif len(p) == 4 and p[1] == '(':
+            else:  # function_call: ya es un nodo CALL
+                p[0] = p[1]
+        else:  # LPAREN expression RPAREN
             p[0] = p[2]
-        else:  # function_call
-            p[0] = p[1]
 
     def p_function_call(self, p):
         'function_call : ID LPAREN argument_list RPAREN'
@@ -268,7 +341,11 @@ class CPPParser:
     def p_arg_seq(self, p):
         '''arg_seq : expression
                    | arg_seq COMMA expression'''
-        p[0] = [p[1]] if len(p) == 2 else p[1] + [p[3]]
+        if len(p) == 2:
+            p[0] = [p[1]]
+        else:
+            p[1].append(p[3])
+            p[0] = p[1]
 
     # --- Tipos -------------------------------------------------------
     def p_type(self, p):
@@ -285,17 +362,74 @@ class CPPParser:
         p[0] = None
 
     # --- Manejo de errores ------------------------------------------
+    # Sin errok(): PLY desapila hasta un estado que acepte `error` (las reglas
+    # *_error de arriba) y descarta tokens hasta el ';' o '}' de sincronización.
+    # Los errores a menos de 3 tokens del anterior no se notifican (cascada).
     def p_error(self, p):
+        if getattr(p, 'synthetic', False):
+            return  # fin de archivo: ya se notificó en _with_eof_recovery
         msg = f"Error sintáctico en token '{p.value}' línea {p.lineno}" if p else "Error sintáctico: fin de archivo inesperado"
-        print(msg)
+        self._report(msg)
+
+    def _report(self, msg):
+        if not self.quiet:
+            print(msg)
         self.errors.append(msg)
-        if p:
-            self.parser.errok()
+
+    def _with_eof_recovery(self, tokens):
+        """Pasa los tokens y, si el texto acaba a mitad de una sentencia o con
+        bloques abiertos, añade el ';' y las '}' que faltan (marcados como
+        sintéticos) para que el parser devuelva el AST parcial en vez de None"""
+        depth = 0
+        last = None
+        for tok in tokens:
+            kind = tok.type
+            if kind == 'LBRACE':
+                depth += 1
+            elif kind == 'RBRACE' and depth:
+                depth -= 1
+            last = tok
+            yield tok
+        if last is None or (depth == 0 and last.type in ('SEMICOLON', 'RBRACE')):
+            return
+        self._report("Error sintáctico: fin de archivo inesperado")
+        closing = ['RBRACE'] * depth
+        if last.type not in ('SEMICOLON', 'RBRACE', 'LBRACE'):
+            closing.insert(0, 'SEMICOLON')
+        for kind in closing:
+            tok = lex.LexToken()
+            tok.type = kind
+            tok.value = ''
+            tok.synthetic = True
+            tok.lineno = last.lineno
+            tok.lexpos = last.lexpos
+            yield tok
 
     # --- API pública -------------------------------------------------
+    def reset(self):
+        """Estado de un parser recién construido, lexer incluido: la misma
+        instancia puede analizar muchas entradas (ver parser_pool.py)"""
+        self.lexer.reset()
+        self.errors = []
+        self.ast = None
+
     def parse(self, source):
+        self.reset()
+        lexer = self.lexer.lexer
+        lexer.input(source)
+        return self.parse_tokens(iter(lexer.token, None))
+
+    def parse_stream(self, stream):
+        """Como parse(), pero tomando los tokens de CPPLexer.iter_tokens (archivo o mmap)"""
+        return self.parse_tokens(self.lexer.iter_tokens(stream))
+
+    def parse_tokens(self, tokens):
+        """Analiza un iterable de LexToken ya generado (p. ej. envuelto para registrarlos).
+        No reinicia el lexer: quien genera los tokens fija su posición y línea"""
         self.errors = []
-        return self.parser.parse(source, lexer=self.lexer.lexer, debug=False)
+        self.ast = None
+        tokens = self._with_eof_recovery(tokens)
+        return self.parser.parse(lexer=self.lexer.lexer, debug=False, tokenfunc=lambda: next(tokens, None))
 
     def has_errors(self):
         return bool(self.errors)
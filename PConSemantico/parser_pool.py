@@ -0,0 +1,74 @@
+# parser_pool.py
+# Reutilización de CPPParser entre entradas. Construir un parser cuesta más que
+# analizar un archivo pequeño (tablas LALR, lexer de PLY), pero una instancia
+# no puede usarse desde dos hilos a la vez: guarda el estado del análisis en
+# curso. Hay dos formas de compartirlas:
+#
+#   parser = thread_parser()          # uno por hilo (y por valor de quiet)
+#   ast = parser.parse(codigo)
+#
+#   pool = ParserPool(size=8)         # prestados a hilos de trabajo
+#   with pool.acquire() as parser:
+#       ast = parser.parse(codigo)
+#
+# Los parsers se entregan siempre reiniciados (CPPParser.reset): sin errores
+# de la entrada anterior y con el lexer en la línea 1. En batch.py cada
+# proceso de trabajo construye los suyos una sola vez en su inicializador.
+
+import threading
+from contextlib import contextmanager
+
+from parser_cpp import CPPParser
+
+_local = threading.local()
+
+
+def thread_parser(quiet=True):
+    """CPPParser reiniciado del hilo actual; se construye en la primera llamada"""
+    parsers = getattr(_local, 'parsers', None)
+    if parsers is None:
+        parsers = _local.parsers = {}
+    parser = parsers.get(quiet)
+    if parser is None:
+        parser = parsers[quiet] = CPPParser(quiet=quiet)
+    parser.reset()
+    return parser
+
+
+class ParserPool:
+    """Conjunto de parsers libres compartido por varios hilos.
+
+    acquire() presta un parser reiniciado y lo devuelve al salir del with; si
+    no queda ninguno libre se construye otro, salvo que `size` limite el
+    total: entonces se espera a que otro hilo devuelva el suyo.
+    """
+
+    def __init__(self, size=None, quiet=True, **options):
+        self.size = size
+        self.quiet = quiet
+        self.options = options  # argumentos de CPPParser (table_cache, cache_dir)
+        self.created = 0
+        self._free = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(size) if size else None
+
+    @contextmanager
+    def acquire(self):
+        if self._slots is not None:
+            self._slots.acquire()
+        try:
+            with self._lock:
+                parser = self._free.pop() if self._free else None
+            if parser is None:
+                parser = CPPParser(quiet=self.quiet, **self.options)
+                with self._lock:
+                    self.created += 1
+            parser.reset()
+            try:
+                yield parser
+            finally:
+                with self._lock:
+                    self._free.append(parser)
+        finally:
+            if self._slots is not None:
+                self._slots.release()
@@ -0,0 +1,268 @@
+# profiling.py
+# Instrumentación de las fases del analizador: tiempo real y de CPU, contadores
+# (tokens, nodos, símbolos...), pico de memoria con tracemalloc y visitas por
+# tipo de nodo del SemanticAnalyzer. Desactivada por defecto: el código de las
+# fases usa NULL_PROFILER, cuyas fases son un único objeto que no hace nada.
+#
+#   profiler = Profiler()
+#   with profiler.phase('semantico') as phase:
+#       phase.track_visits(analyzer)
+#       analyzer.analyze(ast)
+#       phase.count('errores', len(analyzer.errors))
+#   profiler.write_json('perfil.json')
+#   profiler.write_chrome_trace('traza.json')   # chrome://tracing o Perfetto
+#
+# Con memory=True tracemalloc registra cada asignación mientras el perfilador
+# está activo, lo que ralentiza el análisis varias veces: los tiempos son
+# comparables entre sí pero no con una ejecución sin memoria. Con rss=True se
+# anota además el pico de memoria residente del proceso en cada fase (en Linux
+# el pico se reinicia al abrir la fase; en otros sistemas es el del proceso).
+
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+
+from ast_visitor import CountingTable
+
+
+# ---------- MEMORIA RESIDENTE ----------
+def read_rss():
+    """(memoria residente actual, pico) del proceso en bytes; (None, pico) si
+    /proc no está disponible"""
+    try:
+        values = {}
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith(('VmRSS:', 'VmHWM:')):
+                    key, value = line.split(':')
+                    values[key] = int(value.split()[0]) * 1024
+        return values['VmRSS'], values['VmHWM']
+    except (OSError, KeyError, ValueError):
+        import resource  # no existe en Windows
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return None, peak if sys.platform == 'darwin' else peak * 1024
+
+
+def reset_rss_peak():
+    """Reinicia el pico de memoria residente (Linux); devuelve si fue posible"""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+class _NullPhase:
+    """Fase de un perfilador desactivado"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        return False
+
+    def count(self, name, value=1):
+        pass
+
+    def track_visits(self, analyzer):
+        pass
+
+
+class NullProfiler:
+    enabled = False
+    _phase = _NullPhase()
+
+    def phase(self, name):
+        return self._phase
+
+    def report(self):
+        return {'phases': []}
+
+
+NULL_PROFILER = NullProfiler()
+
+
+class _Phase:
+    __slots__ = ('profiler', 'name', 'depth', 'start', 'wall', 'cpu', 'counters', 'visits',
+                 '_cpu0', '_mem0', '_peak', '_rss0', '_rss_peak', '_analyzer', '_saved_dispatch')
+
+    def __init__(self, profiler, name, depth):
+        self.profiler = profiler
+        self.name = name
+        self.depth = depth
+        self.start = 0.0
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.counters = {}
+        self.visits = None
+        self._cpu0 = 0.0
+        self._mem0 = None
+        self._peak = 0
+        self._rss0 = None
+        self._rss_peak = 0
+        self._analyzer = None
+        self._saved_dispatch = None
+
+    def __enter__(self):
+        self.profiler._open(self)
+        self._cpu0 = time.process_time()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *_):
+        self.wall = time.perf_counter() - self.start
+        self.cpu = time.process_time() - self._cpu0
+        if self._analyzer is not None:
+            self._analyzer._dispatch = self._saved_dispatch
+            self._analyzer = self._saved_dispatch = None
+        self.profiler._close(self)
+        return False
+
+    def count(self, name, value=1):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def track_visits(self, analyzer):
+        """Cuenta las visitas por tipo de nodo de `analyzer` (un SemanticAnalyzer
+        o cualquier objeto con _dispatch) hasta el final de la fase. Todas las
+        visitas pasan por _dispatch, sea cual sea la profundidad del árbol"""
+        dispatch = getattr(analyzer, '_dispatch', None)
+        if self._analyzer is not None or dispatch is None:
+            return  # p. ej. ParallelSemanticAnalyzer: las visitas ocurren en otros procesos
+        self.visits = Counter()
+        self._analyzer = analyzer
+        self._saved_dispatch = dispatch
+        analyzer._dispatch = CountingTable(dispatch, self.visits)
+
+    def to_dict(self):
+        data = {'name': self.name, 'depth': self.depth, 'start': self.start - self.profiler.origin,
+                'wall': self.wall, 'cpu': self.cpu, 'counters': dict(self.counters)}
+        if self._mem0 is not None:
+            data['memory_peak'] = self._peak - self._mem0
+        if self._rss0 is not None:
+            data['rss_start'] = self._rss0
+            data['rss_peak'] = self._rss_peak
+        if self.visits is not None:
+            data['visits'] = dict(self.visits.most_common())
+        return data
+
+
+class Profiler:
+    """Perfilador activo: cada `with profiler.phase(nombre)` añade una fase
+    (las fases pueden anidarse)"""
+
+    enabled = True
+
+    def __init__(self, memory=True, rss=False):
+        self.memory = memory
+        self.rss = rss
+        self.phases = []
+        self.origin = time.perf_counter()
+        self._open_phases = []
+        self._started_tracing = False
+        self.pid = os.getpid()
+        self.tid = threading.get_ident()
+
+    def phase(self, name):
+        return _Phase(self, name, len(self._open_phases))
+
+    def close(self):
+        """Detiene tracemalloc si lo arrancó este perfilador"""
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    # ---------- MEMORIA ----------
+    # tracemalloc tiene un único pico global: al abrir una fase anidada el pico
+    # alcanzado hasta entonces se pasa a la fase que la contiene antes de reiniciarlo
+    def _open(self, phase):
+        self.phases.append(phase)
+        if self.memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+            current, peak = tracemalloc.get_traced_memory()
+            if self._open_phases:
+                parent = self._open_phases[-1]
+                parent._peak = max(parent._peak, peak)
+            tracemalloc.reset_peak()
+            phase._mem0 = phase._peak = current
+        if self.rss:
+            current, peak = read_rss()
+            if self._open_phases:
+                parent = self._open_phases[-1]
+                parent._rss_peak = max(parent._rss_peak, peak)
+            if reset_rss_peak():
+                current, peak = read_rss()
+            phase._rss0 = current if current is not None else peak
+            phase._rss_peak = peak
+        self._open_phases.append(phase)
+
+    def _close(self, phase):
+        self._open_phases.pop()
+        if phase._mem0 is not None:
+            phase._peak = max(phase._peak, tracemalloc.get_traced_memory()[1])
+            if self._open_phases:
+                parent = self._open_phases[-1]
+                parent._peak = max(parent._peak, phase._peak)
+        if phase._rss0 is not None:
+            phase._rss_peak = max(phase._rss_peak, read_rss()[1])
+            if self._open_phases:
+                parent = self._open_phases[-1]
+                parent._rss_peak = max(parent._rss_peak, phase._rss_peak)
+
+    # ---------- INFORMES ----------
+    def report(self):
+        return {'pid': self.pid, 'memory': self.memory, 'rss': self.rss,
+                'phases': [phase.to_dict() for phase in self.phases]}
+
+    def write_json(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, ensure_ascii=False, indent=2)
+
+    def chrome_trace(self):
+        """Eventos en formato Trace Event (fases completas 'X', tiempos en µs)"""
+        events = []
+        for phase in self.phases:
+            data = phase.to_dict()
+            args = dict(data['counters'], cpu_ms=round(data['cpu'] * 1e3, 3))
+            if 'memory_peak' in data:
+                args['memory_peak'] = data['memory_peak']
+            if 'rss_peak' in data:
+                args['rss_peak'] = data['rss_peak']
+            if 'visits' in data:
+                args['visits'] = data['visits']
+            events.append({'name': phase.name, 'cat': 'fase', 'ph': 'X', 'pid': self.pid, 'tid': self.tid,
+                           'ts': round(data['start'] * 1e6, 3), 'dur': round(data['wall'] * 1e6, 3),
+                           'args': args})
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def write_chrome_trace(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.chrome_trace(), f, ensure_ascii=False)
+
+
+def format_report(report):
+    """Tabla de texto de un report()"""
+    lines = [f"{'Fase':24} {'Real (ms)':>10} {'CPU (ms)':>10} {'Memoria (KB)':>13}  Contadores"]
+    for phase in report['phases']:
+        memory = f"{phase['memory_peak'] / 1024:.1f}" if 'memory_peak' in phase else '-'
+        counters = ', '.join(f"{k}={v}" for k, v in phase['counters'].items())
+        name = '  ' * phase['depth'] + phase['name']
+        lines.append(f"{name:24} {phase['wall'] * 1e3:>10.2f} {phase['cpu'] * 1e3:>10.2f} {memory:>13}  {counters}")
+        if phase.get('visits'):
+            top = ', '.join(f"{k}={v}" for k, v in list(phase['visits'].items())[:8])
+            lines.append(f"{'':24} visitas: {top}")
+    return lines
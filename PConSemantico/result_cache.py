@@ -0,0 +1,148 @@
+import hashlib
+import importlib
+import os
+import pickle
+
+from table_cache import grammar_fingerprint, resolve_cache_dir
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# Módulos cuyo código determina el resultado del análisis
+ANALYZER_MODULES = ('lexer_cpp', 'parser_cpp', 'semantic_analyzer', 'semantic_line_analyzer',
+                    'ast_visitor', 'ast_binary', 'constant_folding', 'analysis')
+
+_fingerprints = {}
+
+
+# ---------- HUELLA DEL ANALIZADOR ----------
+def analyzer_fingerprint(parser):
+    """Hash de la gramática y del código de los módulos del analizador; cualquier
+    cambio en ellos invalida todas las entradas de la caché"""
+    key = type(parser)
+    fp = _fingerprints.get(key)
+    if fp is None:
+        h = hashlib.sha256(grammar_fingerprint(parser).encode())
+        for name in ANALYZER_MODULES:
+            with open(importlib.import_module(name).__file__, 'rb') as f:
+                h.update(f.read())
+        fp = _fingerprints[key] = h.hexdigest()
+    return fp
+
+
+# ---------- CACHÉ DE RESULTADOS ----------
+class ResultCache:
+    """Caché en disco direccionada por contenido: clave = sha256(huella + bytes
+    del fuente). Cada entrada es un fichero pickle (el AST va dentro en el
+    formato de ast_binary); la fecha de modificación marca el último uso y, al
+    superar max_bytes, se borran las más antiguas (LRU).
+
+    El tamaño ocupado se lleva en cada proceso: si varios procesos comparten el
+    directorio, cada uno solo ve sus propias escrituras y la cifra es
+    aproximada hasta el siguiente recorrido del directorio en _evict.
+
+    Cargar un pickle puede ejecutar código arbitrario: el directorio de la
+    caché solo debe ser escribible por usuarios de confianza.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = os.path.join(resolve_cache_dir(cache_dir), 'results')
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._size = None  # bytes ocupados; se calcula en la primera escritura
+
+    def key(self, parser, data, variant=''):
+        """variant distingue opciones que cambian el resultado (p. ej. 'fold')"""
+        h = hashlib.sha256(analyzer_fingerprint(parser).encode())
+        h.update(variant.encode())
+        h.update(b'\0')
+        h.update(data)
+        return h.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.pickle")
+
+    def get(self, key):
+        """Registro guardado o None; un acierto renueva su posición en la LRU"""
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                record = pickle.load(f)
+        except FileNotFoundError:
+            record = None
+        except Exception:  # entrada corrupta o de otra versión de Python
+            record = None
+            self._discard(path)
+        if record is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        try:
+            os.utime(path)
+        except OSError:  # p. ej. caché de solo lectura: el registro sigue valiendo
+            pass
+        return record
+
+    def put(self, key, record):
+        """Guarda el registro (escritura atómica); devuelve False si no se pudo"""
+        data = pickle.dumps(record, protocol=pickle.HIGHEST_PROTOCOL)
+        path = self._path(key)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            if self._size is None:
+                self._size = sum(size for _, size, _ in self._entries())
+            with open(tmp, 'wb') as f:
+                f.write(data)
+            try:
+                replaced = os.stat(path).st_size  # la entrada ya existía
+            except FileNotFoundError:
+                replaced = 0
+            os.replace(tmp, path)
+        except OSError:
+            self._discard(tmp)
+            return False
+        self._size += len(data) - replaced
+        if self._size > self.max_bytes:
+            self._evict()
+        return True
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses}
+
+    # ---------- LRU ----------
+    def _entries(self):
+        """(mtime, tamaño, ruta) de cada entrada"""
+        entries = []
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if entry.name.endswith('.pickle'):
+                        try:
+                            st = entry.stat()
+                        except OSError:
+                            continue
+                        entries.append((st.st_mtime, st.st_size, entry.path))
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def _evict(self):
+        """Borra las entradas menos usadas hasta quedar en el 90 % del límite, para
+        no recorrer el directorio en cada escritura"""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * 0.9
+        for _, size, path in entries:
+            if total <= target:
+                break
+            if self._discard(path):
+                total -= size
+        self._size = total
+
+    @staticmethod
+    def _discard(path):
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
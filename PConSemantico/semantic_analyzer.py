@@ -1,68 +1,173 @@
+from ast_visitor import DispatchTable, evaluate
+
+
 class SymbolTable:
-    """Tabla de símbolos con anidamiento de ámbitos"""
+    """Tabla de símbolos plana con anidamiento de ámbitos.
+
+    Cada nombre tiene una pila de enlaces (profundidad, símbolo) y cada ámbito
+    anota en un registro de deshacer los nombres que define: lookup es una sola
+    consulta al dict y salir de un ámbito solo deshace lo que se definió en él.
+    Los analizadores abren y cierran ámbitos con push_scope/pop_scope;
+    enter_scope conserva la interfaz de siempre (una tabla hija con `parent`).
+    """
 
     def __init__(self):
-        self.symbols: dict[str, dict] = {}
+        self._bindings: dict[str, list[tuple[int, dict]]] = {}
+        self._log: list[str] = []     # nombres definidos, en orden
+        self._marks: list[int] = []   # longitud de _log al entrar en cada ámbito
+        self.defined = 0              # símbolos definidos en total (perfilado)
         self.parent: 'SymbolTable | None' = None
 
     # ------------------------------------------------------------
     def define(self, name: str, symbol_type: str, value=None):
-        if name in self.symbols:
+        self.bind(name, {"type": symbol_type, "value": value})
+
+    def bind(self, name: str, symbol: dict):
+        """Enlaza un símbolo ya construido en el ámbito actual"""
+        depth = len(self._marks)
+        stack = self._bindings.get(name)
+        if stack is None:
+            self._bindings[name] = [(depth, symbol)]
+        elif stack[-1][0] == depth:
             raise Exception(f"Identificador '{name}' ya está definido en este ámbito")
-        self.symbols[name] = {"type": symbol_type, "value": value}
+        else:
+            stack.append((depth, symbol))
+        self._log.append(name)
+        self.defined += 1
 
     def lookup(self, name: str):
-        if name in self.symbols:
-            return self.symbols[name]
-        return self.parent.lookup(name) if self.parent else None
+        stack = self._bindings.get(name)
+        if stack:
+            return stack[-1][1]
+        return self.parent.lookup(name) if self.parent is not None else None
 
     def enter_scope(self):
+        """Tabla hija enlazada con esta por `parent`; esta tabla no cambia"""
         child = SymbolTable()
         child.parent = self
         return child
 
+    def push_scope(self):
+        """Abre un ámbito anidado en esta misma tabla; se cierra con pop_scope"""
+        self._marks.append(len(self._log))
+
+    def pop_scope(self):
+        self._undo(self._marks.pop())
+
+    def _undo(self, mark):
+        bindings = self._bindings
+        log = self._log
+        while len(log) > mark:
+            name = log.pop()
+            stack = bindings[name]
+            stack.pop()
+            if not stack:
+                del bindings[name]
+
+    @property
+    def depth(self):
+        """Ámbitos abiertos sobre el global (0 en el ámbito global)"""
+        return len(self._marks)
+
+    @property
+    def symbols(self):
+        """Símbolos del ámbito actual (nombre -> símbolo)"""
+        depth = len(self._marks)
+        start = self._marks[-1] if self._marks else 0
+        return {name: self._bindings[name][-1][1] for name in self._log[start:]
+                if self._bindings[name][-1][0] == depth}
+
+
+def build_signature_index(declarations):
+    """Pre-pasada sobre los FUN_DEF de alto nivel: nombre -> (tipo de retorno,
+    tipos de los parámetros). Si un nombre se repite vale la primera definición,
+    igual que en la tabla de símbolos."""
+    index = {}
+    for node in declarations:
+        if node is not None and node.type == 'FUN_DEF' and node.value not in index:
+            params = tuple(param.children[0].value for param in node.children[1])
+            index[node.value] = (node.children[0].value, params)
+    return index
+
+
+# Tipos de nodo sin hijos: su visitador devuelve el tipo directamente
+_LEAVES = frozenset({'ID', 'NUMBER', 'FLOAT_NUM', 'STRING_LITERAL', 'CHAR_LITERAL', 'BOOLEAN'})
+
 
 # =============================================================
 class SemanticAnalyzer:
     """Analizador semántico simple para el subconjunto C++"""
 
-    def __init__(self):
+    def __init__(self, endl=False):
         self.symbol_table = SymbolTable()
         self.current_function_type: str | None = None
         self.errors: list[str] = []
+        self.aborted = False  # el último análisis se cortó por una excepción
+        self.signatures: dict[str, tuple] = {}  # ver build_signature_index
+        # Acepta `endl` en cout aunque no esté declarado, como los back ends
+        # (bytecode.py, ir.py), que lo traducen a '\n'
+        self.endl = endl
+        self._dispatch = DispatchTable(self, 'visit_', self.generic_visit)
 
     # ------------------------------------------------------------
     def analyze(self, ast):
         self.errors = []
         self.symbol_table = SymbolTable()
+        self.aborted = False
+        # Firmas de todas las funciones antes de recorrer: las llamadas pueden ir
+        # a funciones definidas más abajo
+        self.signatures = build_signature_index(ast.children if ast is not None and ast.type == 'PROGRAM' else ())
         try:
             self.visit(ast)
         except Exception as e:
             self.errors.append(str(e))
+            self.aborted = True
         return len(self.errors) == 0, self.errors
 
+    def analyze_declaration(self, node, symbol_table, signatures=None):
+        """Analiza una sola declaración de alto nivel sobre `symbol_table`, que hace
+        de ámbito global (los símbolos que define quedan en él). `signatures` es
+        el índice de firmas del programa completo (si es None se mantiene el
+        actual). Devuelve los errores."""
+        if signatures is not None:
+            self.signatures = signatures
+        self.errors = []
+        self.symbol_table = symbol_table
+        self.current_function_type = None
+        self.aborted = False
+        depth = symbol_table.depth
+        try:
+            self.visit(node)
+        except Exception as e:
+            self.errors.append(str(e))
+            self.aborted = True
+        while symbol_table.depth > depth:  # ámbitos que una excepción dejó abiertos
+            symbol_table.pop_scope()
+        return self.errors
+
     # =================== VISITADORES GENERALES ===================
+    # Recorrido con pila explícita (ast_visitor.evaluate), sin límite de
+    # profundidad: los visitadores de nodos con hijos son generadores y
+    # `yield hijo` devuelve el tipo del hijo; las hojas devuelven el tipo directamente.
     def visit(self, node):
         """Despacha según el tipo de nodo; acepta listas"""
-        if node is None:
-            return None
-        if isinstance(node, list):  # listas de nodos
-            ret = None
-            for item in node:
-                tmp = self.visit(item)
-                ret = tmp if tmp is not None else ret
-            return ret
-        method = getattr(self, f"visit_{node.type.lower()}", self.generic_visit)
-        return method(node)
+        return evaluate(node, self._dispatch, self._visit_list)
+
+    def _visit_list(self, nodes):
+        ret = None
+        for item in nodes:
+            tmp = yield item
+            ret = tmp if tmp is not None else ret
+        return ret
 
     def generic_visit(self, node):
         for child in node.children:
-            self.visit(child)
+            yield child
 
     # ======================== NODOS TOP ==========================
     def visit_program(self, node):
         for child in node.children:
-            self.visit(child)
+            yield child
 
     # ===================== DECLARACIONES VAR =====================
     def visit_var_decl(self, node):
@@ -72,54 +177,41 @@ class SemanticAnalyzer:
             self.errors.append("No se puede declarar variable de tipo void")
             return
         for init_node in node.children[1:]:
-            self._handle_init_decl(init_node, base_type)
-
-    def _handle_init_decl(self, init_node, base_type):
-        name = init_node.value
+            name = init_node.value
+            self._define(name, base_type)
+            if init_node.children:  # inicializador presente
+                expr_type = yield init_node.children[0]
+                if expr_type and not self.is_compatible_type(base_type, expr_type):
+                    self.errors.append(f"Inicialización incompatible de '{name}': {base_type} vs {expr_type}")
+
+    def _define(self, name, symbol_type):
         try:
-            self.symbol_table.define(name, base_type)
+            self.symbol_table.define(name, symbol_type)
         except Exception as e:
             self.errors.append(str(e))
-        if init_node.children:  # inicializador presente
-            expr_type = self.visit(init_node.children[0])
-            if expr_type and not self.is_compatible_type(base_type, expr_type):
-                self.errors.append(f"Inicialización incompatible de '{name}': {base_type} vs {expr_type}")
 
     # =================== DEFINICIÓN DE FUNCIÓN ===================
     def visit_fun_def(self, node):
         ret_type = node.children[0].value  # TYPE nodo
-        name = node.value
-        try:
-            self.symbol_table.define(name, f"function_{ret_type}")
-        except Exception as e:
-            self.errors.append(str(e))
+        self._define(node.value, f"function_{ret_type}")
         # Nuevo ámbito para parámetros + cuerpo (params se integran como lista sencilla)
-        prev_table = self.symbol_table
-        self.symbol_table = self.symbol_table.enter_scope()
-        # Parametros:
-        params = node.children[1]
-        for param in params:  # cada param = ASTNode('PARAM', value=id, children=[TYPE])
-            p_name = param.value
-            p_type = param.children[0].value
-            try:
-                self.symbol_table.define(p_name, p_type)
-            except Exception as e:
-                self.errors.append(str(e))
+        self.symbol_table.push_scope()
+        for param in node.children[1]:  # cada param = ASTNode('PARAM', value=id, children=[TYPE])
+            self._define(param.value, param.children[0].value)
 
         # Cuerpo
         prev_func = self.current_function_type
         self.current_function_type = ret_type
-        self.visit(node.children[2])  # BLOCK
+        yield node.children[2]  # BLOCK
         self.current_function_type = prev_func
-        self.symbol_table = prev_table
+        self.symbol_table.pop_scope()
 
     # ========================= BLOQUES ===========================
     def visit_block(self, node):
-        prev_table = self.symbol_table
-        self.symbol_table = self.symbol_table.enter_scope()
+        self.symbol_table.push_scope()
         for child in node.children:
-            self.visit(child)
-        self.symbol_table = prev_table
+            yield child
+        self.symbol_table.pop_scope()
 
     # ===================== SENTENCIAS RETURN =====================
     def visit_return(self, node):
@@ -130,7 +222,7 @@ class SemanticAnalyzer:
             if self.current_function_type != 'void':
                 self.errors.append(f"Función de tipo '{self.current_function_type}' debe retornar un valor")
             return None
-        expr_type = self.visit(node.children[0])
+        expr_type = yield node.children[0]
         if self.current_function_type == 'void':
             self.errors.append("Función void no puede retornar un valor")
         elif not self.is_compatible_type(self.current_function_type, expr_type):
@@ -139,30 +231,27 @@ class SemanticAnalyzer:
 
     # ================= SENTENCIAS DE CONTROL =====================
     def visit_if(self, node):
-        cond_type = self.visit(node.children[0])
-        if cond_type not in {None, 'int', 'float', 'boolean'}:
-            self.errors.append(f"La condición del if debe ser numérica o booleana, no '{cond_type}'")
-        self.visit(node.children[1])  # then
+        self._check_condition('if', (yield node.children[0]))
+        yield node.children[1]  # then
         if len(node.children) > 2:
-            self.visit(node.children[2])  # else
+            yield node.children[2]  # else
 
     def visit_while(self, node):
-        cond_type = self.visit(node.children[0])
-        if cond_type not in {None, 'int', 'float', 'boolean'}:
-            self.errors.append(f"La condición del while debe ser numérica o booleana, no '{cond_type}'")
-        self.visit(node.children[1])
+        self._check_condition('while', (yield node.children[0]))
+        yield node.children[1]
 
     def visit_for(self, node):
-        prev = self.symbol_table
-        self.symbol_table = self.symbol_table.enter_scope()
+        self.symbol_table.push_scope()
         # init, cond, incr, body
-        self.visit(node.children[0])
-        cond_type = self.visit(node.children[1])
+        yield node.children[0]
+        self._check_condition('for', (yield node.children[1]))
+        yield node.children[2]
+        yield node.children[3]
+        self.symbol_table.pop_scope()
+
+    def _check_condition(self, statement, cond_type):
         if cond_type not in {None, 'int', 'float', 'boolean'}:
-            self.errors.append(f"La condición del for debe ser numérica o booleana, no '{cond_type}'")
-        self.visit(node.children[2])
-        self.visit(node.children[3])
-        self.symbol_table = prev
+            self.errors.append(f"La condición del {statement} debe ser numérica o booleana, no '{cond_type}'")
 
     # ====================== ASIGNACIÓN ===========================
     def visit_assign(self, node):
@@ -176,16 +265,24 @@ class SemanticAnalyzer:
         if sym is None:
             self.errors.append(f"Variable '{var_name}' no declarada")
             return None
-        expr_type = self.visit(node.children[1])
+        expr_type = yield node.children[1]
         if expr_type and not self.is_compatible_type(sym['type'], expr_type):
             self.errors.append(f"Tipo incompatible en asignación a '{var_name}': {sym['type']} vs {expr_type}")
         return sym['type']
 
     # ===================== OPERACIONES BINARIAS ==================
     def visit_binop(self, node):
-        left = self.visit(node.children[0])
-        right = self.visit(node.children[1])
-        op = node.value
+        left, right = node.children
+        if left.type in _LEAVES and right.type in _LEAVES:
+            dispatch = self._dispatch
+            return self._binop_type(node.value, dispatch[left.type](left), dispatch[right.type](right))
+        return self._visit_binop_children(node)
+
+    def _visit_binop_children(self, node):
+        left = yield node.children[0]
+        return self._binop_type(node.value, left, (yield node.children[1]))
+
+    def _binop_type(self, op, left, right):
         if op in {'+', '-', '*', '/'}:
             if left not in {'int', 'float'} or right not in {'int', 'float'}:
                 self.errors.append(f"Operación '{op}' requiere operandos numéricos")
@@ -198,9 +295,8 @@ class SemanticAnalyzer:
 
     # ===================== OPERACIONES UNARIAS ===================
     def visit_unary(self, node):
-        operand_type = self.visit(node.children[0])
-        op = node.value
-        if op == '-' and operand_type not in {'int', 'float'}:
+        operand_type = yield node.children[0]
+        if node.value == '-' and operand_type not in {'int', 'float'}:
             self.errors.append("El operador '-' requiere operando numérico")
         return operand_type
 
@@ -230,14 +326,30 @@ class SemanticAnalyzer:
 
     # ==================== CALL, COUT, CIN ========================
     def visit_call(self, node):
-        # Por simplicidad, asumimos que la función existe y devuelve int
+        name = node.value
+        arg_types = []
         for arg in node.children:
-            self.visit(arg)
-        return 'int'
+            arg_types.append((yield arg))
+        # La firma sale del índice de la pre-pasada: consulta O(1), sin volver al FUN_DEF
+        sig = self.signatures.get(name)
+        if sig is None:
+            self.errors.append(f"Función '{name}' no declarada")
+            return None
+        ret_type, param_types = sig
+        if len(arg_types) != len(param_types):
+            self.errors.append(f"La función '{name}' espera {len(param_types)} argumentos, recibe {len(arg_types)}")
+        else:
+            for i, (param_type, arg_type) in enumerate(zip(param_types, arg_types), 1):
+                if arg_type and not self.is_compatible_type(param_type, arg_type):
+                    self.errors.append(f"Argumento {i} de '{name}' incompatible: {param_type} vs {arg_type}")
+        return ret_type
 
     def visit_cout(self, node):
         for child in node.children:
-            self.visit(child)
+            if (self.endl and child.type == 'ID' and child.value == 'endl'
+                    and self.symbol_table.lookup('endl') is None):
+                continue
+            yield child
 
     def visit_cin(self, node):
         for child in node.children:
@@ -246,7 +358,7 @@ class SemanticAnalyzer:
                 if self.symbol_table.lookup(child.value) is None:
                     self.errors.append(f"Variable '{child.value}' no declarada antes de usar en cin")
             else:
-                self.visit(child)
+                yield child
 
     # =================== UTILIDAD COMPATIBILIDAD ================
     def is_compatible_type(self, t1, t2):
@@ -1,12 +1,27 @@
+from ast_visitor import DispatchTable, walk
+
+
 class SemanticLineAnalyzer:
     """Clasifica cada línea de código según construcciones del AST"""
 
-    def __init__(self):
+    def __init__(self, use_line_index=True):
         self.line_classifications: list[dict] = []
         self.source_lines: list[str] = []
+        # Modo indexado: node.line -> clasificación en O(1); sin él se busca por palabra clave
+        self.use_line_index = use_line_index
+        self._by_line: dict[int, dict] = {}
+        self._line_offset = 0
+        self._handlers = DispatchTable(self, '_t_')
 
     def analyze_lines(self, source_code, ast):
-        self.source_lines = source_code.strip().split('\n')
+        # strip() descarta las líneas vacías iniciales; node.line cuenta desde el texto original
+        offset = source_code[:len(source_code) - len(source_code.lstrip())].count('\n')
+        return self.analyze_source_lines(source_code.strip().split('\n'), ast, offset)
+
+    def analyze_source_lines(self, lines, ast, line_offset=0):
+        """Clasifica una secuencia de líneas ya separadas (p. ej. un SourceFile)"""
+        self.source_lines = lines
+        self._line_offset = line_offset
         self.line_classifications = [
             {
                 'line_number': i,
@@ -14,30 +29,36 @@ class SemanticLineAnalyzer:
                 'semantic_type': 'UNKNOWN',
                 'description': 'Unknown'
             }
-            for i, line in enumerate(self.source_lines, 1)
+            for i, line in enumerate(lines, 1)
             if line.strip() and not line.strip().startswith('//')
         ]
+        self._by_line = (
+            {cls['line_number']: cls for cls in self.line_classifications}
+            if self.use_line_index else {}
+        )
         self._walk_ast(ast)
         return self.line_classifications
 
     # ======================= RECORRIDO AST =======================
     def _walk_ast(self, node, ctx=None):
-        if node is None:
-            return
-        if isinstance(node, list):
-            for n in node:
-                self._walk_ast(n, ctx)
-            return
-
-        handler = getattr(self, f"_t_{node.type.lower()}", None)
+        walk(node, self._enter, state=ctx)
+
+    def _enter(self, node, ctx):
+        handler = self._handlers[node.type]
         if handler:
             handler(node, ctx)
-
-        for child in node.children:
-            self._walk_ast(child, ctx)
+        return ctx
 
     # ------------------- manejadores por tipo -------------------
-    def _mark(self, keyword, sem_type, desc):
+    def _mark(self, keyword, sem_type, desc, line=None):
+        if line is not None and self._by_line:
+            cls = self._by_line.get(line - self._line_offset)
+            if cls is not None:
+                if cls['semantic_type'] == 'UNKNOWN':
+                    cls['semantic_type'] = sem_type
+                    cls['description'] = desc
+                return
+        # Sin número de línea (o línea fuera del listado): búsqueda por palabra clave
         for cls in self.line_classifications:
             if keyword in cls['line_content'] and cls['semantic_type'] == 'UNKNOWN':
                 cls['semantic_type'] = sem_type
@@ -45,45 +66,45 @@ class SemanticLineAnalyzer:
                 break
 
     def _t_fun_def(self, node, _):
-        self._mark(node.value, 'FUNCTION_DEF', 'Function Definition')
+        self._mark(node.value, 'FUNCTION_DEF', 'Function Definition', node.line)
 
     def _t_var_decl(self, node, _):
         for init in node.children[1:]:
             kw = init.value
             if init.children:
-                self._mark(kw, 'VAR_DECL_INIT', 'Variable Decl+Init')
+                self._mark(kw, 'VAR_DECL_INIT', 'Variable Decl+Init', init.line)
             else:
-                self._mark(kw, 'VAR_DECL', 'Variable Declaration')
+                self._mark(kw, 'VAR_DECL', 'Variable Declaration', init.line)
 
     def _t_assign(self, node, _):
-        self._mark(node.children[0].value, 'ASSIGN', 'Assignment')
+        self._mark(node.children[0].value, 'ASSIGN', 'Assignment', node.line)
 
-    def _t_if(self, *_):
-        self._mark('if', 'BRANCH', 'If Statement')
+    def _t_if(self, node, _):
+        self._mark('if', 'BRANCH', 'If Statement', node.line)
 
-    def _t_while(self, *_):
-        self._mark('while', 'WHILE_LOOP', 'While Loop')
+    def _t_while(self, node, _):
+        self._mark('while', 'WHILE_LOOP', 'While Loop', node.line)
 
-    def _t_for(self, *_):
-        self._mark('for', 'FOR_LOOP', 'For Loop')
+    def _t_for(self, node, _):
+        self._mark('for', 'FOR_LOOP', 'For Loop', node.line)
 
-    def _t_return(self, *_):
-        self._mark('return', 'RETURN', 'Return Statement')
+    def _t_return(self, node, _):
+        self._mark('return', 'RETURN', 'Return Statement', node.line)
 
     def _t_cout(self, node, _):
-        self._mark('cout', 'OUTPUT', 'Output Statement')
+        self._mark('cout', 'OUTPUT', 'Output Statement', node.line)
         for child in node.children:
             self._walk_ast(child, ctx='cout')
 
     def _t_cin(self, node, _):
-        self._mark('cin', 'INPUT', 'Input Statement')
+        self._mark('cin', 'INPUT', 'Input Statement', node.line)
         for child in node.children:
             self._walk_ast(child, ctx='cin')
 
     def _t_binop(self, node, ctx):
         # Solo se marca como cálculo si está fuera de contexto como cout, return, etc.
         if ctx is None:
-            self._mark(node.value, 'CALCULATIONS', 'Math Calculation')
+            self._mark(node.value, 'CALCULATIONS', 'Math Calculation', node.line)
 
     # --------------------- Impresión y resumen ---------------------
     def print_semantic_table(self):
@@ -0,0 +1,79 @@
+import io
+import mmap
+import os
+import re
+from array import array
+
+_NEWLINE = re.compile(rb'\n')
+
+
+class SourceFile:
+    """Archivo fuente mapeado en memoria.
+
+    El lexer lee directamente del mmap por bloques y las líneas se decodifican
+    una a una bajo demanda; el índice de líneas (desplazamientos en bytes) se
+    construye la primera vez que se necesita. Se comporta como una secuencia
+    de líneas (sin el salto final), de modo que puede pasarse a
+    SemanticLineAnalyzer.analyze_source_lines.
+    """
+
+    def __init__(self, path, encoding='utf-8'):
+        self.path = path
+        self.encoding = encoding
+        self._file = open(path, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        # mmap no admite archivos vacíos
+        self.buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+        self._offsets = None
+
+    # ---------- CICLO DE VIDA ----------
+    def close(self):
+        if isinstance(self.buffer, mmap.mmap):
+            self.buffer.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    # ---------- ENTRADA PARA EL LEXER ----------
+    def stream(self):
+        """Objeto con read(n) situado al inicio, para CPPLexer.iter_tokens"""
+        if not self.buffer:
+            return io.BytesIO(b'')
+        self.buffer.seek(0)
+        return self.buffer
+
+    # ---------- ÍNDICE DE LÍNEAS ----------
+    @property
+    def line_offsets(self):
+        """Desplazamiento en bytes del inicio de cada línea (array compacto)"""
+        if self._offsets is None:
+            offsets = array('q', [0])
+            offsets.extend(m.end() for m in _NEWLINE.finditer(self.buffer))
+            if len(offsets) > 1 and offsets[-1] == len(self.buffer):
+                offsets.pop()  # el salto final no abre una línea nueva
+            self._offsets = offsets
+        return self._offsets
+
+    def __len__(self):
+        return len(self.line_offsets) if self.buffer else 0
+
+    def __getitem__(self, index):
+        offsets = self.line_offsets
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        end = offsets[index + 1] if index + 1 < len(offsets) else len(self.buffer)
+        return self.buffer[offsets[index]:end].decode(self.encoding).rstrip('\r\n')
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def line(self, number):
+        """Línea `number` (base 1), como en node.line"""
+        return self[number - 1]
@@ -0,0 +1,110 @@
+import hashlib
+import os
+
+import ply.yacc as yacc
+
+# Directorio por defecto de la caché (se puede redefinir con la variable de entorno)
+CACHE_DIR_ENV = 'PCONSEMANTICO_CACHE_DIR'
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.ply_cache')
+# Tablas que se conservan en el directorio (las de uso más reciente): varias
+# gramáticas (subclases del parser, otras versiones del proyecto) pueden
+# compartirlo sin regenerar sus tablas cada vez que se alternan
+MAX_TABLES = 8
+
+
+# ---------- HUELLA DE LA GRAMÁTICA ----------
+def grammar_fingerprint(module):
+    """Hash de las reglas p_* (en orden de definición), la precedencia y los tokens"""
+    rules = []
+    for name in dir(module):
+        if not name.startswith('p_') or name == 'p_error':
+            continue
+        func = getattr(module, name)
+        if callable(func) and func.__doc__:
+            rules.append((func.__code__.co_firstlineno, name, func.__doc__))
+    rules.sort()
+
+    h = hashlib.sha256()
+    h.update(f"ply={yacc.__version__};tab={yacc.__tabversion__}\n".encode())
+    h.update(repr(getattr(module, 'precedence', ())).encode())
+    h.update(repr(list(module.tokens)).encode())
+    h.update(repr(getattr(module, 'start', None)).encode())
+    for _, name, doc in rules:
+        h.update(f"\n{name}\n{doc}".encode())
+    return h.hexdigest()
+
+
+def resolve_cache_dir(cache_dir=None):
+    return cache_dir or os.environ.get(CACHE_DIR_ENV) or DEFAULT_CACHE_DIR
+
+
+def table_path(module, cache_dir=None):
+    return os.path.join(resolve_cache_dir(cache_dir), f"parsetab_{grammar_fingerprint(module)[:20]}.pickle")
+
+
+# ---------- CONSTRUCCIÓN DEL PARSER ----------
+def build_parser(module, cache_dir=None):
+    """Construye el LRParser reutilizando las tablas LALR guardadas en disco.
+
+    El nombre del fichero incluye la huella de la gramática, así que un cambio
+    en las reglas genera tablas nuevas. La escritura se hace en un fichero
+    temporal por proceso y se publica con os.replace (atómico), de modo que
+    varios procesos pueden compartir el mismo directorio sin leer tablas a medias.
+    La fecha de modificación marca el último uso: al publicar unas tablas nuevas
+    se conservan las MAX_TABLES más recientes y se borran las demás.
+    """
+    path = table_path(module, cache_dir)
+
+    if os.path.exists(path):
+        try:
+            parser = yacc.yacc(module=module, debug=False, write_tables=False, picklefile=path)
+        except Exception:  # tabla corrupta o ilegible: se regenera
+            pass
+        else:
+            try:
+                os.utime(path)
+            except OSError:  # directorio de solo lectura
+                pass
+            return parser
+
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    except OSError:
+        return yacc.yacc(module=module, debug=False, write_tables=False)
+
+    tmp = f"{path}.{os.getpid()}.{id(module)}.tmp"
+    if os.path.exists(tmp):  # restos de una ejecución interrumpida
+        os.remove(tmp)
+    parser = yacc.yacc(module=module, debug=False, write_tables=False, picklefile=tmp)
+    try:
+        os.replace(tmp, path)
+    except OSError:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    else:
+        _remove_stale_tables(path)
+    return parser
+
+
+def _remove_stale_tables(current, keep=MAX_TABLES):
+    """Borra los parsetab_*.pickle del directorio salvo `current` y las keep - 1
+    tablas usadas más recientemente; los errores (otro proceso ya los borró,
+    permisos) se ignoran"""
+    tables = []
+    try:
+        with os.scandir(os.path.dirname(current)) as it:
+            for entry in it:
+                if (entry.name.startswith('parsetab_') and entry.name.endswith('.pickle')
+                        and entry.path != current):
+                    try:
+                        tables.append((entry.stat().st_mtime, entry.path))
+                    except OSError:
+                        continue
+    except OSError:
+        return
+    tables.sort(reverse=True)
+    for _, path in tables[keep - 1:]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,267 @@
+# vm.py
+# Intérprete del bytecode de bytecode.py: un único bucle de despacho sobre los
+# pares (opcode, argumento), con pila de operandos, marco de locales por llamada
+# y pila de retorno explícita (la recursión del programa no usa la de Python).
+#
+#   python vm.py programa.cpp < entrada.txt
+
+import math
+import re
+import sys
+
+from bytecode import (
+    ADD, CALL, CONST, DIV_FLOAT, DIV_INT, DUP, EQ, GE, GT, HALT, INC_LOCAL, INT_MAX, INT_MIN,
+    JUMP, JUMP_IF_FALSE, JUMP_IF_NOT_EQ, JUMP_IF_NOT_GE, JUMP_IF_NOT_GT, JUMP_IF_NOT_LE,
+    JUMP_IF_NOT_LT, JUMP_IF_NOT_NE, JUMP_IF_TRUE, K_BOOL, K_CHAR, K_FLOAT, K_INT, LE,
+    LOAD_GLOBAL, LOAD_LOCAL, LOAD_LOCAL2, LT, MOD, MUL, NE, NEG, NOT, OPCODES, POP, PRINT,
+    READ, RETURN, STORE_GLOBAL, STORE_LOCAL, SUB, TO_BOOL, TO_FLOAT, TO_INT, compile_program,
+    wrap_int,
+)
+
+_INT_TOKEN = re.compile(r'\s*([+-]?\d+)')
+_FLOAT_TOKEN = re.compile(r'\s*([+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?)')
+_CHAR_TOKEN = re.compile(r'\s*(\S)')
+
+
+class VMError(Exception):
+    pass
+
+
+def format_value(value, kind):
+    """Texto que escribiría cout para un valor del tipo `kind`"""
+    if kind == K_INT:
+        return str(value)
+    if kind == K_FLOAT:
+        return '%g' % value  # formato por defecto de ostream (6 cifras significativas)
+    if kind == K_CHAR:
+        return chr(value)
+    if kind == K_BOOL:
+        return '1' if value else '0'
+    return value
+
+
+class VirtualMachine:
+    """Ejecuta un Program; la salida de cout se acumula en self.output"""
+
+    def __init__(self, program, input_text=''):
+        self.program = program
+        self.input_text = input_text
+        self.output = []
+
+    def _read(self, pos, kind):
+        """Lee como `cin >>` desde input_text[pos:]; devuelve (valor, nueva posición)"""
+        pattern = _INT_TOKEN if kind == K_INT else _CHAR_TOKEN if kind == K_CHAR else _FLOAT_TOKEN
+        m = pattern.match(self.input_text, pos)
+        if m is None:  # entrada agotada o inválida: cin deja 0
+            return (0.0 if kind == K_FLOAT else 0), len(self.input_text)
+        token = m.group(1)
+        if kind == K_CHAR:
+            return ord(token), m.end()
+        return (int(token) if kind == K_INT else float(token)), m.end()
+
+    def run(self):
+        """Ejecuta desde la inicialización de globales; devuelve el valor de main"""
+        program = self.program
+        code = program.code.tolist()  # indexar una lista es más rápido que un array
+        consts = program.consts
+        functions = program.functions
+        globals_ = [0] * program.n_globals
+        out = self.output
+        write = out.append
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        frames = []
+        locals_ = []
+        input_pos = 0
+        pc = 0
+        # Un resultado fuera de [int_min, int_max] solo puede ser un int desbordado
+        # o un float: el int se reduce a 32 bits (wrap_int) y el float se conserva
+        int_min = INT_MIN
+        int_max = INT_MAX
+        try:
+            while True:
+                op = code[pc]
+                arg = code[pc + 1]
+                pc += 2
+                # Los opcodes más frecuentes en bucles van primero
+                if op == LOAD_LOCAL:
+                    push(locals_[arg])
+                elif op == CONST:
+                    push(consts[arg])
+                elif op == LOAD_LOCAL2:
+                    push(locals_[arg & 0xFFFF])
+                    push(locals_[arg >> 16])
+                elif op == JUMP:
+                    pc = arg
+                elif op == INC_LOCAL:
+                    slot = arg & 0xFFFF
+                    r = locals_[slot] + consts[arg >> 16]
+                    locals_[slot] = r if int_min <= r <= int_max or type(r) is not int else wrap_int(r)
+                elif op == STORE_LOCAL:
+                    locals_[arg] = pop()
+                elif op == ADD:
+                    b = pop()
+                    r = stack[-1] + b
+                    stack[-1] = r if int_min <= r <= int_max or type(r) is not int else wrap_int(r)
+                elif op == JUMP_IF_NOT_LT:
+                    b = pop()
+                    if not pop() < b:
+                        pc = arg
+                elif op == JUMP_IF_NOT_LE:
+                    b = pop()
+                    if not pop() <= b:
+                        pc = arg
+                elif op == MUL:
+                    b = pop()
+                    r = stack[-1] * b
+                    stack[-1] = r if int_min <= r <= int_max or type(r) is not int else wrap_int(r)
+                elif op == MOD:
+                    b = pop()
+                    a = stack[-1]
+                    if b == 0:
+                        raise VMError("División por cero")
+                    r = abs(a) % abs(b)  # el resto de C lleva el signo del dividendo
+                    stack[-1] = r if a >= 0 else -r
+                elif op == SUB:
+                    b = pop()
+                    r = stack[-1] - b
+                    stack[-1] = r if int_min <= r <= int_max or type(r) is not int else wrap_int(r)
+                elif op == JUMP_IF_FALSE:
+                    if not pop():
+                        pc = arg
+                elif op == JUMP_IF_NOT_EQ:
+                    b = pop()
+                    if not pop() == b:
+                        pc = arg
+                elif op == JUMP_IF_NOT_NE:
+                    b = pop()
+                    if not pop() != b:
+                        pc = arg
+                elif op == JUMP_IF_NOT_GT:
+                    b = pop()
+                    if not pop() > b:
+                        pc = arg
+                elif op == JUMP_IF_NOT_GE:
+                    b = pop()
+                    if not pop() >= b:
+                        pc = arg
+                elif op == CALL:
+                    entry, n_params, n_locals = functions[arg]
+                    frames.append((pc, locals_))
+                    if n_params:
+                        locals_ = stack[-n_params:]
+                        del stack[-n_params:]
+                    else:
+                        locals_ = []
+                    if n_locals > n_params:
+                        locals_.extend([0] * (n_locals - n_params))
+                    pc = entry
+                elif op == RETURN:
+                    pc, locals_ = frames.pop()
+                elif op == DIV_INT:
+                    b = pop()
+                    a = stack[-1]
+                    if b == 0:
+                        raise VMError("División por cero")
+                    q = abs(a) // abs(b)  # C trunca hacia cero
+                    r = q if (a < 0) == (b < 0) else -q
+                    stack[-1] = r if r <= int_max else wrap_int(r)  # INT_MIN / -1
+                elif op == DIV_FLOAT:
+                    b = pop()
+                    a = stack[-1]
+                    if b:
+                        stack[-1] = a / b
+                    else:  # IEEE 754: ±inf o nan, como en C++
+                        stack[-1] = math.copysign(math.inf, a) * math.copysign(1.0, b) if a else math.nan
+                elif op == LOAD_GLOBAL:
+                    push(globals_[arg])
+                elif op == STORE_GLOBAL:
+                    globals_[arg] = pop()
+                elif op == NEG:
+                    r = -stack[-1]
+                    stack[-1] = r if int_min <= r <= int_max or type(r) is not int else wrap_int(r)
+                elif op == LT:
+                    b = pop()
+                    stack[-1] = stack[-1] < b
+                elif op == LE:
+                    b = pop()
+                    stack[-1] = stack[-1] <= b
+                elif op == GT:
+                    b = pop()
+                    stack[-1] = stack[-1] > b
+                elif op == GE:
+                    b = pop()
+                    stack[-1] = stack[-1] >= b
+                elif op == EQ:
+                    b = pop()
+                    stack[-1] = stack[-1] == b
+                elif op == NE:
+                    b = pop()
+                    stack[-1] = stack[-1] != b
+                elif op == DUP:
+                    push(stack[-1])
+                elif op == POP:
+                    pop()
+                elif op == JUMP_IF_TRUE:
+                    if pop():
+                        pc = arg
+                elif op == NOT:
+                    stack[-1] = not stack[-1]
+                elif op == TO_INT:
+                    stack[-1] = int(stack[-1])
+                elif op == TO_FLOAT:
+                    stack[-1] = float(stack[-1])
+                elif op == TO_BOOL:
+                    stack[-1] = bool(stack[-1])
+                elif op == PRINT:
+                    write(format_value(pop(), arg))
+                elif op == READ:
+                    value, input_pos = self._read(input_pos, arg)
+                    push(value)
+                elif op == HALT:
+                    return pop()
+                else:
+                    raise VMError(f"Opcode desconocido {op} en {pc - 2}")
+        except (IndexError, KeyError) as e:
+            raise VMError(f"Bytecode inválido en {pc - 2} ({OPCODES[op] if op < len(OPCODES) else op}): {e}")
+        except (OverflowError, ValueError) as e:  # p. ej. convertir inf a int
+            raise VMError(f"Error de ejecución en {pc - 2} ({OPCODES[op]}): {e}")
+
+
+def run_source(code, input_text=''):
+    """Parsea, comprueba, compila y ejecuta; devuelve (valor de main, salida)"""
+    from parser_cpp import CPPParser
+    from semantic_analyzer import SemanticAnalyzer
+
+    parser = CPPParser(quiet=True)
+    ast = parser.parse_stream(code)
+    errors = parser.lexer.errors + parser.errors
+    if not errors:
+        errors = SemanticAnalyzer(endl=True).analyze(ast)[1]
+    if errors:
+        raise VMError("El programa tiene errores:\n" + "\n".join(f"  - {e}" for e in errors))
+    vm = VirtualMachine(compile_program(ast), input_text)
+    result = vm.run()
+    return result, ''.join(vm.output)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 1:
+        print("uso: python vm.py programa.cpp < entrada", file=sys.stderr)
+        return 2
+    with open(argv[0], encoding='utf-8') as f:
+        code = f.read()
+    input_text = '' if sys.stdin.isatty() else sys.stdin.read()
+    try:
+        result, output = run_source(code, input_text)
+    except Exception as e:
+        print(f"✗ {e}", file=sys.stderr)
+        return 1
+    sys.stdout.write(output)
+    return int(result) & 0xFF
+
+
+if __name__ == '__main__':
+    sys.exit(main())
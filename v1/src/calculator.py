@@ -1,6 +1,7 @@
 # src/calculator.py
 
 from src.lexer_cpp import CPPLexer
+from src.fast_lexer import FastCPPLexer
 from src.lexer_python import PythonLexer
 from src.analyzer import LineAnalyzer
 # from src.parser import CalcParser # Puedes mantenerlo si quieres la funcionalidad de parsing formal
@@ -9,10 +10,11 @@ class CodeAnalyzer:
     """
     Clase principal que integra los lexers y el analizador de líneas.
     """
-    def __init__(self, lang_type="cpp"):
+    def __init__(self, lang_type="cpp", fast_lexer=False):
         self.lang_type = lang_type
         if lang_type == "cpp":
-            self.lexer = CPPLexer()
+            # fast_lexer: mismas reglas que CPPLexer, compiladas una vez por proceso
+            self.lexer = FastCPPLexer() if fast_lexer else CPPLexer()
         elif lang_type == "python":
             self.lexer = PythonLexer()
         else:
@@ -0,0 +1,154 @@
+# src/fast_lexer.py
+
+import re
+from types import MappingProxyType
+
+from ply.lex import LexToken
+from src.lexer_cpp import CPPLexer
+
+
+def _number(text):
+    return float(text) if '.' in text else int(text)
+
+
+def _strip_quotes(text):
+    return text[1:-1]
+
+
+# Acciones especiales de las reglas que son funciones en BaseLexer/CPPLexer;
+# las demás entradas convierten el texto en el valor del token
+_SKIP = 'skip'
+_NEWLINES = 'newlines'
+_COMMENT = 'comment'
+
+_ACTIONS = {
+    'NUMBER': _number,
+    'STRING_LITERAL': _strip_quotes,
+    'CHAR_LITERAL': _strip_quotes,
+    'COMMENT_SINGLE': _SKIP,
+    'COMMENT_MULTI': _COMMENT,
+    'newline': _NEWLINES,
+}
+
+
+class _Compiled:
+    """
+    Expresión maestra con las reglas t_* de una clase de lexer, en el orden
+    en que las prueba PLY: funciones por línea de definición y después cadenas
+    de la más larga a la más corta.
+    """
+
+    def __init__(self, rules):
+        functions = []
+        strings = []
+        for name in dir(rules):
+            if not name.startswith('t_') or name in ('t_ignore', 't_error', 't_eof'):
+                continue
+            rule = getattr(rules, name)
+            if callable(rule):
+                functions.append((rule.__code__.co_firstlineno, name[2:], rule.__doc__))
+            else:
+                strings.append((name[2:], rule))
+        functions.sort()
+        strings.sort(key=lambda item: len(item[1]), reverse=True)
+
+        parts = []
+        for _, name, pattern in functions:
+            if name != 'ID' and name not in _ACTIONS:
+                raise ValueError(f"La regla t_{name} no tiene acción en fast_lexer._ACTIONS")
+            parts.append(f"(?P<{name}>{pattern})")
+        parts.extend(f"(?P<{name}>{pattern})" for name, pattern in strings)
+        # Los caracteres ignorados van como prefijo de cada coincidencia
+        ignore = ''.join(re.escape(c) for c in getattr(rules, 't_ignore', ''))
+        parts.append(f"(?P<_error>[^{ignore}])" if ignore else r"(?P<_error>[\s\S])")
+        prefix = f"[{ignore}]*" if ignore else ''
+        master = re.compile(prefix + "(?:" + "|".join(parts) + ")", re.VERBOSE)
+
+        self.scanner = master.finditer
+        self.kinds = [None] * (master.groups + 1)
+        self.actions = [None] * (master.groups + 1)
+        for name, index in master.groupindex.items():
+            if name == 'ID':
+                self.id_group = index
+            elif name in _ACTIONS:
+                self.actions[index] = _ACTIONS[name]
+            elif name != '_error':
+                self.kinds[index] = name
+        # Diccionario propio para las consultas; hacia fuera, vista de solo lectura
+        reserved = dict(rules.reserved_keywords)
+        self.keywords = MappingProxyType(reserved)
+        self.keyword_type = reserved.get
+
+
+_compiled = {}
+
+
+def compiled_rules(rules=CPPLexer):
+    """
+    Compila las reglas de `rules` la primera vez y reutiliza el resultado en
+    el resto del proceso.
+    """
+    result = _compiled.get(rules)
+    if result is None:
+        result = _compiled[rules] = _Compiled(rules)
+    return result
+
+
+class FastCPPLexer:
+    """
+    Alternativa a CPPLexer con la misma salida: tokenize() devuelve la lista de
+    LexToken y tokenize_tuples() tuplas (tipo, valor, línea, posición), sin
+    crear un LexToken por token. Como en CPPLexer, el número de línea se
+    conserva entre llamadas a tokenize().
+    """
+    rules = CPPLexer
+    tokens = CPPLexer.tokens
+
+    def __init__(self):
+        self.lineno = 1
+        self._rules = compiled_rules(self.rules)
+
+    def tokenize_tuples(self, data):
+        rules = self._rules
+        kinds = rules.kinds
+        actions = rules.actions
+        id_group = rules.id_group
+        keyword = rules.keyword_type
+        line = self.lineno
+        tokens_list = []
+        append = tokens_list.append
+        for m in rules.scanner(data):
+            i = m.lastindex
+            if i == id_group:
+                value = m.group(i)
+                append((keyword(value, 'ID'), value, line, m.start(i)))
+                continue
+            kind = kinds[i]
+            if kind is not None:
+                append((kind, m.group(i), line, m.start(i)))
+                continue
+            action = actions[i]
+            if action is _NEWLINES:
+                line += m.end() - m.start(i)
+            elif action is _COMMENT:
+                line += m.group(i).count('\n')
+            elif action is _SKIP:
+                pass
+            elif action is not None:
+                append((m.lastgroup, action(m.group(i)), line, m.start(i)))
+            else:
+                # Mismo aviso que CPPLexer.t_error
+                print(f"[{line}:{m.start(i)}] Carácter ilegal (CPPLexer): '{m.group(i)}'")
+        self.lineno = line
+        return tokens_list
+
+    def tokenize(self, data):
+        tokens_list = []
+        for kind, value, line, pos in self.tokenize_tuples(data):
+            tok = LexToken()
+            tok.type = kind
+            tok.value = value
+            tok.lineno = line
+            tok.lexpos = pos
+            tokens_list.append(tok)
+        return tokens_list